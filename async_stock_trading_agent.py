@@ -0,0 +1,203 @@
+from typing import Dict, Any, Optional, List, AsyncIterator, Union, Callable, TYPE_CHECKING
+import asyncio
+from stock_trading_agent import StockTradingAgent
+from tools.results import ResultTable
+
+if TYPE_CHECKING:
+    from tools.async_yahoo_finance_tool import AsyncYahooFinanceTool
+    from tools.async_openai_analyzer import AsyncOpenAIStockAnalyzer
+    from tools.prescreen import PreScreen
+
+
+class AsyncStockTradingAgent(StockTradingAgent):
+    # StockTradingAgent for asyncio services: the same constructor options and result
+    # dicts, with analyses multiplexed on one event loop instead of a thread per call
+
+    def __init__(self, *args, max_concurrency: int = 50, timeout: Optional[float] = 60, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_concurrency = max_concurrency
+        # Default per-symbol budget in seconds for fetching data and analyzing it; None disables it
+        self.timeout = timeout
+
+    @property
+    def yahoo_tool(self) -> 'AsyncYahooFinanceTool':
+        if self._yahoo_tool is None:
+            from tools.async_yahoo_finance_tool import AsyncYahooFinanceTool
+            self._yahoo_tool = AsyncYahooFinanceTool(cache=self.market_data_cache, history_store=self.history_store,
+                                                     scheduler=self.scheduler, session_manager=self.session_manager,
+                                                     metrics=self.metrics, max_connections=self.max_concurrency)
+        return self._yahoo_tool
+
+    @yahoo_tool.setter
+    def yahoo_tool(self, tool: 'AsyncYahooFinanceTool'):
+        self._yahoo_tool = tool
+
+    @property
+    def analyzer(self) -> 'AsyncOpenAIStockAnalyzer':
+        if self._analyzer is None:
+            from tools.async_openai_analyzer import AsyncOpenAIStockAnalyzer
+            self._analyzer = AsyncOpenAIStockAnalyzer(self._api_key, response_cache=self.response_cache,
+                                                      structured=self.structured_output, scheduler=self.scheduler,
+                                                      session_manager=self.session_manager, metrics=self.metrics,
+                                                      max_connections=self.max_concurrency)
+        return self._analyzer
+
+    @analyzer.setter
+    def analyzer(self, analyzer: 'AsyncOpenAIStockAnalyzer'):
+        self._analyzer = analyzer
+
+    async def aclose(self):
+        if self._yahoo_tool is not None:
+            await self._yahoo_tool.aclose()
+        if self._analyzer is not None:
+            await self._analyzer.aclose()
+
+    async def __aenter__(self) -> 'AsyncStockTradingAgent':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def analyze_stock(self, symbol: str, stock_data: Optional[Dict[str, Any]] = None,
+                            verbose: bool = False, refresh: bool = False,
+                            timeout: Optional[float] = None) -> Dict[str, Any]:
+        timeout = self.timeout if timeout is None else timeout
+        with self.metrics.span('agent.analyze_stock'):
+            try:
+                return await asyncio.wait_for(self._analyze_stock(symbol, stock_data, verbose, refresh), timeout)
+            except asyncio.TimeoutError:
+                self.metrics.increment('agent.timeouts')
+                return self._timeout_result(symbol, timeout)
+
+    async def _analyze_stock(self, symbol: str, stock_data: Optional[Dict[str, Any]], verbose: bool,
+                             refresh: bool) -> Dict[str, Any]:
+        if verbose:
+            print(f"\n🔍 Analyzing {symbol.upper()}...")
+
+        if stock_data is None:
+            with self.metrics.span('agent.fetch'):
+                stock_data = await self.yahoo_tool.get_stock_info(symbol)
+
+        if not stock_data['success']:
+            return self._build_result(symbol, stock_data)
+
+        if verbose:
+            print(f"✅ Retrieved stock data for {stock_data['data']['company_name']}")
+            print(f"💰 Current Price: ${stock_data['data']['current_price']}")
+            print("\n🤖 Analyzing with AI...")
+        with self.metrics.span('agent.analysis'):
+            analysis = await self.analyzer.analyze_stock(stock_data, refresh=refresh)
+
+        return self._build_result(symbol, stock_data, analysis)
+
+    async def analyze_stock_stream(self, symbol: str, stock_data: Optional[Dict[str, Any]] = None,
+                                   refresh: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        # No overall timeout here: the caller sees progress and can stop iterating, which
+        # closes the stream; the HTTP client's read timeout still bounds a stalled response
+        if stock_data is None:
+            stock_data = await self.yahoo_tool.get_stock_info(symbol)
+
+        if not stock_data['success']:
+            yield {'type': 'result', 'result': self._build_result(symbol, stock_data)}
+            return
+
+        yield {'type': 'stock_data', 'stock_data': stock_data['data']}
+
+        async for event in self.analyzer.analyze_stock_stream(stock_data, refresh=refresh):
+            if event['type'] == 'result':
+                analysis = event['result']
+                result = self._build_result(symbol, stock_data, analysis)
+                result['timing'] = analysis['timing']
+                event = {'type': 'result', 'result': result}
+            yield event
+
+    async def analyze_many(self, symbols: List[str], max_concurrency: Optional[int] = None, verbose: bool = False,
+                           batch_size: Optional[int] = None, as_table: bool = False,
+                           timeout: Optional[float] = None,
+                           prescreen: Optional['PreScreen'] = None,
+                           on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Union[List[Dict[str, Any]], ResultTable]:
+        max_concurrency = max_concurrency or self.max_concurrency
+        prescreen = prescreen or self.prescreen
+        timeout = self.timeout if timeout is None else timeout
+        if verbose:
+            print(f"\n🔍 Analyzing {len(symbols)} stocks with up to {max_concurrency} in flight...")
+
+        # Quotes and fundamentals for every symbol come from one concurrent burst and a
+        # single vectorized metrics pass
+        with self.metrics.span('agent.fetch', batch=True):
+            stock_data = await self.yahoo_tool.get_stock_info_batch(symbols)
+        stock_data_list = [stock_data[symbol.upper()] for symbol in symbols]
+        screened = self._prescreen(prescreen, stock_data_list, verbose)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def run(symbol: str, stock_data: Dict[str, Any], analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if analysis:
+                return self._emit(on_result, self._build_result(symbol, stock_data, analysis))
+            async with semaphore:
+                result = await self.analyze_stock(symbol, stock_data=stock_data, timeout=timeout)
+            if verbose:
+                status = result['recommendation'] if result['success'] else '❌ failed'
+                print(f"  {symbol.upper()}: {status}")
+            # Handed over as each symbol completes, not when the whole run is done
+            return self._emit(on_result, result)
+
+        if batch_size:
+            outcomes = await self._analyze_batches(symbols, stock_data_list, batch_size, semaphore, timeout, screened,
+                                                   on_result)
+        else:
+            # Cancelling analyze_many cancels every in-flight symbol with it
+            outcomes = await asyncio.gather(*(run(*item) for item in zip(symbols, stock_data_list, screened)),
+                                            return_exceptions=True)
+
+        results = ResultTable() if as_table else []
+        for symbol, outcome in zip(symbols, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, Exception):
+                outcome = self._emit(on_result, self._failure_result(symbol, outcome))
+            results.append(outcome)
+
+        return results
+
+    async def _analyze_batches(self, symbols: List[str], stock_data_list: List[Dict[str, Any]], batch_size: int,
+                               semaphore: asyncio.Semaphore, timeout: Optional[float],
+                               screened: List[Optional[Dict[str, Any]]],
+                               on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Any]:
+        outcomes = [None] * len(symbols)
+        pending = []
+        for i, stock_data in enumerate(stock_data_list):
+            if not stock_data['success']:
+                outcomes[i] = self._emit(on_result, self._build_result(symbols[i], stock_data))
+            elif screened[i]:
+                outcomes[i] = self._emit(on_result, self._build_result(symbols[i], stock_data, screened[i]))
+            else:
+                pending.append(i)
+
+        async def run_batch(indices: List[int]):
+            async with semaphore:
+                try:
+                    analyses = await asyncio.wait_for(
+                        self.analyzer.analyze_stocks_batch([stock_data_list[i] for i in indices],
+                                                           batch_size=len(indices)),
+                        timeout
+                    )
+                except asyncio.TimeoutError:
+                    analyses = [TimeoutError(f"Timed out after {timeout}s")] * len(indices)
+                except Exception as e:
+                    analyses = [e] * len(indices)
+
+            for i, analysis in zip(indices, analyses):
+                outcomes[i] = analysis if isinstance(analysis, Exception) else \
+                    self._emit(on_result, self._build_result(symbols[i], stock_data_list[i], analysis))
+
+        await asyncio.gather(*(run_batch(pending[start:start + batch_size])
+                               for start in range(0, len(pending), batch_size)))
+        return outcomes
+
+    def _emit(self, on_result: Optional[Callable[[Dict[str, Any]], None]], result: Dict[str, Any]) -> Dict[str, Any]:
+        if on_result is not None:
+            on_result(result)
+        return result
+
+    def _timeout_result(self, symbol: str, timeout: Optional[float]) -> Dict[str, Any]:
+        return self._failure_result(symbol, TimeoutError(f"Timed out after {timeout}s"))
@@ -0,0 +1,10 @@
+from .engine import Backtester, BacktestResult
+from .strategies import (
+    Strategy, RuleBasedStrategy, CallableStrategy, LLMStrategy, BUY, HOLD, SELL, SIGNAL_VALUES
+)
+
+__all__ = [
+    'Backtester', 'BacktestResult',
+    'Strategy', 'RuleBasedStrategy', 'CallableStrategy', 'LLMStrategy',
+    'BUY', 'HOLD', 'SELL', 'SIGNAL_VALUES'
+]
@@ -0,0 +1,153 @@
+from typing import Dict, Any, List, Optional, NamedTuple, Union
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from tools.history_store import HistoryStore
+from tools.indicators import compute_indicators_history
+from tools.metrics_engine import (
+    compute_metrics_history, key_factor_flags, panel_from_frames, YEAR_WINDOW_DAYS
+)
+from .strategies import Strategy, RuleBasedStrategy, strategy_from, BUY, SELL, INFO_COLUMNS
+
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class BacktestResult(NamedTuple):
+    summary: Dict[str, Any]
+    equity: pd.Series
+    returns: pd.Series
+    benchmark: pd.Series
+    positions: pd.DataFrame
+    signals: pd.DataFrame
+    per_symbol: pd.DataFrame
+
+
+class Backtester:
+    def __init__(self, history_store: Optional[HistoryStore] = None, cost_bps: float = 5.0,
+                 allow_short: bool = False, initial_capital: float = 10000.0):
+        self.history_store = history_store
+        # Charged on every change in position, in basis points of the symbol's allocation
+        self.cost_bps = cost_bps
+        # SELL goes short instead of flat
+        self.allow_short = allow_short
+        self.initial_capital = initial_capital
+
+    def load_panel(self, symbols: List[str], start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> pd.DataFrame:
+        if self.history_store is None:
+            raise ValueError("A HistoryStore is required to load history; pass panel= to run() instead.")
+
+        # A year of warm-up so 52-week metrics are complete on the first evaluated date
+        warmup_start = start - timedelta(days=YEAR_WINDOW_DAYS) if start is not None else None
+        frames = {symbol.upper(): self.history_store.read(symbol, warmup_start, end) for symbol in symbols}
+        return panel_from_frames({symbol: frame for symbol, frame in frames.items() if not frame.empty})
+
+    def run(self, strategy: Union[Strategy, Any, None] = None, symbols: Optional[List[str]] = None,
+            start: Optional[datetime] = None, end: Optional[datetime] = None,
+            panel: Optional[Union[pd.DataFrame, Dict[str, pd.DataFrame]]] = None,
+            fundamentals: Optional[Dict[str, Dict[str, Any]]] = None) -> BacktestResult:
+        strategy = strategy_from(strategy) if strategy is not None else RuleBasedStrategy()
+
+        if panel is None:
+            panel = self.load_panel(symbols or (self.history_store.symbols() if self.history_store else []), start, end)
+        elif isinstance(panel, dict):
+            panel = panel_from_frames(panel)
+        if end is not None:
+            panel = panel.loc[:pd.Timestamp(end)]
+        if panel.empty:
+            raise ValueError("No price history to backtest")
+
+        # Every metric and indicator YahooFinanceTool reports, as of every bar, in one vectorized pass
+        table = compute_metrics_history(panel, start=start).join(compute_indicators_history(panel, start=start))
+        if fundamentals:
+            # Fundamentals are a single snapshot, so P/E and dividend flags carry look-ahead bias
+            table = table.join(self._fundamentals_frame(fundamentals), on='symbol')
+        table = table.join(key_factor_flags(table))
+
+        signals = strategy.signals(table).unstack('symbol')
+        symbols = list(signals.columns)
+        dates = signals.index
+
+        close = panel['Close'].reindex(index=dates, columns=symbols).ffill()
+        returns = close.pct_change().fillna(0.0).to_numpy()
+
+        # Act on a signal at the next bar: a close-to-close position never sees its own bar
+        target = np.where(signals.to_numpy() == BUY, 1.0,
+                          np.where(signals.to_numpy() == SELL, -1.0 if self.allow_short else 0.0, np.nan))
+        positions = pd.DataFrame(target, index=dates, columns=symbols).ffill().fillna(0.0).shift(1).fillna(0.0)
+        held = positions.to_numpy()
+
+        # Equal-weight sleeves rebalanced daily: each symbol gets 1/N of the capital
+        trades = np.abs(np.diff(held, axis=0, prepend=0.0))
+        costs = trades * self.cost_bps / 10000
+        sleeve_returns = held * returns - costs
+        portfolio_returns = pd.Series(sleeve_returns.mean(axis=1), index=dates, name='returns')
+        benchmark_returns = pd.Series(returns.mean(axis=1), index=dates, name='benchmark')
+
+        equity = self.initial_capital * (1 + portfolio_returns).cumprod().rename('equity')
+        benchmark = self.initial_capital * (1 + benchmark_returns).cumprod().rename('benchmark')
+
+        per_symbol = pd.DataFrame({
+            'total_return': np.prod(1 + sleeve_returns, axis=0) - 1,
+            'buy_and_hold_return': np.prod(1 + returns, axis=0) - 1,
+            'trades': (trades > 0).sum(axis=0),
+            'exposure': (held != 0).mean(axis=0),
+            'final_position': held[-1]
+        }, index=pd.Index(symbols, name='symbol'))
+
+        summary = {
+            'strategy': strategy.name,
+            'symbols': len(symbols),
+            'start': dates[0].date().isoformat(),
+            'end': dates[-1].date().isoformat(),
+            'days': len(dates),
+            **self._performance(portfolio_returns, equity),
+            'benchmark_return': round(float(benchmark.iloc[-1] / self.initial_capital - 1), 4),
+            'benchmark_max_drawdown': round(self._max_drawdown(benchmark), 4),
+            'trades': int((trades > 0).sum()),
+            'exposure': round(float((held != 0).mean()), 4)
+        }
+
+        return BacktestResult(
+            summary=summary,
+            equity=equity,
+            returns=portfolio_returns,
+            benchmark=benchmark,
+            positions=positions,
+            signals=signals,
+            per_symbol=per_symbol
+        )
+
+    @staticmethod
+    def _fundamentals_frame(fundamentals: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+        # yfinance info dicts ({'trailingPE': ...}) are renamed to the table's columns
+        # ({'pe_ratio': ...}), which can also be given directly; other info fields are dropped
+        columns = set(INFO_COLUMNS.values())
+        rows = {
+            symbol: {INFO_COLUMNS.get(key, key): value for key, value in info.items()
+                     if INFO_COLUMNS.get(key, key) in columns}
+            for symbol, info in fundamentals.items()
+        }
+        return pd.DataFrame.from_dict(rows, orient='index')
+
+    def _performance(self, returns: pd.Series, equity: pd.Series) -> Dict[str, float]:
+        total_return = float(equity.iloc[-1] / self.initial_capital - 1)
+        years = max(len(returns) / TRADING_DAYS_PER_YEAR, 1 / TRADING_DAYS_PER_YEAR)
+        volatility = float(returns.std() * np.sqrt(TRADING_DAYS_PER_YEAR)) if len(returns) > 1 else 0.0
+        annual_return = (1 + total_return) ** (1 / years) - 1 if total_return > -1 else -1.0
+        active = returns[returns != 0]
+
+        return {
+            'total_return': round(total_return, 4),
+            'annual_return': round(annual_return, 4),
+            'volatility': round(volatility, 4),
+            'sharpe': round(float(returns.mean() * TRADING_DAYS_PER_YEAR) / volatility, 2) if volatility else 0.0,
+            'max_drawdown': round(self._max_drawdown(equity), 4),
+            'win_rate': round(float((active > 0).mean()), 4) if len(active) else 0.0
+        }
+
+    @staticmethod
+    def _max_drawdown(equity: pd.Series) -> float:
+        # Largest peak-to-trough fall, as a negative fraction
+        return float((equity / equity.cummax() - 1).min())
@@ -0,0 +1,119 @@
+from typing import Dict, Any, Optional, Callable
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+from tools.market_data import MarketDataTool
+from tools.metrics_engine import key_factor_scores
+
+
+# Signal encoding shared by strategies and the engine
+BUY, HOLD, SELL = 1, 0, -1
+SIGNAL_VALUES = {'BUY': BUY, 'HOLD': HOLD, 'SELL': SELL}
+
+# Fundamentals columns in the backtest table, keyed by the yfinance info field they came from
+INFO_COLUMNS = {
+    'longName': 'company_name',
+    'trailingPE': 'pe_ratio',
+    'forwardPE': 'forward_pe',
+    'dividendYield': 'dividend_yield',
+    'marketCap': 'market_cap',
+    'beta': 'beta',
+    'sector': 'sector',
+    'industry': 'industry'
+}
+
+
+class _RowQuotes(MarketDataTool):
+    # MarketDataTool's quote building for rows already in the backtest table; it never downloads
+    provider = 'backtest'
+
+    def _download(self, tickers, start_date, end_date) -> Dict[str, pd.DataFrame]:
+        return {}
+
+
+class Strategy(ABC):
+    name = "strategy"
+
+    @abstractmethod
+    def signals(self, table: pd.DataFrame) -> pd.Series:
+        # table is indexed by (date, symbol) with metric, fundamental and flag columns;
+        # return BUY/HOLD/SELL as 1/0/-1 on the same index. HOLD keeps the current position.
+        ...
+
+
+class RuleBasedStrategy(Strategy):
+    name = "rule_based"
+
+    def __init__(self, buy_threshold: float = 1.0, sell_threshold: float = -1.0,
+                 weights: Optional[Dict[str, float]] = None):
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+        self.weights = weights
+
+    def signals(self, table: pd.DataFrame) -> pd.Series:
+        scores = key_factor_scores(table, self.weights).to_numpy()
+        values = np.where(scores >= self.buy_threshold, BUY, np.where(scores <= self.sell_threshold, SELL, HOLD))
+        return pd.Series(values, index=table.index, dtype='int8')
+
+
+class CallableStrategy(Strategy):
+    def __init__(self, fn: Callable[[pd.DataFrame], Any], name: str = "callable"):
+        self.fn = fn
+        self.name = name
+
+    def signals(self, table: pd.DataFrame) -> pd.Series:
+        values = self.fn(table)
+        if isinstance(values, pd.Series) and values.dtype == object:
+            values = values.map(SIGNAL_VALUES)
+        return pd.Series(np.asarray(values), index=table.index).fillna(HOLD).astype('int8')
+
+
+class LLMStrategy(Strategy):
+    name = "llm"
+
+    def __init__(self, analyzer: Any, every: int = 5, batch_size: Optional[int] = None):
+        # analyzer is an OpenAIStockAnalyzer (give it a ResponseCache so re-runs are free)
+        # or any stub with the same analyze_stock/analyze_stocks_batch methods
+        self.analyzer = analyzer
+        # Ask for a recommendation every `every` bars; in between, positions are held
+        self.every = max(1, every)
+        self.batch_size = batch_size
+        self._tool = None
+
+    def signals(self, table: pd.DataFrame) -> pd.Series:
+        values = pd.Series(HOLD, index=table.index, dtype='int8')
+        dates = table.index.get_level_values('date').unique()
+
+        for date in dates[::self.every]:
+            rows = table.xs(date, level='date')
+            rows = rows[rows['current_price'].notna()]
+            if rows.empty:
+                continue
+
+            stock_data_list = [self._stock_data(symbol, row) for symbol, row in rows.iterrows()]
+            if self.batch_size:
+                analyses = self.analyzer.analyze_stocks_batch(stock_data_list, batch_size=self.batch_size)
+            else:
+                analyses = [self.analyzer.analyze_stock(stock_data) for stock_data in stock_data_list]
+
+            for symbol, analysis in zip(rows.index, analyses):
+                if analysis.get('success'):
+                    values.loc[(date, symbol)] = SIGNAL_VALUES.get(analysis['recommendation'], HOLD)
+
+        return values
+
+    def _stock_data(self, symbol: str, row: pd.Series) -> Dict[str, Any]:
+        # Same dict get_stock_info returns, so prompts match live runs
+        if self._tool is None:
+            self._tool = _RowQuotes()
+        info = {key: row[column] for key, column in INFO_COLUMNS.items() if column in row and pd.notna(row[column])}
+        return self._tool._build_stock_result(symbol, row, info)
+
+
+def strategy_from(value: Any) -> Strategy:
+    if isinstance(value, Strategy):
+        return value
+    if callable(value):
+        return CallableStrategy(value, name=getattr(value, '__name__', 'callable'))
+    raise TypeError(f"Expected a Strategy or a callable, got {type(value).__name__}")
+
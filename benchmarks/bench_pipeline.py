@@ -0,0 +1,250 @@
+"""Offline throughput and latency benchmarks for the analysis pipeline.
+
+Market data is replayed from recorded fixtures (see benchmarks/fixtures.py) and
+OpenAI requests go to a local fake server, so no network access or API key is
+needed. Results can be written as JSON and compared against an earlier run.
+
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --sizes 10 100 --repeat 3 --output before.json
+    python benchmarks/bench_pipeline.py --compare before.json --threshold 0.15
+    python benchmarks/bench_pipeline.py --only metrics prompt report
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fake_openai import FakeOpenAIServer  # noqa: E402
+from benchmarks.fixtures import DEFAULT_FIXTURES, ReplayYahooFinanceTool, load_or_generate, universe  # noqa: E402
+
+
+GROUPS = ('metrics', 'fetch', 'prompt', 'report', 'analysis')
+
+
+def measure(fn, repeat, number=1, warmup=1, items=None):
+    # Seconds per call over `repeat` samples of `number` calls each
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - started) / number)
+
+    samples.sort()
+    median = statistics.median(samples)
+    stats = {
+        'runs': repeat,
+        'median': round(median, 6),
+        'p95': round(samples[max(0, int(round(0.95 * len(samples))) - 1)], 6),
+        'min': round(samples[0], 6),
+        'max': round(samples[-1], 6),
+        'ops_per_sec': round(1 / median, 2) if median else None
+    }
+    if items:
+        stats['items_per_sec'] = round(items / median, 2) if median else None
+    return stats
+
+
+def unthrottled_scheduler():
+    # Benchmarks measure our own overhead, not the production rate limits
+    from tools.request_scheduler import RequestScheduler, ProviderPolicy
+    policy = lambda: ProviderPolicy(rate=1e9, burst=1e9)
+    return RequestScheduler({'yahoo': policy(), 'openai': policy()})
+
+
+def build_agent(fixtures, metrics=None):
+    from stock_trading_agent import StockTradingAgent
+    agent = StockTradingAgent(openai_api_key='sk-benchmark', scheduler=unthrottled_scheduler(), metrics=metrics)
+    agent.yahoo_tool = ReplayYahooFinanceTool(fixtures, scheduler=agent.scheduler,
+                                              session_manager=agent.session_manager, metrics=agent.metrics)
+    # Every analysis should reach the (fake) API rather than the response cache
+    agent.analyzer.response_cache = None
+    return agent
+
+
+def bench_metrics(context):
+    from tools.indicators import compute_indicators
+    from tools.metrics_engine import compute_metrics
+    tool = ReplayYahooFinanceTool(context['fixtures'])
+    end = datetime.now()
+    for size in context['sizes']:
+        history = tool.download_history(universe(context['fixtures'], size), end_date=end)
+        yield f"metrics.compute_metrics[{size}]", measure(
+            lambda: compute_metrics(history, as_of=end), context['repeat'], items=size)
+        yield f"metrics.compute_indicators[{size}]", measure(
+            lambda: compute_indicators(history), context['repeat'], items=size)
+
+
+def bench_fetch(context):
+    tool = ReplayYahooFinanceTool(context['fixtures'], scheduler=unthrottled_scheduler())
+    symbols = itertools.cycle(universe(context['fixtures'], 50))
+    yield "fetch.get_stock_info", measure(lambda: tool.get_stock_info(next(symbols)), context['repeat'], number=20)
+
+    for size in context['sizes']:
+        names = universe(context['fixtures'], size)
+        yield f"fetch.get_stock_info_batch[{size}]", measure(
+            lambda: tool.get_stock_info_batch(names), context['repeat'], items=size)
+
+
+def bench_prompt(context):
+    from tools.openai_analyzer import OpenAIStockAnalyzer
+    analyzer = OpenAIStockAnalyzer('sk-benchmark')
+    stock_data = list(context['stock_data'].values())
+    rotation = itertools.cycle(stock_data)
+    yield "prompt.create_analysis_prompt", measure(
+        lambda: analyzer._create_analysis_prompt(next(rotation)), context['repeat'], number=500)
+    yield "prompt.create_analysis_prompt[structured]", measure(
+        lambda: analyzer._create_analysis_prompt(next(rotation), structured=True), context['repeat'], number=500)
+    yield "prompt.create_batch_prompt[10]", measure(
+        lambda: analyzer._create_batch_prompt(stock_data[:10]), context['repeat'], number=100)
+
+
+def bench_report(context):
+    agent = context['agent']
+    result = agent.analyze_stock(next(iter(context['stock_data'])), verbose=False)
+    yield "report.get_recommendation_summary", measure(
+        lambda: agent.get_recommendation_summary(result), context['repeat'], number=500)
+
+
+def bench_analysis(context):
+    agent = context['agent']
+    symbols = itertools.cycle(universe(context['fixtures'], 50))
+    agent.metrics.reset()
+    yield "analysis.analyze_stock", measure(
+        lambda: agent.analyze_stock(next(symbols), verbose=False), context['repeat'], number=5)
+    # Where a single analysis spends its time, from the instrumentation spans
+    context['stages'] = {name: timer for name, timer in agent.get_metrics()['timers'].items()
+                         if name.startswith(('agent.', 'yahoo.', 'openai.'))}
+
+    for size in context['sizes']:
+        names = universe(context['fixtures'], size)
+        yield f"analysis.analyze_many[{size}]", measure(
+            lambda: agent.analyze_many(names, max_concurrency=8), context['repeat'], warmup=0, items=size)
+        yield f"analysis.analyze_many_batched[{size}]", measure(
+            lambda: agent.analyze_many(names, max_concurrency=8, batch_size=10), context['repeat'], warmup=0, items=size)
+
+
+BENCHMARKS = {
+    'metrics': bench_metrics,
+    'fetch': bench_fetch,
+    'prompt': bench_prompt,
+    'report': bench_report,
+    'analysis': bench_analysis
+}
+
+
+def git_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    rows = []
+    for name, stats in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before or not before['median']:
+            continue
+        ratio = stats['median'] / before['median']
+        rows.append({'name': name, 'before': before['median'], 'after': stats['median'],
+                     'ratio': round(ratio, 3), 'regression': ratio > 1 + threshold})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=GROUPS, help='benchmark groups to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000], help='universe sizes (default: 10 100 1000)')
+    parser.add_argument('--repeat', type=int, default=5, help='samples per benchmark (default: 5)')
+    parser.add_argument('--latency', type=float, default=0.0, help='fake OpenAI response delay in seconds (default: 0)')
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES, help='recorded fixture file; synthetic data if missing')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against an earlier --output file')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='slowdown ratio counted as a regression with --compare (default: 0.2)')
+    args = parser.parse_args()
+
+    fixtures = load_or_generate(args.fixtures, symbols=max(100, min(max(args.sizes), 1000)))
+    with FakeOpenAIServer(latency=args.latency) as server:
+        # The OpenAI SDK picks the base URL up when the analyzer builds its client
+        os.environ['OPENAI_BASE_URL'] = server.url
+
+        from tools.instrumentation import MetricsRegistry
+        agent = build_agent(fixtures, metrics=MetricsRegistry())
+        sample = universe(fixtures, 50)
+        context = {
+            'fixtures': fixtures,
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+            'agent': agent,
+            'stock_data': agent.yahoo_tool.get_stock_info_batch(sample)
+        }
+
+        results = {}
+        for group in args.only or GROUPS:
+            for name, stats in BENCHMARKS[group](context):
+                results[name] = stats
+                if not args.json:
+                    throughput = f"{stats['items_per_sec']:>10,.0f} symbols/s" if 'items_per_sec' in stats else \
+                        f"{stats['ops_per_sec']:>10,.0f} ops/s"
+                    print(f"{name:<44} median {stats['median'] * 1000:9.3f} ms   "
+                          f"p95 {stats['p95'] * 1000:9.3f} ms   {throughput}")
+        requests = server.requests
+
+    report = {
+        'meta': {
+            'version': git_version(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': platform.platform(),
+            'fixtures': fixtures['meta']['source'],
+            'sizes': args.sizes,
+            'repeat': args.repeat,
+            'fake_openai_latency': args.latency,
+            'fake_openai_requests': requests
+        },
+        'results': results,
+        'stages': context.get('stages', {})
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as handle:
+            rows = compare(results, json.load(handle), args.threshold)
+        report['comparison'] = rows
+        regressions = [row for row in rows if row['regression']]
+        if not args.json:
+            print(f"\nCompared with {args.compare} (regression above {args.threshold:.0%} slower)")
+            for row in rows:
+                flag = '  REGRESSION' if row['regression'] else ''
+                print(f"{row['name']:<44} {row['before'] * 1000:9.3f} ms -> {row['after'] * 1000:9.3f} ms   "
+                      f"x{row['ratio']:.2f}{flag}")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+
+    # A non-zero exit lets CI fail on a slowdown
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
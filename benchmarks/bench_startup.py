@@ -0,0 +1,133 @@
+"""Measure cold-start cost of the agent: import time, construction and first-use latency.
+
+Every sample runs in a fresh interpreter so module caches from earlier samples
+don't hide import costs.
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --json
+    python benchmarks/bench_startup.py --importtime
+    python benchmarks/bench_startup.py --analyze AAPL    # needs network and OPENAI_API_KEY
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON object of stage timings in seconds
+PROBE = r'''
+import json, os, sys, time
+timings = {}
+start = time.perf_counter()
+import stock_trading_agent
+timings['import'] = time.perf_counter() - start
+
+os.environ.setdefault('OPENAI_API_KEY', 'sk-benchmark')
+mark = time.perf_counter()
+agent = stock_trading_agent.StockTradingAgent()
+timings['construct'] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+agent.yahoo_tool
+timings['first_market_data_tool'] = time.perf_counter() - mark
+
+mark = time.perf_counter()
+agent.analyzer.client
+timings['first_openai_client'] = time.perf_counter() - mark
+
+symbol = sys.argv[1] if len(sys.argv) > 1 else None
+if symbol:
+    mark = time.perf_counter()
+    agent.analyze_stock(symbol, verbose=False)
+    timings['first_analysis'] = time.perf_counter() - mark
+
+timings['total'] = time.perf_counter() - start
+print(json.dumps(timings))
+'''
+
+# Which heavy dependencies a bare import pulls in
+MODULES_PROBE = r'''
+import json, sys
+import stock_trading_agent
+print(json.dumps([name for name in ('pandas', 'numpy', 'yfinance', 'openai', 'httpx') if name in sys.modules]))
+'''
+
+
+def run_probe(code, args=()):
+    output = subprocess.run(
+        [sys.executable, '-c', code, *args], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def slowest_imports(limit=10):
+    # -X importtime writes "import time: self | cumulative | name" lines to stderr
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import stock_trading_agent'],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]) / 1e6, parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def summarize(samples):
+    summary = {}
+    for stage in dict.fromkeys(stage for sample in samples for stage in sample):
+        values = [sample[stage] for sample in samples if stage in sample]
+        summary[stage] = {
+            'median': round(statistics.median(values), 4),
+            'min': round(min(values), 4),
+            'max': round(max(values), 4)
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters to sample (default: 5)')
+    parser.add_argument('--analyze', metavar='SYMBOL', help='also time one real end-to-end analysis')
+    parser.add_argument('--importtime', action='store_true', help='list the slowest imports')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    samples = [run_probe(PROBE) for _ in range(args.runs)]
+    if args.analyze:
+        # One extra run only, so a benchmark doesn't spend N completions
+        samples.append(run_probe(PROBE, [args.analyze]))
+
+    report = {
+        'python': sys.version.split()[0],
+        'runs': args.runs,
+        'stages': summarize(samples),
+        'heavy_modules_after_import': run_probe(MODULES_PROBE)
+    }
+    if args.importtime:
+        report['slowest_imports'] = [{'module': name.strip(), 'cumulative': round(seconds, 4)}
+                                     for seconds, name in slowest_imports()]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Startup benchmark ({report['runs']} runs, Python {report['python']})")
+    print("=" * 60)
+    for stage, stats in report['stages'].items():
+        print(f"{stage:<26} median {stats['median'] * 1000:8.1f} ms   "
+              f"min {stats['min'] * 1000:8.1f} ms   max {stats['max'] * 1000:8.1f} ms")
+    print(f"\nHeavy modules loaded by 'import stock_trading_agent': "
+          f"{', '.join(report['heavy_modules_after_import']) or 'none'}")
+    for row in report.get('slowest_imports', []):
+        print(f"  {row['cumulative'] * 1000:8.1f} ms  {row['module']}")
+
+
+if __name__ == '__main__':
+    main()
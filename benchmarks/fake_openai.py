@@ -0,0 +1,183 @@
+"""A local stand-in for the OpenAI chat completions endpoint, for offline benchmarks.
+
+It answers the three request shapes the analyzer sends with canned content:
+prose reports (optionally streamed, with a final usage chunk when requested), function-calling structured analyses and
+JSON-mode batch prompts. Point the SDK at it with OPENAI_BASE_URL=server.url.
+Tests can script the next replies, e.g. to serve malformed output.
+"""
+import json
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+PROSE_ANALYSIS = (
+    "Based on the data provided, I recommend a HOLD. The stock has shown steady momentum over the past "
+    "week and month, and it trades within its 52-week range with a reasonable valuation relative to its "
+    "sector. Volume is in line with its average, suggesting no unusual institutional activity. Risks include "
+    "broader market volatility and sector rotation; a pullback toward support would offer a better entry "
+    "point, with a stop loss below the recent low and a target near the 52-week high."
+)
+
+STRUCTURED_ANALYSIS = {
+    "recommendation": "HOLD",
+    "confidence": "MEDIUM",
+    "reasons": ["Steady weekly and monthly momentum", "Valuation in line with sector"],
+    "risks": ["Broad market volatility", "Sector rotation"],
+    "price_targets": {"entry": None, "target": None, "stop_loss": None}
+}
+
+# Batch prompts list one stock per line as "SYMBOL | name | ..."
+BATCH_LINE = re.compile(r'^([A-Z0-9.\-^=]+) \|', re.M)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs add ~40ms per response
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.count_request()
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if body.get('stream'):
+            self._stream(body)
+            return
+
+        message = {"role": "assistant", "content": PROSE_ANALYSIS}
+        scripted = self.server.next_scripted()
+        if scripted is not None:
+            message = scripted
+        elif body.get('tools'):
+            message = {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": "call_0",
+                    "type": "function",
+                    "function": {"name": body['tools'][0]['function']['name'],
+                                 "arguments": json.dumps(STRUCTURED_ANALYSIS)}
+                }]
+            }
+        elif body.get('response_format', {}).get('type') == 'json_object':
+            symbols = BATCH_LINE.findall(body['messages'][-1]['content'])
+            message['content'] = json.dumps({"results": [
+                {"symbol": symbol, "recommendation": "HOLD", "confidence": "MEDIUM",
+                 "analysis": "Steady momentum and a fair valuation; wait for a better entry."}
+                for symbol in symbols
+            ]})
+
+        completion_tokens = len(str(message['content'] or STRUCTURED_ANALYSIS).split())
+        self._send_json({
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body['model'],
+            "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": sum(len(m['content'].split()) for m in body['messages']),
+                "completion_tokens": completion_tokens,
+                "total_tokens": completion_tokens
+            }
+        })
+
+    def _stream(self, body):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        words = PROSE_ANALYSIS.split(' ')
+        for i, word in enumerate(words):
+            chunk = {
+                "id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": body['model'],
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else ' ' + word}, "finish_reason": None}]
+            }
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        if body.get('stream_options', {}).get('include_usage'):
+            usage = {"prompt_tokens": sum(len(m['content'].split()) for m in body['messages']),
+                     "completion_tokens": len(words), "total_tokens": len(words)}
+            chunk = {"id": "chatcmpl-bench", "object": "chat.completion.chunk", "created": int(time.time()),
+                     "model": body['model'], "choices": [], "usage": usage}
+            self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Large analyze_many runs open many connections at once
+    request_queue_size = 512
+
+    def __init__(self, latency):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.latency = latency
+        self.requests = 0
+        self.scripted = deque()
+        self._lock = threading.Lock()
+
+    def count_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def next_scripted(self):
+        with self._lock:
+            return self.scripted.popleft() if self.scripted else None
+
+
+class FakeOpenAIServer:
+    def __init__(self, latency=0.0):
+        # Seconds to wait before answering, to model network and generation time
+        self.latency = latency
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/v1"
+
+    @property
+    def requests(self):
+        return self._server.requests
+
+    def script(self, *messages):
+        # The next non-streamed requests get these assistant messages, in order, instead of
+        # the canned replies
+        self._server.scripted.extend(messages)
+
+    def start(self):
+        self._server = _Server(self.latency)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,212 @@
+"""Recorded market-data fixtures and a YahooFinanceTool that replays them offline.
+
+A fixture file is gzipped JSON holding daily OHLCV history and the yfinance
+`info` dict for each symbol. Record real data once (needs network):
+
+    python benchmarks/fixtures.py record AAPL MSFT NVDA JPM XOM --output benchmarks/fixtures/market_data.json.gz
+
+Without a recorded file, the benchmarks use a deterministic synthetic universe,
+so results stay comparable between checkouts.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import zlib
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from tools.yahoo_finance_tool import YahooFinanceTool  # noqa: E402
+from tools.metrics_engine import YEAR_WINDOW_DAYS  # noqa: E402
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'market_data.json.gz')
+
+COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+SECTORS = [
+    ('Technology', 'Software'), ('Technology', 'Semiconductors'), ('Healthcare', 'Biotechnology'),
+    ('Financial Services', 'Banks'), ('Energy', 'Oil & Gas'), ('Consumer Cyclical', 'Retail'),
+    ('Industrials', 'Aerospace & Defense'), ('Utilities', 'Utilities - Regulated')
+]
+
+
+def save_fixtures(fixtures, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as handle:
+        json.dump(fixtures, handle)
+
+
+def load_fixtures(path=DEFAULT_FIXTURES):
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def load_or_generate(path=DEFAULT_FIXTURES, symbols=100):
+    if path and os.path.exists(path):
+        return load_fixtures(path)
+    return generate_fixtures([f"SYM{i:04d}" for i in range(symbols)])
+
+
+def record_fixtures(symbols, days=YEAR_WINDOW_DAYS):
+    # Goes through the tool's own download and info paths so the recording matches what it fetches live
+    tool = YahooFinanceTool()
+    end = datetime.now()
+    history = tool.download_history(symbols, end_date=end, days=days)
+    return {
+        'meta': {'source': 'yfinance', 'recorded_at': end.isoformat(timespec='seconds'), 'days': days},
+        'symbols': {ticker: {'history': _encode_history(frame), 'info': _json_safe(tool._fetch_info(ticker))}
+                    for ticker, frame in history.items()}
+    }
+
+
+def generate_fixtures(symbols, days=YEAR_WINDOW_DAYS, seed=0):
+    end = pd.Timestamp('2024-06-28')
+    dates = pd.bdate_range(end=end, periods=int(days * 5 / 7))
+    fixtures = {'meta': {'source': 'synthetic', 'seed': seed, 'days': days}, 'symbols': {}}
+
+    for symbol in symbols:
+        # Seeded per symbol, so a symbol's series doesn't depend on the universe size
+        rng = np.random.default_rng([seed, zlib.crc32(symbol.encode())])
+        drift, volatility = rng.normal(0.0004, 0.0006), rng.uniform(0.01, 0.03)
+        close = rng.uniform(20, 400) * np.cumprod(1 + rng.normal(drift, volatility, len(dates)))
+        spread = np.abs(rng.normal(0, volatility / 2, len(dates)))
+        frame = pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, volatility / 3, len(dates))),
+            'High': close * (1 + spread),
+            'Low': close * (1 - spread),
+            'Close': close,
+            'Volume': rng.lognormal(14, 0.4, len(dates)).round()
+        }, index=dates)
+
+        sector, industry = SECTORS[zlib.crc32(symbol.encode()) % len(SECTORS)]
+        pe_ratio = float(rng.choice([rng.uniform(8, 15), rng.uniform(15, 30), rng.uniform(30, 80)]))
+        fixtures['symbols'][symbol] = {
+            'history': _encode_history(frame),
+            'info': {
+                'longName': f"{symbol.title()} Holdings Inc.",
+                'marketCap': int(close[-1] * rng.uniform(1e8, 5e9)),
+                'trailingPE': round(pe_ratio, 2),
+                'forwardPE': round(pe_ratio * rng.uniform(0.8, 1.1), 2),
+                'dividendYield': round(float(rng.choice([0, 0, rng.uniform(0.005, 0.05)])), 4),
+                'trailingEps': round(float(close[-1] / pe_ratio), 2),
+                'beta': round(float(rng.uniform(0.5, 1.8)), 2),
+                'sector': sector,
+                'industry': industry,
+                'recommendationKey': str(rng.choice(['buy', 'hold', 'strong_buy', 'underperform'])),
+                'recommendationMean': round(float(rng.uniform(1.5, 3.5)), 1)
+            }
+        }
+
+    return fixtures
+
+
+def universe(fixtures, size):
+    # The first `size` symbols, cycling through recorded ones under new names when there are fewer
+    names = list(fixtures['symbols'])
+    if size <= len(names):
+        return names[:size]
+    return names + [f"{names[i % len(names)]}.{i // len(names)}" for i in range(len(names), size)]
+
+
+class ReplayYahooFinanceTool(YahooFinanceTool):
+    # Serves fixture data through the normal YahooFinanceTool code path; only the network
+    # calls are replaced. Bars are moved onto the latest business days before the requested
+    # end date, keeping week/month windows meaningful whenever the fixtures were made.
+
+    def __init__(self, fixtures, **kwargs):
+        super().__init__(**kwargs)
+        self.fixtures = fixtures['symbols']
+        self._frames = {}
+
+    def _download(self, tickers, start_date, end_date):
+        last_session = pd.Timestamp(end_date).normalize() - pd.offsets.BDay(1)
+        frames = {}
+        for ticker in tickers:
+            frame = self._frame(ticker, last_session)
+            if frame is not None:
+                frames[ticker] = frame.loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
+        return frames
+
+    def _fetch_info(self, ticker):
+        source = self._source(ticker)
+        info = dict(self.fixtures[source]['info']) if source else {}
+        if self.cache is not None and info:
+            self.cache.fundamentals.set(ticker, info)
+        return info
+
+    def _frame(self, ticker, last_session):
+        source = self._source(ticker)
+        if source is None:
+            return None
+        # Decoding and re-dating is replay overhead, not tool cost, so it's done once per symbol
+        key = (source, last_session)
+        if key not in self._frames:
+            frame = _decode_history(self.fixtures[source]['history'])
+            self._frames[key] = frame.set_axis(pd.bdate_range(end=last_session, periods=len(frame), name='Date'))
+        return self._frames[key]
+
+    def _source(self, ticker):
+        # Names made up by universe() map back to the recorded symbol they cycle through
+        if ticker in self.fixtures:
+            return ticker
+        name, _, copy = ticker.rpartition('.')
+        return name if name in self.fixtures and copy.isdigit() else None
+
+
+def panel(fixtures, symbols):
+    tool = ReplayYahooFinanceTool(fixtures)
+    end = datetime.now()
+    return tool._download(symbols, end - timedelta(days=YEAR_WINDOW_DAYS), end)
+
+
+def _encode_history(frame):
+    return {
+        'dates': [date.strftime('%Y-%m-%d') for date in frame.index],
+        **{column: [None if np.isnan(value) else round(float(value), 4) for value in frame[column]]
+           for column in COLUMNS if column in frame}
+    }
+
+
+def _decode_history(history):
+    return pd.DataFrame(
+        {column: np.array([np.nan if value is None else value for value in history[column]], dtype=float)
+         for column in COLUMNS if column in history},
+        index=pd.DatetimeIndex(pd.to_datetime(history['dates']), name='Date')
+    )
+
+
+def _json_safe(info):
+    return {key: value for key, value in info.items() if isinstance(value, (str, int, float, bool, type(None)))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    record = subcommands.add_parser('record', help='record live Yahoo data for SYMBOLS')
+    record.add_argument('symbols', nargs='+')
+    record.add_argument('--days', type=int, default=YEAR_WINDOW_DAYS)
+    record.add_argument('--output', default=DEFAULT_FIXTURES)
+    generate = subcommands.add_parser('generate', help='write a synthetic fixture file')
+    generate.add_argument('--symbols', type=int, default=100)
+    generate.add_argument('--seed', type=int, default=0)
+    generate.add_argument('--output', default=DEFAULT_FIXTURES)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        fixtures = record_fixtures([symbol.upper() for symbol in args.symbols], days=args.days)
+    else:
+        fixtures = generate_fixtures([f"SYM{i:04d}" for i in range(args.symbols)], seed=args.seed)
+    save_fixtures(fixtures, args.output)
+    print(f"Wrote {len(fixtures['symbols'])} symbols ({fixtures['meta']['source']}) to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
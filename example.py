@@ -1,5 +1,7 @@
 from stock_trading_agent import StockTradingAgent
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 
@@ -28,6 +30,8 @@ def interactive_mode():
     load_dotenv()
     
     agent = StockTradingAgent()
+    # Load the data and AI clients while the user types the first symbol
+    threading.Thread(target=agent.warm_up, daemon=True).start()
     
     print("🚀 Stock Trading Expert Agent - Interactive Mode")
     print("=" * 60)
@@ -48,8 +52,63 @@ def interactive_mode():
             print("❌ Please enter a valid stock symbol")
             continue
             
-        result = agent.analyze_stock(symbol)
-        print(agent.get_recommendation_summary(result))
+        # Stream the analysis so text shows up as soon as the model starts writing
+        result = None
+        for event in agent.analyze_stock_stream(symbol):
+            if event['type'] == 'stock_data':
+                data = event['stock_data']
+                print(f"\n✅ Retrieved stock data for {data['company_name']}")
+                print(f"💰 Current Price: ${data['current_price']}")
+                print(f"📊 Week Change: {data['week_change']}%")
+                print(f"📈 Month Change: {data['month_change']}%")
+                print("\n🤖 Analyzing with AI...\n")
+            elif event['type'] == 'token':
+                print(event['content'], end='', flush=True)
+            else:
+                result = event['result']
+        
+        print()
+        print(agent.get_recommendation_summary(result, include_analysis=False))
+        if result.get('timing'):
+            timing = result['timing']
+            print(f"⏱️  First token: {timing['time_to_first_token']}s | Total: {timing['total_latency']}s")
+
+
+def watch_mode(symbols, interval=60):
+    from watchlist_monitor import WatchlistMonitor
+    
+    load_dotenv()
+    
+    agent = StockTradingAgent()
+    
+    print("🚀 Stock Trading Expert Agent - Watch Mode")
+    print("=" * 60)
+    print(f"👀 Watching {', '.join(symbols)} every {interval}s (Ctrl+C to stop)")
+    print("🤖 AI analysis re-runs only when a symbol crosses a threshold")
+    print("=" * 60)
+    
+    def show(updates):
+        print(f"\n⏰ {time.strftime('%H:%M:%S')}")
+        for update in updates:
+            if not update['success']:
+                print(f"  ❌ {update['symbol']}: {update['error']}")
+                continue
+            
+            result = update['result']
+            recommendation = result['recommendation'] if result and result['success'] else 'N/A'
+            print(f"  {update['symbol']:<6} ${update['current_price']:<10} "
+                  f"{update['change_since_last_poll']:+.2f}% | week {update['week_change']:+.2f}% | {recommendation}")
+            if update['reanalyzed']:
+                print(f"    🤖 Re-analyzed: {', '.join(update['reasons'])}")
+                if result and not result['success']:
+                    print(f"    ❌ {result.get('error', 'Unknown error')}")
+    
+    monitor = WatchlistMonitor(agent, symbols, interval=interval, on_update=show)
+    try:
+        monitor.run()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped after {monitor.stats['polls']} polls, "
+              f"{monitor.stats['analyses']} AI analyses")
 
 
 if __name__ == "__main__":
@@ -57,5 +116,14 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "--interactive":
         interactive_mode()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--watch":
+        # python example.py --watch AAPL MSFT [--interval 30]
+        args = sys.argv[2:]
+        interval = 60
+        if "--interval" in args:
+            index = args.index("--interval")
+            interval = float(args[index + 1])
+            args = args[:index] + args[index + 2:]
+        watch_mode([symbol.upper() for symbol in args] or ['AAPL', 'GOOGL', 'TSLA', 'MSFT', 'AMZN'], interval)
     else:
         main()
\ No newline at end of file
@@ -1,6 +1,14 @@
 from stock_trading_agent import StockTradingAgent
+from portfolio import Portfolio
+from tools.cache import MarketDataCache
+from tools.export import open_exporter, read_results
+from tools.screener import Screener
+from tools.sectors import SectorAggregator
 from datetime import datetime
-import json
+
+
+# Shared across examples so symbols analyzed twice in one run hit the cache
+market_data_cache = MarketDataCache()
 
 
 def portfolio_analysis_example():
@@ -8,67 +16,51 @@ def portfolio_analysis_example():
     print("\n📊 PORTFOLIO ANALYSIS EXAMPLE")
     print("=" * 60)
     
-    agent = StockTradingAgent()
+    agent = StockTradingAgent(market_data_cache=market_data_cache)
     
     # Sample portfolio
-    portfolio = {
+    portfolio = Portfolio(agent.yahoo_tool, {
         'AAPL': {'shares': 50, 'buy_price': 150.00},
         'GOOGL': {'shares': 20, 'buy_price': 2500.00},
         'TSLA': {'shares': 30, 'buy_price': 800.00},
         'MSFT': {'shares': 40, 'buy_price': 300.00}
-    }
+    })
     
-    portfolio_results = []
-    total_current_value = 0
-    total_initial_value = 0
+    # Valuation only needs prices: one batched fetch, no AI calls
+    portfolio.reprice()
+    valuation = portfolio.valuation()
     
-    for symbol, holding in portfolio.items():
-        print(f"\n🔍 Analyzing {symbol}...")
-        result = agent.analyze_stock(symbol)
-        
-        if result['success']:
-            current_value = result['current_price'] * holding['shares']
-            initial_value = holding['buy_price'] * holding['shares']
-            gain_loss = current_value - initial_value
-            gain_loss_pct = (gain_loss / initial_value) * 100
-            
-            portfolio_results.append({
-                'symbol': symbol,
-                'shares': holding['shares'],
-                'buy_price': holding['buy_price'],
-                'current_price': result['current_price'],
-                'current_value': current_value,
-                'gain_loss': gain_loss,
-                'gain_loss_pct': gain_loss_pct,
-                'recommendation': result['recommendation'],
-                'confidence': result['confidence']
-            })
-            
-            total_current_value += current_value
-            total_initial_value += initial_value
+    # AI commentary is a separate step
+    print("\n🔍 Analyzing holdings...")
+    recommendations = {result['symbol']: result for result in portfolio.commentary(agent, verbose=True)}
     
     # Print portfolio summary
     print("\n" + "=" * 60)
     print("📈 PORTFOLIO SUMMARY")
     print("=" * 60)
     
-    for item in portfolio_results:
-        emoji = "🟢" if item['gain_loss'] > 0 else "🔴"
-        print(f"\n{item['symbol']}:")
-        print(f"  Holdings: {item['shares']} shares")
-        print(f"  Buy Price: ${item['buy_price']:.2f} → Current: ${item['current_price']:.2f}")
-        print(f"  Position Value: ${item['current_value']:.2f}")
-        print(f"  {emoji} P/L: ${item['gain_loss']:.2f} ({item['gain_loss_pct']:+.2f}%)")
-        print(f"  📊 Recommendation: {item['recommendation']} (Confidence: {item['confidence']})")
+    for symbol, item in valuation.iterrows():
+        result = recommendations.get(symbol, {})
+        emoji = "🟢" if item['unrealized_pl'] > 0 else "🔴"
+        print(f"\n{symbol}:")
+        print(f"  Holdings: {item['shares']:.0f} shares ({item['sector']})")
+        print(f"  Buy Price: ${item['cost_basis']:.2f} → Current: ${item['current_price']:.2f}")
+        print(f"  Position Value: ${item['market_value']:.2f} ({item['weight']:.1%} of portfolio)")
+        print(f"  {emoji} P/L: ${item['unrealized_pl']:.2f} ({item['unrealized_pl_pct']:+.2f}%)")
+        if result.get('success'):
+            print(f"  📊 Recommendation: {result['recommendation']} (Confidence: {result['confidence']})")
     
-    total_gain_loss = total_current_value - total_initial_value
-    total_gain_loss_pct = (total_gain_loss / total_initial_value) * 100
+    print("\n🏭 Sector Exposure:")
+    for sector, row in portfolio.exposure().iterrows():
+        print(f"  {sector}: ${row['market_value']:,.2f} ({row['weight']:.1%})")
+    
+    summary = portfolio.summary()
     
     print("\n" + "-" * 60)
-    print(f"💼 Total Portfolio Value: ${total_current_value:,.2f}")
-    print(f"💰 Total Initial Investment: ${total_initial_value:,.2f}")
-    emoji = "🟢" if total_gain_loss > 0 else "🔴"
-    print(f"{emoji} Total P/L: ${total_gain_loss:,.2f} ({total_gain_loss_pct:+.2f}%)")
+    print(f"💼 Total Portfolio Value: ${summary['market_value']:,.2f}")
+    print(f"💰 Total Initial Investment: ${summary['cost']:,.2f}")
+    emoji = "🟢" if summary['unrealized_pl'] > 0 else "🔴"
+    print(f"{emoji} Total P/L: ${summary['unrealized_pl']:,.2f} ({summary['unrealized_pl_pct']:+.2f}%)")
     print("=" * 60)
 
 
@@ -77,7 +69,7 @@ def sector_comparison_example():
     print("\n🏭 SECTOR COMPARISON EXAMPLE")
     print("=" * 60)
     
-    agent = StockTradingAgent()
+    agent = StockTradingAgent(market_data_cache=market_data_cache)
     
     # Stocks from different sectors
     sectors = {
@@ -87,48 +79,32 @@ def sector_comparison_example():
         'Energy': ['XOM', 'CVX', 'COP']
     }
     
-    sector_results = {}
-    
-    for sector, stocks in sectors.items():
-        print(f"\n📊 Analyzing {sector} sector...")
-        sector_data = []
-        
-        for symbol in stocks:
-            result = agent.analyze_stock(symbol)
-            if result['success']:
-                sector_data.append({
-                    'symbol': symbol,
-                    'price': result['current_price'],
-                    'recommendation': result['recommendation'],
-                    'week_change': result['stock_data']['week_change'],
-                    'month_change': result['stock_data']['month_change'],
-                    'pe_ratio': result['stock_data']['pe_ratio']
-                })
-        
-        sector_results[sector] = sector_data
+    # One bulk price fetch for every stock, sector averages in one pass, and one AI
+    # summary per sector instead of one analysis per stock
+    aggregator = SectorAggregator(agent.yahoo_tool, include_info=True)
+    aggregator.refresh(groups=sectors)
+    stats = aggregator.aggregate()
+    summaries = aggregator.summarize(agent)
     
     # Print sector comparison
     print("\n" + "=" * 60)
     print("📊 SECTOR PERFORMANCE COMPARISON")
     print("=" * 60)
     
-    for sector, stocks in sector_results.items():
+    for sector, row in stats.iterrows():
+        summary = summaries[sector]
         print(f"\n{sector} Sector:")
-        
-        # Calculate sector averages
-        avg_week_change = sum(s['week_change'] for s in stocks) / len(stocks)
-        avg_month_change = sum(s['month_change'] for s in stocks) / len(stocks)
-        buy_count = sum(1 for s in stocks if s['recommendation'] == 'BUY')
-        
-        print(f"  Average Week Change: {avg_week_change:+.2f}%")
-        print(f"  Average Month Change: {avg_month_change:+.2f}%")
-        print(f"  Buy Recommendations: {buy_count}/{len(stocks)}")
+        print(f"  Average Week Change: {row['avg_week_change']:+.2f}%")
+        print(f"  Average Month Change: {row['avg_month_change']:+.2f}%")
+        print(f"  Advancing This Week: {row['advancers']}/{row['stocks']}")
+        print(f"  Median P/E: {row['median_pe']:.2f}")
+        print(f"  Sector View: {summary['recommendation']}")
         
         print("\n  Individual Stocks:")
-        for stock in stocks:
-            print(f"    {stock['symbol']}: ${stock['price']:.2f} | "
+        for symbol, stock in aggregator.members(sector).iterrows():
+            print(f"    {symbol}: ${stock['current_price']:.2f} | "
                   f"Week: {stock['week_change']:+.2f}% | "
-                  f"Rec: {stock['recommendation']}")
+                  f"Month: {stock['month_change']:+.2f}%")
 
 
 def momentum_scanner_example():
@@ -136,45 +112,33 @@ def momentum_scanner_example():
     print("\n🚀 MOMENTUM SCANNER EXAMPLE")
     print("=" * 60)
     
-    agent = StockTradingAgent()
+    agent = StockTradingAgent(market_data_cache=market_data_cache)
     
     # List of stocks to scan
     watchlist = ['AAPL', 'GOOGL', 'TSLA', 'NVDA', 'META', 'AMZN', 'MSFT', 'NFLX', 'AMD', 'CRM']
     
-    momentum_stocks = []
-    
     print("Scanning for momentum stocks...")
     
-    for symbol in watchlist:
-        result = agent.analyze_stock(symbol)
-        if result['success']:
-            stock_data = result['stock_data']
-            
-            # Momentum criteria: positive week and month change
-            if stock_data['week_change'] > 2 and stock_data['month_change'] > 5:
-                momentum_stocks.append({
-                    'symbol': symbol,
-                    'company': stock_data['company_name'],
-                    'price': stock_data['current_price'],
-                    'week_change': stock_data['week_change'],
-                    'month_change': stock_data['month_change'],
-                    'volume_ratio': stock_data['volume'] / stock_data['avg_volume'],
-                    'recommendation': result['recommendation']
-                })
-    
-    # Sort by month change
-    momentum_stocks.sort(key=lambda x: x['month_change'], reverse=True)
+    # Momentum criteria are checked against the metrics index; only the matches are
+    # analyzed by AI, strongest month first
+    screener = Screener(agent.yahoo_tool)
+    screener.refresh(watchlist)
+    results = screener.analyze(agent, "week_change > 2 and month_change > 5", sort_by='month_change', verbose=True)
     
     print("\n🚀 TOP MOMENTUM STOCKS")
     print("=" * 60)
     
-    for stock in momentum_stocks:
-        volume_indicator = "📊" if stock['volume_ratio'] > 1.2 else "📉"
-        print(f"\n{stock['symbol']} - {stock['company']}")
-        print(f"  💵 Price: ${stock['price']:.2f}")
+    for result in results:
+        if not result['success']:
+            continue
+        stock = result['stock_data']
+        volume_ratio = stock['volume'] / stock['avg_volume']
+        volume_indicator = "📊" if volume_ratio > 1.2 else "📉"
+        print(f"\n{stock['symbol']} - {stock['company_name']}")
+        print(f"  💵 Price: ${stock['current_price']:.2f}")
         print(f"  📈 Performance: Week +{stock['week_change']:.2f}% | Month +{stock['month_change']:.2f}%")
-        print(f"  {volume_indicator} Volume: {stock['volume_ratio']:.2f}x average")
-        print(f"  🎯 Recommendation: {stock['recommendation']}")
+        print(f"  {volume_indicator} Volume: {volume_ratio:.2f}x average")
+        print(f"  🎯 Recommendation: {result['recommendation']}")
 
 
 def value_screener_example():
@@ -182,91 +146,55 @@ def value_screener_example():
     print("\n💎 VALUE STOCK SCREENER EXAMPLE")
     print("=" * 60)
     
-    agent = StockTradingAgent()
+    agent = StockTradingAgent(market_data_cache=market_data_cache)
     
     # Value stocks to screen
     value_candidates = ['WMT', 'KO', 'JNJ', 'PG', 'VZ', 'T', 'IBM', 'INTC', 'CSCO', 'PFE']
     
-    value_stocks = []
-    
     print("Screening for value opportunities...")
     
-    for symbol in value_candidates:
-        result = agent.analyze_stock(symbol)
-        if result['success']:
-            data = result['stock_data']
-            
-            # Value criteria
-            if (data['pe_ratio'] > 0 and data['pe_ratio'] < 20 and 
-                data['dividend_yield'] > 0.02):
-                
-                value_stocks.append({
-                    'symbol': symbol,
-                    'company': data['company_name'],
-                    'price': data['current_price'],
-                    'pe_ratio': data['pe_ratio'],
-                    'forward_pe': data['forward_pe'],
-                    'dividend_yield': data['dividend_yield'] * 100,
-                    'recommendation': result['recommendation'],
-                    'beta': data['beta']
-                })
-    
-    # Sort by P/E ratio
-    value_stocks.sort(key=lambda x: x['pe_ratio'])
+    # Value criteria, lowest P/E first
+    screener = Screener(agent.yahoo_tool)
+    screener.refresh(value_candidates)
+    filters = [('pe_ratio', '>', 0), ('pe_ratio', '<', 20), ('dividend_yield', '>', 0.02)]
+    results = screener.analyze(agent, filters, sort_by='pe_ratio', ascending=True, verbose=True)
     
     print("\n💎 VALUE STOCK OPPORTUNITIES")
     print("=" * 60)
     
-    for stock in value_stocks:
+    for result in results:
+        if not result['success']:
+            continue
+        stock = result['stock_data']
         risk = "Low Risk" if stock['beta'] < 1 else "Higher Risk"
-        print(f"\n{stock['symbol']} - {stock['company']}")
-        print(f"  💵 Price: ${stock['price']:.2f}")
+        print(f"\n{stock['symbol']} - {stock['company_name']}")
+        print(f"  💵 Price: ${stock['current_price']:.2f}")
         print(f"  📊 P/E Ratio: {stock['pe_ratio']:.2f} (Forward: {stock['forward_pe']:.2f})")
-        print(f"  💰 Dividend Yield: {stock['dividend_yield']:.2f}%")
+        print(f"  💰 Dividend Yield: {stock['dividend_yield'] * 100:.2f}%")
         print(f"  📈 Beta: {stock['beta']:.2f} ({risk})")
-        print(f"  🎯 Recommendation: {stock['recommendation']}")
+        print(f"  🎯 Recommendation: {result['recommendation']}")
 
 
 def export_analysis_example():
-    """Example: Export analysis results to JSON"""
+    """Example: Stream analysis results to a JSONL file as they complete"""
     print("\n📁 EXPORT ANALYSIS EXAMPLE")
     print("=" * 60)
     
-    agent = StockTradingAgent()
+    agent = StockTradingAgent(market_data_cache=market_data_cache)
     
-    # Analyze multiple stocks and export
+    # Each result is appended and flushed as soon as it is ready, with the full analysis
+    # text; use a .parquet or .arrow filename for columnar output (needs pyarrow)
     stocks_to_analyze = ['AAPL', 'GOOGL', 'TSLA']
-    analysis_results = []
-    
-    for symbol in stocks_to_analyze:
-        print(f"Analyzing {symbol}...")
-        result = agent.analyze_stock(symbol)
-        if result['success']:
-            analysis_results.append({
-                'timestamp': datetime.now().isoformat(),
-                'symbol': result['symbol'],
-                'company_name': result['company_name'],
-                'current_price': result['current_price'],
-                'recommendation': result['recommendation'],
-                'confidence': result['confidence'],
-                'key_factors': result['key_factors'],
-                'analysis_summary': result['analysis'][:500] + '...',  # First 500 chars
-                'metrics': {
-                    'week_change': result['stock_data']['week_change'],
-                    'month_change': result['stock_data']['month_change'],
-                    'pe_ratio': result['stock_data']['pe_ratio'],
-                    'volume': result['stock_data']['volume'],
-                    'market_cap': result['stock_data']['market_cap']
-                }
-            })
-    
-    # Export to JSON
-    filename = f"stock_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(filename, 'w') as f:
-        json.dump(analysis_results, f, indent=2)
+    filename = f"stock_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+    with open_exporter(filename) as exporter:
+        agent.analyze_many(stocks_to_analyze, verbose=True, on_result=exporter)
+    
+    # Read it back without loading anything but the matching rows
+    buys = read_results(filename, filters=[('recommendation', '==', 'BUY')],
+                        columns=['symbol', 'current_price', 'confidence'])
     
     print(f"\n✅ Analysis exported to {filename}")
-    print(f"📊 Analyzed {len(analysis_results)} stocks")
+    print(f"📊 Exported {exporter.written} stocks, {len(buys)} BUY recommendations")
 
 
 if __name__ == "__main__":
@@ -296,4 +224,6 @@ if __name__ == "__main__":
         print("\n🎯 Running all examples...")
         for name, func in examples.values():
             func()
-            input("\nPress Enter to continue to next example...")
\ No newline at end of file
+            input("\nPress Enter to continue to next example...")
+        
+        print(f"\n🗄️  Market data cache: {market_data_cache.stats()}")
\ No newline at end of file
@@ -0,0 +1,211 @@
+from typing import Dict, Any, Optional, List, Union, TYPE_CHECKING
+from array import array
+import math
+import threading
+import time
+import numpy as np
+import pandas as pd
+from tools.market_data import MarketDataProvider
+
+if TYPE_CHECKING:
+    from stock_trading_agent import StockTradingAgent
+    from tools.results import ResultTable
+
+
+class Portfolio:
+    # Positions are kept as packed columns (one array per field, one slot per symbol), so
+    # valuation, P/L and exposure are single vectorized passes however many holdings there are
+
+    def __init__(self, provider: MarketDataProvider,
+                 positions: Optional[Dict[str, Dict[str, float]]] = None, cash: Optional[float] = None):
+        self.provider = provider
+        # None means cash isn't tracked: buys and sales only change positions. With a
+        # balance, buys are paid from it and may not exceed it
+        self.cash = cash
+        self.realized_pl = 0.0
+        self.symbols = []
+        self._slots = {}
+        self._shares = array('d')
+        # Average cost per share
+        self._cost = array('d')
+        # NaN until the first reprice
+        self._price = array('d')
+        self._previous_close = array('d')
+        self._sector = []
+        self.priced_at = None
+        self._lock = threading.Lock()
+        # Positions already held; unlike add(), they don't come out of cash
+        for symbol, holding in (positions or {}).items():
+            self._add(symbol.upper(), holding['shares'], holding['buy_price'])
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._slots
+
+    def add(self, symbol: str, shares: float, price: float):
+        # Buys `shares` at `price`; the cost is paid from cash when cash is tracked
+        with self._lock:
+            cost = shares * price
+            if self.cash is not None and cost > self.cash:
+                raise ValueError(f"Buying {shares:g} {symbol.upper()} at {price:g} costs {cost:.2f}, "
+                                 f"more than the {self.cash:.2f} cash available")
+            self._add(symbol.upper(), shares, price)
+            if self.cash is not None:
+                self.cash -= cost
+
+    def remove(self, symbol: str, shares: Optional[float] = None, price: Optional[float] = None) -> float:
+        # Sells `shares` (all by default) at `price` (the last quote by default); returns the realized P/L
+        symbol = symbol.upper()
+        with self._lock:
+            slot = self._slots[symbol]
+            sold = self._shares[slot] if shares is None else min(shares, self._shares[slot])
+            price = self._price[slot] if price is None else price
+            # Without a quote the sale is booked at cost: no realized P/L, proceeds equal to the basis
+            if math.isnan(price):
+                price = self._cost[slot]
+            realized = sold * (price - self._cost[slot])
+            self.realized_pl += realized
+            if self.cash is not None:
+                self.cash += sold * price
+
+            if sold < self._shares[slot]:
+                self._shares[slot] -= sold
+                return realized
+
+            for column in (self._shares, self._cost, self._price, self._previous_close, self._sector):
+                del column[slot]
+            del self.symbols[slot]
+            self._slots = {name: i for i, name in enumerate(self.symbols)}
+            return realized
+
+    def reprice(self, symbols: Optional[List[str]] = None, refresh: bool = True) -> List[str]:
+        # One batched price fetch and metrics pass for the given holdings (all by default).
+        # Sectors still unknown come from the provider's long-lived sectors cache. Returns
+        # the symbols whose price changed.
+        symbols = [symbol.upper() for symbol in symbols] if symbols is not None else list(self.symbols)
+        symbols = [symbol for symbol in symbols if symbol in self._slots]
+        if not symbols:
+            return []
+
+        table = self.provider.get_metrics_table(symbols, refresh=refresh)
+        table = table[table['current_price'].notna()]
+        unknown = [symbol for symbol in table.index if self._sector[self._slots[symbol]] is None]
+        sectors = self.provider.get_sectors(unknown) if unknown else {}
+
+        with self._lock:
+            for symbol, previous_close in zip(table.index, table['previous_close'].to_numpy(dtype=float)):
+                if symbol in self._slots:
+                    self._previous_close[self._slots[symbol]] = previous_close
+            for symbol, entry in sectors.items():
+                if symbol in self._slots and entry['sector'] not in (None, 'N/A'):
+                    self._sector[self._slots[symbol]] = entry['sector']
+
+        prices = dict(zip(table.index, table['current_price'].to_numpy(dtype=float).tolist()))
+        return self.update_prices(prices)
+
+    def update_prices(self, prices: Dict[str, float]) -> List[str]:
+        # Incremental repricing, e.g. from a tick feed: only the given slots are touched
+        changed = []
+        with self._lock:
+            for symbol, price in prices.items():
+                slot = self._slots.get(symbol.upper())
+                if slot is None or self._price[slot] == price:
+                    continue
+                self._price[slot] = price
+                changed.append(symbol.upper())
+            self.priced_at = time.time()
+        return changed
+
+    def valuation(self) -> pd.DataFrame:
+        shares, cost, price, previous_close = self._columns()
+        market_value = shares * price
+        cost_value = shares * cost
+        total = np.nansum(market_value)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame = pd.DataFrame({
+                'sector': self._sector_labels(),
+                'shares': shares,
+                'cost_basis': cost,
+                'current_price': price,
+                'market_value': market_value,
+                'cost': cost_value,
+                'unrealized_pl': market_value - cost_value,
+                'unrealized_pl_pct': (price / cost - 1) * 100,
+                'day_pl': shares * (price - previous_close),
+                'weight': market_value / total if total else np.full(len(shares), np.nan)
+            }, index=pd.Index(list(self.symbols), name='symbol'))
+        return frame
+
+    def exposure(self) -> pd.DataFrame:
+        # Sector totals via bincount over sector codes; the frame is built once at the end
+        shares, cost, price, previous_close = self._columns()
+        codes, sectors = pd.factorize(pd.Series(self._sector_labels()), sort=True)
+        market_value = np.nan_to_num(shares * price)
+        cost_value = np.where(np.isnan(price), 0.0, shares * cost)
+        total = market_value.sum()
+
+        sums = lambda values: np.bincount(codes, weights=values, minlength=len(sectors))
+        value_by_sector = sums(market_value)
+        pl_by_sector = value_by_sector - sums(cost_value)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame = pd.DataFrame({
+                'positions': np.bincount(codes, minlength=len(sectors)),
+                'market_value': value_by_sector,
+                'weight': value_by_sector / total if total else np.full(len(sectors), np.nan),
+                'unrealized_pl': pl_by_sector,
+                'day_pl': sums(np.nan_to_num(shares * (price - previous_close)))
+            }, index=pd.Index(sectors, name='sector'))
+        return frame.sort_values('market_value', ascending=False)
+
+    def summary(self) -> Dict[str, Any]:
+        shares, cost, price, previous_close = self._columns()
+        priced = ~np.isnan(price)
+        market_value = float(np.sum(shares[priced] * price[priced]))
+        cost_value = float(np.sum(shares[priced] * cost[priced]))
+        unrealized = market_value - cost_value
+        return {
+            'positions': len(shares),
+            'priced': int(priced.sum()),
+            'market_value': round(market_value, 2),
+            'cost': round(cost_value, 2),
+            'unrealized_pl': round(unrealized, 2),
+            'unrealized_pl_pct': round(unrealized / cost_value * 100, 2) if cost_value else 0.0,
+            'day_pl': round(float(np.nansum(shares * (price - previous_close))), 2),
+            'realized_pl': round(self.realized_pl, 2),
+            'cash': round(self.cash, 2) if self.cash is not None else None,
+            'total_value': round(market_value + (self.cash or 0.0), 2)
+        }
+
+    def commentary(self, agent: 'StockTradingAgent', symbols: Optional[List[str]] = None,
+                   **kwargs) -> Union[List[Dict[str, Any]], 'ResultTable']:
+        # LLM analysis is a separate, optional step; valuation never waits on it
+        return agent.analyze_many(symbols or list(self.symbols), **kwargs)
+
+    def _add(self, symbol: str, shares: float, price: float):
+        slot = self._slots.get(symbol)
+        if slot is None:
+            self._slots[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self._shares.append(shares)
+            self._cost.append(price)
+            self._price.append(math.nan)
+            self._previous_close.append(math.nan)
+            self._sector.append(None)
+            return
+
+        # Buying more of a holding averages its cost basis
+        total = self._shares[slot] + shares
+        self._cost[slot] = (self._shares[slot] * self._cost[slot] + shares * price) / total if total else 0.0
+        self._shares[slot] = total
+
+    def _columns(self):
+        with self._lock:
+            # Copies, so a concurrent update can't change the arrays mid-computation
+            return tuple(np.array(column, dtype=float) for column in
+                         (self._shares, self._cost, self._price, self._previous_close))
+
+    def _sector_labels(self) -> List[str]:
+        return [sector or 'Unknown' for sector in self._sector]
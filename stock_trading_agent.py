@@ -1,51 +1,304 @@
-from typing import Dict, Any, Optional
-from tools.yahoo_finance_tool import YahooFinanceTool
-from tools.openai_analyzer import OpenAIStockAnalyzer
+from typing import Dict, Any, Optional, List, Iterator, Union, Callable, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor, Future, as_completed
+from tools.cache import MarketDataCache, ResponseCache
+from tools.request_scheduler import RequestScheduler
+from tools.http_session import SessionManager, default_session_manager
+from tools.instrumentation import MetricsRegistry, default_registry
+from tools.results import ResultTable
 import os
-from dotenv import load_dotenv
+import threading
+
+if TYPE_CHECKING:
+    from tools.history_store import HistoryStore
+    from tools.market_data import MarketDataProvider
+    from tools.openai_analyzer import OpenAIStockAnalyzer
+    from tools.prescreen import PreScreen
 
 
 class StockTradingAgent:
-    def __init__(self, openai_api_key: Optional[str] = None):
-        load_dotenv()
-        
-        self.yahoo_tool = YahooFinanceTool()
+    def __init__(self, openai_api_key: Optional[str] = None,
+                 market_data_cache: Optional[MarketDataCache] = None,
+                 history_store: Optional['HistoryStore'] = None,
+                 response_cache: Optional[ResponseCache] = None,
+                 structured_output: bool = False,
+                 scheduler: Optional[RequestScheduler] = None,
+                 session_manager: Optional[SessionManager] = None,
+                 prescreen: Optional['PreScreen'] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 market_data: Optional['MarketDataProvider'] = None):
         api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            # Only look for a .env file when the key isn't already configured
+            from dotenv import load_dotenv
+            load_dotenv()
+            api_key = os.getenv('OPENAI_API_KEY')
         
         if not api_key:
             raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it to the constructor.")
+        
+        # One scheduler rate-limits and retries both Yahoo and OpenAI calls
+        self.scheduler = scheduler or RequestScheduler()
+        # Connection pools are process-wide by default, so agents created one after another reuse them
+        self.session_manager = session_manager or default_session_manager()
+        # Per-stage timings, token usage and cache counters from the agent and both tools
+        self.metrics = metrics or default_registry()
+        
+        # Repeat lookups of the same symbol are served from memory by default
+        self.market_data_cache = market_data_cache or MarketDataCache()
+        self.history_store = history_store
+        
+        # Byte-identical prompts (e.g. while markets are closed) reuse the last completion
+        self.response_cache = response_cache or ResponseCache()
+        self.structured_output = structured_output
+        self._api_key = api_key
+        
+        # analyze_many sends only the symbols that pass the rule-based pre-screen to the LLM
+        self.prescreen = prescreen
+        
+        # The tools import pandas/yfinance/openai, so they're built on first use; any
+        # MarketDataProvider (e.g. LocalFileProvider) can stand in for Yahoo Finance
+        self._yahoo_tool = market_data
+        self._analyzer = None
+        self._tools_lock = threading.Lock()
+    
+    @property
+    def yahoo_tool(self) -> 'MarketDataProvider':
+        if self._yahoo_tool is None:
+            with self._tools_lock:
+                if self._yahoo_tool is None:
+                    from tools.yahoo_finance_tool import YahooFinanceTool
+                    self._yahoo_tool = YahooFinanceTool(cache=self.market_data_cache, history_store=self.history_store,
+                                                        scheduler=self.scheduler, session_manager=self.session_manager,
+                                                        metrics=self.metrics)
+        return self._yahoo_tool
+    
+    @yahoo_tool.setter
+    def yahoo_tool(self, tool: 'MarketDataProvider'):
+        self._yahoo_tool = tool
+    
+    @property
+    def analyzer(self) -> 'OpenAIStockAnalyzer':
+        if self._analyzer is None:
+            with self._tools_lock:
+                if self._analyzer is None:
+                    from tools.openai_analyzer import OpenAIStockAnalyzer
+                    self._analyzer = OpenAIStockAnalyzer(self._api_key, response_cache=self.response_cache,
+                                                         structured=self.structured_output, scheduler=self.scheduler,
+                                                         session_manager=self.session_manager, metrics=self.metrics)
+        return self._analyzer
+    
+    @analyzer.setter
+    def analyzer(self, analyzer: 'OpenAIStockAnalyzer'):
+        self._analyzer = analyzer
+        
+    def warm_up(self):
+        # Build the tools and the OpenAI client ahead of the first request, e.g. from a
+        # background thread while an interactive prompt waits for input
+        self.yahoo_tool
+        self.analyzer.client
+        
+    def analyze_stock(self, symbol: str, stock_data: Optional[Dict[str, Any]] = None,
+                      verbose: bool = True, refresh: bool = False) -> Dict[str, Any]:
+        with self.metrics.span('agent.analyze_stock'):
+            return self._analyze_stock(symbol, stock_data, verbose, refresh)
+    
+    def _analyze_stock(self, symbol: str, stock_data: Optional[Dict[str, Any]], verbose: bool,
+                       refresh: bool) -> Dict[str, Any]:
+        if verbose:
+            print(f"\n🔍 Analyzing {symbol.upper()}...")
+        
+        # Reuse data prefetched with get_stock_info_batch when provided
+        if stock_data is None:
+            with self.metrics.span('agent.fetch'):
+                stock_data = self.yahoo_tool.get_stock_info(symbol)
+        
+        if not stock_data['success']:
+            return self._build_result(symbol, stock_data)
+        
+        if verbose:
+            print(f"✅ Retrieved stock data for {stock_data['data']['company_name']}")
+            print(f"💰 Current Price: ${stock_data['data']['current_price']}")
+            print(f"📊 Week Change: {stock_data['data']['week_change']}%")
+            print(f"📈 Month Change: {stock_data['data']['month_change']}%")
+            
+            print("\n🤖 Analyzing with AI...")
+        with self.metrics.span('agent.analysis'):
+            analysis = self.analyzer.analyze_stock(stock_data, refresh=refresh)
+        
+        return self._build_result(symbol, stock_data, analysis)
+    
+    def analyze_stock_stream(self, symbol: str, stock_data: Optional[Dict[str, Any]] = None,
+                             refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        if stock_data is None:
+            stock_data = self.yahoo_tool.get_stock_info(symbol)
+        
+        if not stock_data['success']:
+            yield {'type': 'result', 'result': self._build_result(symbol, stock_data)}
+            return
+        
+        # Let callers render the quote before the first token arrives
+        yield {'type': 'stock_data', 'stock_data': stock_data['data']}
+        
+        for event in self.analyzer.analyze_stock_stream(stock_data, refresh=refresh):
+            if event['type'] == 'result':
+                analysis = event['result']
+                result = self._build_result(symbol, stock_data, analysis)
+                result['timing'] = analysis['timing']
+                event = {'type': 'result', 'result': result}
+            yield event
+    
+    def analyze_many(self, symbols: List[str], max_concurrency: int = 4, verbose: bool = False,
+                     batch_size: Optional[int] = None, as_table: bool = False,
+                     prescreen: Optional['PreScreen'] = None,
+                     on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Union[List[Dict[str, Any]], ResultTable]:
+        prescreen = prescreen or self.prescreen
+        if verbose:
+            print(f"\n🔍 Analyzing {len(symbols)} stocks with up to {max_concurrency} in flight...")
+        
+        with self.metrics.span('agent.analyze_many', batch=bool(batch_size)):
+            return self._analyze_many(symbols, max_concurrency, verbose, batch_size, as_table, prescreen, on_result)
+    
+    def _analyze_many(self, symbols: List[str], max_concurrency: int, verbose: bool, batch_size: Optional[int],
+                      as_table: bool, prescreen: Optional['PreScreen'],
+                      on_result: Optional[Callable[[Dict[str, Any]], None]]) -> Union[List[Dict[str, Any]], ResultTable]:
+        # Price history for every symbol comes back in one request and goes through one
+        # vectorized metrics pass; only fundamentals lookups and LLM calls run in the pool
+        with self.metrics.span('agent.fetch', batch=True):
+            try:
+                quotes = self.yahoo_tool.get_stock_info_batch(symbols, include_info=False)
+            except Exception:
+                quotes = {}
+        
+        def fetch(symbol: str) -> Dict[str, Any]:
+            stock_data = quotes.get(symbol.upper())
+            if stock_data is None or not stock_data['success']:
+                # Symbols missing from the batch fall back to an individual fetch
+                with self.metrics.span('agent.fetch'):
+                    return self.yahoo_tool.get_stock_info(symbol)
+            
+            try:
+                with self.metrics.span('agent.fundamentals'):
+                    fundamentals = self.yahoo_tool.get_fundamentals(symbol)
+            except Exception as e:
+                return {'success': False, 'symbol': symbol, 'error': str(e)}
+            # The quote's fundamentals fields are placeholders until the lookup fills them in
+            return {**stock_data, 'data': {**stock_data['data'], **fundamentals}}
+                
+        def run(symbol: str) -> Dict[str, Any]:
+            return self.analyze_stock(symbol, stock_data=fetch(symbol), verbose=False)
+        
+        # A ResultTable packs each result into columns
+        results = ResultTable() if as_table else []
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            if batch_size or prescreen:
+                stock_data_list = list(executor.map(fetch, symbols))
+                screened = self._prescreen(prescreen, stock_data_list, verbose)
+                if batch_size:
+                    # Several symbols share one prompt; batches run concurrently
+                    futures = self._submit_batches(executor, symbols, stock_data_list, batch_size, screened)
+                else:
+                    futures = [self._completed(self._build_result(symbol, stock_data, analysis)) if analysis
+                               else executor.submit(self.analyze_stock, symbol, stock_data=stock_data, verbose=False)
+                               for symbol, stock_data, analysis in zip(symbols, stock_data_list, screened)]
+            else:
+                # Fundamentals lookups and LLM calls overlap across the pool
+                futures = [executor.submit(run, symbol) for symbol in symbols]
             
-        self.analyzer = OpenAIStockAnalyzer(api_key)
+            # on_result (e.g. an exporter's write) sees each result as soon as it completes, so a
+            # slow symbol doesn't hold back the ones after it; the return value keeps input order
+            positions = {future: i for i, future in enumerate(futures)}
+            ordered = [None] * len(symbols)
+            for future in as_completed(futures):
+                symbol = symbols[positions[future]]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = self._failure_result(symbol, e)
+                ordered[positions[future]] = result
+                if on_result is not None:
+                    on_result(result)
+                
+                if verbose:
+                    status = result['recommendation'] if result['success'] else '❌ failed'
+                    print(f"  {symbol.upper()}: {status}")
+        
+        for result in ordered:
+            results.append(result)
+        return results
+    
+    def _prescreen(self, prescreen: Optional['PreScreen'], stock_data_list: List[Dict[str, Any]],
+                   verbose: bool) -> List[Optional[Dict[str, Any]]]:
+        if prescreen is None:
+            return [None] * len(stock_data_list)
+        
+        screened = prescreen.screen(stock_data_list)
+        if verbose:
+            skipped = sum(analysis is not None for analysis in screened)
+            print(f"🧮 Pre-screen: {len(screened) - skipped} sent to AI, {skipped} rule-only")
+        return screened
+    
+    def _completed(self, result: Dict[str, Any]) -> Future:
+        future = Future()
+        future.set_result(result)
+        return future
+    
+    def _submit_batches(self, executor: ThreadPoolExecutor, symbols: List[str],
+                        stock_data_list: List[Dict[str, Any]], batch_size: int,
+                        screened: Optional[List[Optional[Dict[str, Any]]]] = None) -> List[Future]:
+        screened = screened or [None] * len(symbols)
+        futures = [Future() for _ in symbols]
+        pending = [i for i, stock_data in enumerate(stock_data_list) if stock_data['success'] and not screened[i]]
         
-    def analyze_stock(self, symbol: str) -> Dict[str, Any]:
-        print(f"\n🔍 Analyzing {symbol.upper()}...")
+        for i, stock_data in enumerate(stock_data_list):
+            if not stock_data['success']:
+                futures[i].set_result(self._build_result(symbols[i], stock_data))
+            elif screened[i]:
+                futures[i].set_result(self._build_result(symbols[i], stock_data, screened[i]))
         
-        stock_data = self.yahoo_tool.get_stock_info(symbol)
+        def run_batch(indices: List[int]):
+            try:
+                analyses = self.analyzer.analyze_stocks_batch([stock_data_list[i] for i in indices],
+                                                              batch_size=len(indices))
+                for i, analysis in zip(indices, analyses):
+                    futures[i].set_result(self._build_result(symbols[i], stock_data_list[i], analysis))
+            except Exception as e:
+                for i in indices:
+                    if not futures[i].done():
+                        futures[i].set_exception(e)
         
+        for start in range(0, len(pending), batch_size):
+            executor.submit(run_batch, pending[start:start + batch_size])
+        
+        return futures
+    
+    def _failure_result(self, symbol: str, error: Exception) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'symbol': symbol.upper(),
+            'error': str(error),
+            'message': f"Failed to analyze {symbol}: {str(error)}"
+        }
+    
+    def _build_result(self, symbol: str, stock_data: Dict[str, Any],
+                      analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         if not stock_data['success']:
             return {
                 'success': False,
+                'symbol': symbol.upper(),
                 'error': stock_data['error'],
                 'message': f"Failed to fetch data for {symbol}: {stock_data['error']}"
             }
         
-        print(f"✅ Retrieved stock data for {stock_data['data']['company_name']}")
-        print(f"💰 Current Price: ${stock_data['data']['current_price']}")
-        print(f"📊 Week Change: {stock_data['data']['week_change']}%")
-        print(f"📈 Month Change: {stock_data['data']['month_change']}%")
-        
-        print("\n🤖 Analyzing with AI...")
-        analysis = self.analyzer.analyze_stock(stock_data)
-        
         if not analysis['success']:
             return {
                 'success': False,
+                'symbol': symbol.upper(),
                 'error': analysis['error'],
                 'message': f"Failed to analyze stock: {analysis['error']}",
                 'stock_data': stock_data['data']
             }
         
-        return {
+        result = {
             'success': True,
             'symbol': symbol.upper(),
             'company_name': stock_data['data']['company_name'],
@@ -56,8 +309,29 @@ class StockTradingAgent:
             'key_factors': analysis['key_factors'],
             'stock_data': stock_data['data']
         }
+        
+        # Structured output adds parsed reasons, risks and price targets
+        for key in ('reasons', 'risks', 'price_targets'):
+            if key in analysis:
+                result[key] = analysis[key]
+        
+        # Rule-only results from the pre-screen say so
+        if analysis.get('prescreened'):
+            result['prescreened'] = True
+            result['prescreen_score'] = analysis['prescreen_score']
+        
+        return result
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = self.market_data_cache.stats()
+        stats['responses'] = self.response_cache.stats()
+        return stats
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        # p50/p95/p99 per stage plus token and cache counters; see tools.instrumentation
+        return self.metrics.summary()
     
-    def get_recommendation_summary(self, result: Dict[str, Any]) -> str:
+    def get_recommendation_summary(self, result: Dict[str, Any], include_analysis: bool = True) -> str:
         if not result['success']:
             return f"❌ Analysis failed: {result.get('error', 'Unknown error')}"
         
@@ -86,12 +360,25 @@ class StockTradingAgent:
         for factor in result['key_factors']:
             summary += f"  • {factor}\n"
         
-        summary += f"""
+        if result.get('reasons'):
+            summary += "\n✅ Reasons:\n"
+            for reason in result['reasons']:
+                summary += f"  • {reason}\n"
+        
+        if result.get('risks'):
+            summary += "\n⚠️  Risks:\n"
+            for risk in result['risks']:
+                summary += f"  • {risk}\n"
+        
+        if include_analysis:
+            summary += f"""
 📝 Detailed Analysis:
 {'-'*60}
 {result['analysis']}
 {'-'*60}
-
+"""
+        
+        summary += f"""
 ⏰ Analysis Timestamp: {result['stock_data'].get('timestamp', 'N/A')}
 {'='*60}
 """
@@ -0,0 +1,43 @@
+"""Shared fixtures: replayed market data and a local fake OpenAI endpoint, so the
+suite runs offline and without an API key."""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.fake_openai import FakeOpenAIServer  # noqa: E402
+from benchmarks.fixtures import ReplayYahooFinanceTool, generate_fixtures  # noqa: E402
+
+SYMBOLS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF']
+
+
+def unthrottled_scheduler():
+    from tools.request_scheduler import RequestScheduler, ProviderPolicy
+    policy = lambda: ProviderPolicy(rate=1e9, burst=1e9)
+    return RequestScheduler({'yahoo': policy(), 'openai': policy()})
+
+
+@pytest.fixture(scope='session')
+def market_fixtures():
+    return generate_fixtures(SYMBOLS)
+
+
+@pytest.fixture(scope='session')
+def openai_server():
+    with FakeOpenAIServer() as server:
+        yield server
+
+
+@pytest.fixture
+def agent(market_fixtures, openai_server, monkeypatch):
+    from stock_trading_agent import StockTradingAgent
+    from tools.instrumentation import MetricsRegistry
+    monkeypatch.setenv('OPENAI_BASE_URL', openai_server.url)
+    agent = StockTradingAgent(openai_api_key='sk-test', scheduler=unthrottled_scheduler(), metrics=MetricsRegistry())
+    agent.yahoo_tool = ReplayYahooFinanceTool(market_fixtures, cache=agent.market_data_cache, scheduler=agent.scheduler,
+                                              session_manager=agent.session_manager, metrics=agent.metrics)
+    return agent
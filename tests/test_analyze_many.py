@@ -0,0 +1,113 @@
+import threading
+
+import pytest
+
+from conftest import SYMBOLS
+
+
+@pytest.mark.parametrize('batch_size', [None, 2])
+def test_results_follow_input_order(agent, batch_size):
+    symbols = list(reversed(SYMBOLS)) + ['aaa']
+    results = agent.analyze_many(symbols, max_concurrency=4, batch_size=batch_size)
+
+    assert [result['symbol'] for result in results] == [symbol.upper() for symbol in symbols]
+    assert all(result['success'] for result in results)
+    assert {result['recommendation'] for result in results} == {'HOLD'}
+
+
+@pytest.mark.parametrize('batch_size', [None, 2])
+def test_unknown_symbol_fails_alone(agent, batch_size):
+    results = agent.analyze_many(['AAA', 'NOPE', 'BBB'], max_concurrency=3, batch_size=batch_size)
+
+    assert [result['success'] for result in results] == [True, False, True]
+    assert results[1]['symbol'] == 'NOPE'
+    assert results[1]['error'] == 'No data available for this symbol'
+
+
+def test_analysis_error_fails_alone(agent):
+    analyze_stock = agent.analyzer.analyze_stock
+
+    def flaky(stock_data, **kwargs):
+        if stock_data['data']['symbol'] == 'CCC':
+            raise RuntimeError('model overloaded')
+        return analyze_stock(stock_data, **kwargs)
+
+    agent.analyzer.analyze_stock = flaky
+    results = agent.analyze_many(['AAA', 'BBB', 'CCC', 'DDD'], max_concurrency=4)
+
+    assert [result['success'] for result in results] == [True, True, False, True]
+    assert results[2]['symbol'] == 'CCC'
+    assert 'model overloaded' in results[2]['error']
+
+
+def test_on_result_sees_every_result(agent):
+    seen = []
+    results = agent.analyze_many(SYMBOLS, max_concurrency=4, on_result=seen.append)
+
+    assert sorted(seen, key=lambda result: SYMBOLS.index(result['symbol'])) == results
+
+
+def test_slow_symbol_does_not_hold_back_on_result(agent, monkeypatch):
+    # AAA finishes only once every other result has been handed to on_result
+    release = threading.Event()
+    analyze_stock = agent.analyze_stock
+
+    def slow_first(symbol, **kwargs):
+        if symbol == 'AAA':
+            assert release.wait(5)
+        return analyze_stock(symbol, **kwargs)
+
+    seen = []
+
+    def on_result(result):
+        seen.append(result['symbol'])
+        if len(seen) == len(SYMBOLS) - 1:
+            release.set()
+
+    monkeypatch.setattr(agent, 'analyze_stock', slow_first)
+    results = agent.analyze_many(SYMBOLS, max_concurrency=len(SYMBOLS), on_result=on_result)
+
+    assert seen[-1] == 'AAA' and sorted(seen) == SYMBOLS
+    assert [result['symbol'] for result in results] == SYMBOLS
+    assert all(result['success'] for result in results)
+
+
+def test_repeat_analysis_is_served_from_caches(agent, openai_server):
+    agent.analyze_many(SYMBOLS, max_concurrency=4)
+    requests = openai_server.requests
+
+    results = agent.analyze_many(SYMBOLS, max_concurrency=4)
+
+    assert all(result['success'] for result in results)
+    assert openai_server.requests == requests
+    counters = agent.get_metrics()['counters']
+    assert counters['cache.hits{cache=responses}'] == len(SYMBOLS)
+    assert counters['cache.hits{cache=prices}'] >= len(SYMBOLS)
+    assert agent.get_cache_stats()['responses']['hits'] == len(SYMBOLS)
+
+
+def test_refresh_bypasses_the_response_cache(agent, openai_server):
+    agent.analyze_stock('AAA', verbose=False)
+    requests = openai_server.requests
+
+    result = agent.analyze_stock('AAA', verbose=False, refresh=True)
+
+    assert result['success']
+    assert openai_server.requests == requests + 1
+
+
+def test_batched_quotes_match_single_fetches(agent):
+    results = agent.analyze_many(SYMBOLS, max_concurrency=4)
+
+    for result in results:
+        single = agent.yahoo_tool.get_stock_info(result['symbol'])['data']
+        assert result['stock_data'] == single
+        assert result['company_name'] == single['company_name'] != result['symbol']
+
+
+def test_quotes_come_from_one_metrics_pass(agent):
+    agent.analyze_many(SYMBOLS, max_concurrency=4)
+
+    timers = agent.get_metrics()['timers']
+    assert timers['yahoo.metrics{batch=True,status=ok}']['count'] == 1
+    assert 'yahoo.metrics{status=ok}' not in timers
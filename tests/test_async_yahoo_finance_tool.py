@@ -0,0 +1,64 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from tools.async_yahoo_finance_tool import AsyncYahooFinanceTool
+from tools.cache import MarketDataCache
+
+
+class ChartTool(AsyncYahooFinanceTool):
+    # Serves synthetic charts without the network; BAD fails the way a delisted ticker does
+    def __init__(self, now, **kwargs):
+        super().__init__(**kwargs)
+        self.now = now
+        self.requested = []
+
+    def _now(self):
+        return self.now
+
+    async def _fetch_chart(self, ticker, start_date, end_date):
+        self.requested.append((ticker, end_date))
+        if ticker == 'BAD':
+            request = httpx.Request('GET', 'https://example.invalid')
+            raise httpx.HTTPStatusError('422', request=request, response=httpx.Response(422, request=request))
+        dates = pd.bdate_range(end=end_date, periods=60, name='Date')
+        close = np.linspace(100, 120, len(dates))
+        return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                             'Volume': 1e6}, index=dates)
+
+    async def _get_info(self, ticker):
+        return {'longName': f"{ticker} Inc."}
+
+
+def test_failed_ticker_is_left_out_of_the_batch():
+    tool = ChartTool(datetime(2024, 6, 28))
+
+    results = asyncio.run(tool.get_stock_info_batch(['AAA', 'BAD', 'BBB']))
+
+    assert [results[ticker]['success'] for ticker in ('AAA', 'BAD', 'BBB')] == [True, False, True]
+    assert results['BAD']['error'] == 'No data available for this symbol'
+    assert results['AAA']['data']['company_name'] == 'AAA Inc.'
+
+
+def test_batch_where_every_ticker_fails_reports_the_error():
+    tool = ChartTool(datetime(2024, 6, 28))
+
+    results = asyncio.run(tool.get_stock_info_batch(['BAD']))
+
+    assert not results['BAD']['success']
+    assert '422' in results['BAD']['error']
+
+
+def test_clock_override_sets_the_as_of_date():
+    now = datetime(2024, 6, 28)
+    tool = ChartTool(now, cache=MarketDataCache())
+
+    asyncio.run(tool.get_stock_info('AAA'))
+    asyncio.run(tool.get_stock_info_batch(['BBB']))
+    table = asyncio.run(tool.get_metrics_table(['CCC']))
+
+    assert {end_date for _, end_date in tool.requested} == {now}
+    assert table.loc['CCC', 'current_price'] == 120
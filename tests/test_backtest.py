@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import Backtester
+from backtest.strategies import BUY, HOLD, Strategy
+
+
+def panel():
+    dates = pd.bdate_range('2023-01-02', '2024-06-28', name='Date')
+    close = 100 + np.sin(np.arange(len(dates)) / 10) * 5
+    frame = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                          'Volume': 1e6}, index=dates)
+    return {'S0': frame, 'S1': frame * 1.5}
+
+
+def attractive_pe(table):
+    return table['attractive_pe'].map({True: 'BUY', False: 'HOLD'})
+
+
+def dividend(table):
+    return table['dividend'].map({True: 'BUY', False: 'HOLD'})
+
+
+@pytest.mark.parametrize('info', [
+    {'trailingPE': 10, 'longBusinessSummary': 'Makes things.', 'companyOfficers': [{'name': 'A'}]},
+    {'pe_ratio': 10}
+])
+def test_fundamentals_accept_yfinance_info(info):
+    result = Backtester().run(attractive_pe, panel=panel(), start=pd.Timestamp('2024-01-02'),
+                              fundamentals={'S0': info})
+
+    assert (result.signals['S0'] == BUY).all()
+    assert (result.signals['S1'] == HOLD).all()
+
+
+def test_dividend_yield_from_info():
+    result = Backtester().run(dividend, panel=panel(), start=pd.Timestamp('2024-01-02'),
+                              fundamentals={'S0': {'dividendYield': 0.04}, 'S1': {'dividendYield': 0}})
+
+    assert (result.signals['S0'] == BUY).all()
+    assert (result.signals['S1'] == HOLD).all()
+
+
+def test_strategy_must_implement_signals():
+    class Incomplete(Strategy):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,112 @@
+import pandas as pd
+import pytest
+
+from tools.cache import MarketDataCache, ResponseCache, SQLiteCacheBackend, TTLCache
+from tools.openai_analyzer import OpenAIStockAnalyzer
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr('tools.cache.time', clock)
+    return clock
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=60)
+
+    clock.now += 30
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+
+
+def test_sqlite_backend_survives_a_restart(tmp_path, clock):
+    path = str(tmp_path / 'cache.db')
+    first = MarketDataCache(path=path, price_ttl=60)
+    first.fundamentals.set('AAA', {'sector': 'Energy'})
+    first.prices.set('AAA:2024-06-28:365', pd.DataFrame({'Close': [1.0, 2.0]}))
+    first.backend.close()
+
+    second = MarketDataCache(path=path, price_ttl=60)
+
+    assert second.fundamentals.get('AAA') == {'sector': 'Energy'}
+    assert second.prices.get('AAA:2024-06-28:365')['Close'].tolist() == [1.0, 2.0]
+    assert second.stats()['fundamentals']['hits'] == 1
+    # Namespaces don't share keys
+    assert second.sectors.get('AAA') is None
+
+    clock.now += 120
+    third = MarketDataCache(path=path, price_ttl=60)
+    assert third.prices.get('AAA:2024-06-28:365') is None
+    assert third.fundamentals.get('AAA') == {'sector': 'Energy'}
+
+
+def test_backend_clear_and_purge(tmp_path, clock):
+    backend = SQLiteCacheBackend(str(tmp_path / 'cache.db'))
+    backend.set('prices', 'a', 1, expires_at=clock.now - 1)
+    backend.set('prices', 'b', 2, expires_at=clock.now + 60)
+    backend.set('responses', 'c', 3, expires_at=clock.now + 60)
+
+    backend.purge_expired()
+    assert backend.get('prices', 'a') is None and backend.get('prices', 'b') == (clock.now + 60, 2)
+
+    backend.clear('prices')
+    assert backend.get('prices', 'b') is None
+    assert backend.get('responses', 'c') is not None
+
+
+def test_response_key_covers_every_request_field():
+    base = ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 800)
+
+    assert ResponseCache.make_key('gpt', 0.7, ' system ', 'prompt\n', 800) == base
+    assert ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 250) != base
+    assert ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 800,
+                                  {'response_format': {'type': 'json_object'}}) != base
+    tools = {'tools': [{'type': 'function'}], 'tool_choice': 'auto'}
+    assert ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 800, tools) != base
+    assert ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 800, tools) == \
+        ResponseCache.make_key('gpt', 0.7, 'system', 'prompt', 800, dict(reversed(list(tools.items()))))
+
+
+def test_analyzer_responses_persist_and_respect_the_token_limit(agent, openai_server, tmp_path):
+    path = str(tmp_path / 'responses.db')
+    stock_data = agent.yahoo_tool.get_stock_info('AAA')
+    analyzer = OpenAIStockAnalyzer('sk-test', response_cache=ResponseCache(path=path))
+
+    assert not analyzer.analyze_stock(stock_data)['cached']
+    requests = openai_server.requests
+
+    restarted = OpenAIStockAnalyzer('sk-test', response_cache=ResponseCache(path=path))
+    assert restarted.analyze_stock(stock_data)['cached']
+    assert openai_server.requests == requests
+
+    restarted.max_tokens = 100
+    assert not restarted.analyze_stock(stock_data)['cached']
+    assert not restarted.analyze_stock(stock_data, structured=True)['cached']
+    assert restarted.analyze_stock(stock_data, refresh=True)['cached'] is False
+    assert openai_server.requests == requests + 3
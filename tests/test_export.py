@@ -0,0 +1,60 @@
+import json
+import math
+
+import pytest
+
+from conftest import SYMBOLS
+from tools.export import EXPORT_COLUMNS, iter_results, open_exporter, read_results
+
+
+@pytest.mark.parametrize('extension', ['jsonl', 'parquet', 'arrow'])
+def test_round_trip(agent, tmp_path, extension):
+    if extension != 'jsonl':
+        pytest.importorskip('pyarrow')
+    path = str(tmp_path / f"results.{extension}")
+
+    with open_exporter(path, batch_size=2) as exporter:
+        results = agent.analyze_many(SYMBOLS[:4] + ['NOPE'], max_concurrency=4, on_result=exporter)
+
+    frame = read_results(path)
+    assert list(frame.columns) == EXPORT_COLUMNS
+    assert sorted(frame['symbol']) == sorted(result['symbol'] for result in results)
+
+    rows = frame.set_index('symbol')
+    for result in results[:4]:
+        row = rows.loc[result['symbol']]
+        assert row['recommendation'] == result['recommendation']
+        assert row['current_price'] == result['current_price']
+        assert row['analysis'] == result['analysis']
+        assert list(row['key_factors']) == result['key_factors']
+    assert not rows.loc['NOPE', 'success'] and rows.loc['NOPE', 'error']
+    assert math.isnan(rows.loc['NOPE', 'current_price'])
+
+    selected = list(iter_results(path, filters=[('symbol', 'in', ['AAA', 'NOPE'])], columns=['symbol', 'success']))
+    assert sorted(selected, key=lambda record: record['symbol']) == [
+        {'symbol': 'AAA', 'success': True}, {'symbol': 'NOPE', 'success': False}
+    ]
+
+
+def test_jsonl_lines_are_on_disk_as_results_complete(agent, tmp_path):
+    path = str(tmp_path / 'results.jsonl')
+    lines_seen = []
+
+    with open_exporter(path) as exporter:
+        def on_result(result):
+            exporter(result)
+            with open(path, encoding='utf-8') as f:
+                lines_seen.append(len(f.readlines()))
+
+        agent.analyze_many(SYMBOLS[:3], on_result=on_result)
+
+    assert lines_seen == [1, 2, 3]
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    # Missing metrics are null, not NaN, so the file stays valid JSON
+    assert all(record['prescreen_score'] is None for record in records)
+
+
+def test_unknown_extension_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_exporter(str(tmp_path / 'results.csv'))
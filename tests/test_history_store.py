@@ -0,0 +1,73 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from tools.history_store import HistoryStore
+from tools.market_data import MarketDataTool
+
+
+def bars(start, end):
+    dates = pd.bdate_range(start, end, name='Date')
+    close = np.arange(len(dates), dtype=float) + 100
+    return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                         'Volume': 1e6}, index=dates)
+
+
+class FrameTool(MarketDataTool):
+    def __init__(self, frame, **kwargs):
+        super().__init__(**kwargs)
+        self.frame = frame
+        self.requests = []
+
+    def _download(self, tickers, start_date, end_date):
+        self.requests.append((start_date.date(), end_date.date()))
+        return {ticker: self.frame.loc[start_date:end_date] for ticker in tickers}
+
+
+def test_missing_ranges(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.write('AAA', bars('2024-03-01', '2024-06-28'))
+    store.write('BBB', bars('2024-01-02', '2024-06-28'))
+    store.write('OLD', bars('2023-01-02', '2023-06-30'))
+
+    ranges = store.missing_ranges(['AAA', 'BBB', 'OLD', 'NEW'], datetime(2024, 1, 2))
+
+    assert ranges == {
+        (date(2024, 1, 2), date(2024, 3, 1)): ['AAA'],
+        (date(2024, 6, 28), None): ['AAA', 'BBB'],
+        (date(2024, 1, 2), None): ['OLD', 'NEW']
+    }
+
+
+def test_weekend_before_first_bar_is_not_a_gap(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.write('AAA', bars('2024-01-08', '2024-06-28'))
+
+    # 2024-01-06 is a Saturday
+    assert store.missing_ranges(['AAA'], datetime(2024, 1, 6)) == {(date(2024, 6, 28), None): ['AAA']}
+
+
+def test_backfill_keeps_later_bars(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.write('AAA', bars('2024-03-01', '2024-06-28'))
+    stored = store.read('AAA')
+
+    store.write('AAA', bars('2024-01-02', '2024-03-01'))
+
+    merged = store.read('AAA')
+    assert merged.index[0] == pd.Timestamp('2024-01-02')
+    pd.testing.assert_frame_equal(merged.loc['2024-03-04':], stored.loc['2024-03-04':])
+    assert merged.index.is_unique
+
+
+def test_earlier_start_backfills_history(tmp_path):
+    frame = bars('2023-06-01', '2024-06-28')
+    tool = FrameTool(frame, history_store=HistoryStore(str(tmp_path)))
+    end = datetime(2024, 6, 28)
+
+    tool.download_history(['AAA'], end_date=end, days=30)
+    full = tool.download_history(['AAA'], end_date=end, days=200)['AAA']
+
+    assert tool.requests[1:] == [(date(2023, 12, 11), date(2024, 5, 29)), (date(2024, 6, 28), date(2024, 6, 28))]
+    pd.testing.assert_frame_equal(full, frame.loc['2023-12-11':], check_freq=False, check_index_type=False)
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixtures import panel
+from conftest import SYMBOLS
+from tools.indicators import INDICATOR_COLUMNS, IndicatorState, compute_indicators, seed_indicators
+
+
+@pytest.fixture
+def frames(market_fixtures):
+    frames = panel(market_fixtures, SYMBOLS[:3])
+    # One symbol listed a few weeks ago, so some windows are still unfilled
+    frames['CCC'] = frames['CCC'].iloc[-30:]
+    return frames
+
+
+def feed(state, frame):
+    for timestamp, bar in frame.iterrows():
+        values = state.update(bar['Close'], bar['High'], bar['Low'], bar['Volume'], timestamp)
+    return values
+
+
+def assert_matches(values, expected):
+    actual = pd.Series(values)[INDICATOR_COLUMNS].astype(float)
+    np.testing.assert_allclose(actual.to_numpy(), expected[INDICATOR_COLUMNS].to_numpy(dtype=float), rtol=1e-9)
+
+
+def test_bar_by_bar_updates_match_vectorized(frames):
+    expected = compute_indicators(frames)
+
+    for symbol, frame in frames.items():
+        assert_matches(feed(IndicatorState(), frame), expected.loc[symbol])
+    assert expected.loc['CCC', ['sma_50', 'macd_signal']].isna().all()
+
+
+def test_seeded_state_continues_like_vectorized(frames):
+    expected = compute_indicators(frames)
+    states = seed_indicators({symbol: frame.iloc[:-10] for symbol, frame in frames.items()})
+
+    for symbol, frame in frames.items():
+        assert states[symbol].timestamp == frame.index[-11]
+        assert_matches(feed(states[symbol], frame.iloc[-10:]), expected.loc[symbol])
+
+
+def test_same_timestamp_replaces_the_last_bar(frames):
+    expected = compute_indicators(frames)
+
+    for symbol, frame in frames.items():
+        state = IndicatorState.from_history(frame.iloc[:-3])
+        feed(state, frame.iloc[-3:-1])
+        last = frame.iloc[-1]
+        # Intraday revisions of today's bar, then the close
+        for factor in (0.9, 1.2):
+            state.update(last['Close'] * factor, last['High'] * factor, last['Low'] * factor,
+                         last['Volume'] / 2, frame.index[-1])
+        values = state.update(last['Close'], last['High'], last['Low'], last['Volume'], frame.index[-1])
+
+        assert state.bars == len(frame)
+        assert_matches(values, expected.loc[symbol])
+
+
+def test_seeded_last_bar_can_be_replaced(frames):
+    # e.g. seeded during the session, then updated with the same day's later bar
+    expected = compute_indicators(frames)
+    provisional = {symbol: frame.iloc[-1] * 0.95 for symbol, frame in frames.items()}
+    states = seed_indicators({symbol: pd.concat([frame.iloc[:-1], provisional[symbol].to_frame().T])
+                              for symbol, frame in frames.items()})
+
+    for symbol, frame in frames.items():
+        assert_matches(feed(states[symbol], frame.iloc[-1:]), expected.loc[symbol])
+        assert states[symbol].bars == len(frame)
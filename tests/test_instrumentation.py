@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from tools.instrumentation import JsonLinesSink, MetricsRegistry
+
+
+def test_timer_summary_and_quantiles():
+    metrics = MetricsRegistry()
+    for seconds in range(1, 101):
+        metrics.observe('openai.completion', seconds / 100, kind='prose')
+
+    timer = metrics.summary()['timers']['openai.completion{kind=prose}']
+
+    assert timer['count'] == 100
+    assert timer['sum'] == pytest.approx(50.5)
+    assert (timer['p50'], timer['p95'], timer['p99'], timer['max']) == (0.5, 0.95, 0.99, 1.0)
+
+
+def test_percentiles_cover_recent_samples_only():
+    metrics = MetricsRegistry(max_samples=10)
+    for seconds in [100.0] + [1.0] * 10:
+        metrics.observe('yahoo.download', seconds)
+
+    timer = metrics.summary()['timers']['yahoo.download']
+
+    assert timer['count'] == 11 and timer['max'] == 100.0
+    assert timer['p99'] == 1.0
+
+
+def test_span_records_status():
+    metrics = MetricsRegistry()
+    with metrics.span('agent.fetch', batch=True):
+        pass
+    with pytest.raises(KeyError):
+        with metrics.span('agent.fetch', batch=True):
+            raise KeyError('AAA')
+
+    timers = metrics.summary()['timers']
+
+    assert timers['agent.fetch{batch=True,status=ok}']['count'] == 1
+    assert timers['agent.fetch{batch=True,status=error}']['count'] == 1
+
+
+def test_counters_add_up_per_label_set():
+    metrics = MetricsRegistry()
+    metrics.increment('cache.hits', 3, cache='prices')
+    metrics.increment('cache.hits', cache='prices')
+    metrics.increment('cache.hits', cache='responses')
+    metrics.increment('cache.misses', 0, cache='prices')
+
+    assert metrics.summary()['counters'] == {'cache.hits{cache=prices}': 4, 'cache.hits{cache=responses}': 1}
+
+    metrics.reset()
+    assert metrics.summary() == {'timers': {}, 'counters': {}}
+
+
+def test_prometheus_exposition():
+    metrics = MetricsRegistry()
+    metrics.observe('openai.completion', 0.25, kind='prose')
+    metrics.increment('cache.hits', 2, cache='prices')
+    metrics.increment('cache.hits', cache='say "hi"')
+
+    lines = metrics.to_prometheus(prefix='app').splitlines()
+
+    assert lines.count('# TYPE app_openai_completion_seconds summary') == 1
+    assert 'app_openai_completion_seconds{kind="prose",quantile="0.95"} 0.25' in lines
+    assert 'app_openai_completion_seconds_count{kind="prose"} 1' in lines
+    assert lines.count('# TYPE app_cache_hits_total counter') == 1
+    assert 'app_cache_hits_total{cache="prices"} 2' in lines
+    assert 'app_cache_hits_total{cache="say \\"hi\\""} 1' in lines
+    assert MetricsRegistry().to_prometheus() == ''
+
+
+def test_sinks_receive_every_event(tmp_path):
+    path = str(tmp_path / 'metrics.jsonl')
+    sink = JsonLinesSink(path)
+
+    def broken(event):
+        raise RuntimeError('exporter down')
+
+    metrics = MetricsRegistry(sinks=[broken, sink])
+    with metrics.span('agent.analysis'):
+        pass
+    metrics.increment('yahoo.symbols_downloaded', 5)
+    sink.close()
+
+    with open(path, encoding='utf-8') as f:
+        events = [json.loads(line) for line in f]
+    assert [(event['type'], event['name']) for event in events] == [
+        ('timer', 'agent.analysis'), ('counter', 'yahoo.symbols_downloaded')
+    ]
+    assert events[0]['labels'] == {'status': 'ok'} and events[0]['seconds'] >= 0
+    assert events[1]['value'] == 5 and 'timestamp' in events[1]
+
+
+def test_agent_records_stage_timings_and_counters(agent):
+    agent.analyze_stock('AAA')
+    agent.analyze_stock('AAA')
+
+    metrics = agent.get_metrics()
+    timers, counters = metrics['timers'], metrics['counters']
+
+    for stage in ('agent.analyze_stock', 'agent.fetch', 'agent.analysis'):
+        assert timers[f"{stage}{{status=ok}}"]['count'] == 2
+    # The repeated analysis is answered from the response cache
+    assert timers['openai.completion{kind=prose,status=ok}']['count'] == 1
+    assert counters['cache.misses{cache=responses}'] == 1
+    assert counters['cache.hits{cache=responses}'] == 1
+    assert counters['cache.hits{cache=prices}'] == 1
+    labels = f"{{kind=prose,model={agent.analyzer.model}}}"
+    assert counters[f"openai.prompt_tokens{labels}"] > 0
+    assert counters[f"openai.completion_tokens{labels}"] > 0
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from tools.indicators import INDICATOR_COLUMNS
+from tools.market_data import MarketDataTool
+
+
+class FrameTool(MarketDataTool):
+    # Serves a fixed frame for every ticker at a fixed clock
+    def __init__(self, frame, now, **kwargs):
+        super().__init__(**kwargs)
+        self.frame = frame
+        self.now = now
+
+    def _now(self):
+        return self.now
+
+    def _download(self, tickers, start_date, end_date):
+        return {ticker: self.frame.loc[start_date:end_date] for ticker in tickers}
+
+
+def test_default_quote_spans_52_weeks():
+    # Falling prices: the high is a year old, the low is today
+    dates = pd.bdate_range('2023-01-02', '2024-06-28', name='Date')
+    close = np.linspace(300, 100, len(dates))
+    frame = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                          'Volume': 1e6}, index=dates)
+    tool = FrameTool(frame, datetime(2024, 6, 28))
+
+    data = tool.get_stock_info('AAA', include_info=False)['data']
+
+    year_ago = frame.loc['2023-06-29':, 'High'].max()
+    assert data['52_week_high'] == round(year_ago, 2)
+    assert data['52_week_low'] == 100
+    assert all(data[column] is not None for column in INDICATOR_COLUMNS)
+
+
+def test_single_bar_history_gives_a_quote():
+    # e.g. a listing's first day: no previous close, indicators not yet defined
+    dates = pd.DatetimeIndex(['2024-06-28'], name='Date')
+    frame = pd.DataFrame({'Open': [10.0], 'High': [11.0], 'Low': [9.0], 'Close': [10.5], 'Volume': [1e6]},
+                         index=dates)
+    tool = FrameTool(frame, datetime(2024, 6, 28))
+
+    result = tool.get_stock_info('AAA', include_info=False)
+
+    assert result['success']
+    assert result['data']['current_price'] == result['data']['previous_close'] == 10.5
+    assert result['data']['52_week_high'] == 11
+    assert all(result['data'][column] is None for column in INDICATOR_COLUMNS)
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from benchmarks.fake_openai import PROSE_ANALYSIS
+from benchmarks.fixtures import ReplayYahooFinanceTool
+from conftest import SYMBOLS
+from tools.cache import ResponseCache
+from tools.openai_analyzer import ANALYSIS_FUNCTION, OpenAIStockAnalyzer
+
+
+def tool_call(arguments):
+    return {"role": "assistant", "content": None, "tool_calls": [{
+        "id": "call_0", "type": "function", "function": {"name": ANALYSIS_FUNCTION['name'], "arguments": arguments}
+    }]}
+
+
+def prose(content):
+    return {"role": "assistant", "content": content}
+
+
+@pytest.fixture
+def stocks(market_fixtures):
+    quotes = ReplayYahooFinanceTool(market_fixtures).get_stock_info_batch(SYMBOLS[:4])
+    return [quotes[symbol] for symbol in SYMBOLS[:4]]
+
+
+@pytest.fixture
+def analyzer(openai_server, monkeypatch):
+    monkeypatch.setenv('OPENAI_BASE_URL', openai_server.url)
+    return OpenAIStockAnalyzer('sk-test', response_cache=ResponseCache())
+
+
+@pytest.fixture
+def requests(openai_server):
+    start = openai_server.requests
+    return lambda: openai_server.requests - start
+
+
+def test_batch_is_one_request(analyzer, stocks, requests):
+    results = analyzer.analyze_stocks_batch(stocks, batch_size=4)
+
+    assert requests() == 1
+    assert all(result['batched'] and result['recommendation'] == 'HOLD' for result in results)
+
+
+def test_malformed_batch_falls_back_to_single_calls(analyzer, stocks, requests, openai_server):
+    openai_server.script(prose('Here are my picks: AAA looks fine'))
+
+    results = analyzer.analyze_stocks_batch(stocks, batch_size=4)
+
+    assert requests() == 1 + len(stocks)
+    assert all(result['success'] and 'batched' not in result for result in results)
+    # The unusable reply isn't cached, so the next run batches again
+    assert all(result['batched'] for result in analyzer.analyze_stocks_batch(stocks, batch_size=4))
+    assert requests() == 2 + len(stocks)
+
+
+def test_partial_batch_only_repeats_missing_symbols(analyzer, stocks, requests, openai_server):
+    entries = [{"symbol": symbol, "recommendation": "BUY", "confidence": "HIGH", "analysis": "Strong."}
+               for symbol in SYMBOLS[:2]]
+    # A third entry with an unknown recommendation counts as missing too
+    entries.append({"symbol": SYMBOLS[2], "recommendation": "MAYBE", "analysis": "Unsure."})
+    openai_server.script(prose(json.dumps({"results": entries})))
+
+    results = analyzer.analyze_stocks_batch(stocks, batch_size=4)
+
+    assert requests() == 1 + 2
+    assert [result['recommendation'] for result in results[:2]] == ['BUY', 'BUY']
+    assert [result.get('batched', False) for result in results] == [True, True, False, False]
+
+
+def test_structured_output_is_parsed(analyzer, stocks, requests):
+    result = analyzer.analyze_stock(stocks[0], structured=True)
+
+    assert requests() == 1
+    assert (result['recommendation'], result['confidence']) == ('HOLD', 'MEDIUM')
+    assert result['reasons'] and result['risks']
+    assert set(result['price_targets']) == {'entry', 'target', 'stop_loss'}
+
+
+@pytest.mark.parametrize('reply', [
+    prose("I'd SELL this one."),
+    tool_call('{"recommendation": "SELL", "confidence": '),
+    tool_call(json.dumps({"recommendation": "MAYBE", "confidence": "HIGH"}))
+], ids=['no tool call', 'truncated arguments', 'invalid recommendation'])
+def test_unusable_structured_reply_falls_back_to_prose(analyzer, stocks, requests, openai_server, reply):
+    openai_server.script(reply)
+
+    result = analyzer.analyze_stock(stocks[0], structured=True)
+
+    assert requests() == 2
+    assert result['success'] and 'reasons' not in result
+    assert result['analysis'] == PROSE_ANALYSIS
+    # Only the prose reply was cached; structured output is requested again next time
+    assert 'reasons' in analyzer.analyze_stock(stocks[0], structured=True)
+    assert requests() == 3
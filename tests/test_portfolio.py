@@ -0,0 +1,74 @@
+import pytest
+
+from benchmarks.fixtures import ReplayYahooFinanceTool
+from portfolio import Portfolio
+
+
+@pytest.fixture
+def portfolio(market_fixtures):
+    portfolio = Portfolio(ReplayYahooFinanceTool(market_fixtures),
+                          {'AAA': {'shares': 10, 'buy_price': 50.0}, 'BBB': {'shares': 5, 'buy_price': 80.0}},
+                          cash=1000)
+    portfolio.update_prices({'AAA': 60.0, 'BBB': 100.0})
+    return portfolio
+
+
+def test_initial_positions_do_not_touch_cash(portfolio):
+    assert portfolio.summary()['cash'] == 1000
+    assert portfolio.summary()['total_value'] == 1000 + 600 + 500
+
+
+def test_sale_proceeds_go_to_cash(portfolio):
+    before = portfolio.summary()['total_value']
+
+    assert portfolio.remove('AAA', 4) == 40
+    assert portfolio.remove('BBB') == 100
+
+    summary = portfolio.summary()
+    assert summary['cash'] == 1000 + 240 + 500
+    assert summary['realized_pl'] == 140
+    assert summary['total_value'] == before
+    assert 'BBB' not in portfolio
+
+
+def test_buy_is_paid_from_cash(portfolio):
+    before = portfolio.summary()['total_value']
+
+    portfolio.add('AAA', 10, 60.0)
+    portfolio.add('CCC', 2, 25.0)
+    portfolio.update_prices({'CCC': 25.0})
+
+    summary = portfolio.summary()
+    assert summary['cash'] == 1000 - 600 - 50
+    assert summary['total_value'] == before
+    assert portfolio.valuation().loc['AAA', 'cost_basis'] == 55.0
+
+
+def test_buy_beyond_cash_is_rejected(portfolio):
+    with pytest.raises(ValueError, match='cash'):
+        portfolio.add('CCC', 100, 25.0)
+
+    assert 'CCC' not in portfolio
+    assert portfolio.cash == 1000
+    portfolio.add('CCC', 40, 25.0)
+    assert portfolio.cash == 0
+
+
+def test_cash_is_untracked_by_default(market_fixtures):
+    portfolio = Portfolio(ReplayYahooFinanceTool(market_fixtures), {'AAA': {'shares': 10, 'buy_price': 50.0}})
+    portfolio.add('BBB', 100, 80.0)
+    portfolio.update_prices({'AAA': 60.0, 'BBB': 90.0})
+
+    assert portfolio.remove('AAA') == 100
+
+    summary = portfolio.summary()
+    assert summary['cash'] is None
+    assert summary['total_value'] == summary['market_value'] == 9000
+    assert summary['realized_pl'] == 100
+
+
+def test_unpriced_sale_is_booked_at_cost(market_fixtures):
+    portfolio = Portfolio(ReplayYahooFinanceTool(market_fixtures), {'AAA': {'shares': 10, 'buy_price': 50.0}}, cash=0)
+
+    assert portfolio.remove('AAA') == 0
+    assert portfolio.cash == 500
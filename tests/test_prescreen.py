@@ -0,0 +1,55 @@
+import pytest
+
+from conftest import SYMBOLS
+from tools.prescreen import PreScreen
+
+
+@pytest.fixture
+def requests(openai_server):
+    start = openai_server.requests
+    return lambda: openai_server.requests - start
+
+
+def sent_to_llm(results):
+    return [result['symbol'] for result in results if not result.get('prescreened')]
+
+
+def test_only_symbols_above_min_score_reach_the_llm(agent, requests):
+    results = agent.analyze_many(SYMBOLS + ['NOPE'], prescreen=PreScreen(min_score=1))
+
+    assert [result['symbol'] for result in results] == SYMBOLS + ['NOPE']
+    # The failed fetch is neither screened nor analyzed
+    assert sent_to_llm(results) == ['CCC', 'EEE', 'FFF', 'NOPE']
+    assert requests() == 3
+
+    skipped = [result for result in results if result.get('prescreened')]
+    assert all(abs(result['prescreen_score']) < 1 for result in skipped)
+    assert all(result['success'] and result['confidence'] == 'LOW' for result in skipped)
+    assert all('current_price' in result for result in skipped)
+
+
+def test_top_k_sends_the_strongest_signals(agent, requests):
+    results = agent.analyze_many(SYMBOLS, prescreen=PreScreen(top_k=2, min_score=0))
+
+    assert sent_to_llm(results) == ['CCC', 'FFF']
+    assert requests() == 2
+
+
+def test_prescreen_combines_with_batching(agent, requests):
+    agent.prescreen = PreScreen(top_k=3, min_score=0)
+
+    results = agent.analyze_many(SYMBOLS, batch_size=10)
+
+    assert sorted(sent_to_llm(results)) == ['CCC', 'EEE', 'FFF']
+    # The three survivors share one prompt
+    assert requests() == 1
+
+
+def test_rule_recommendation_follows_thresholds(agent):
+    stock_data_list = [agent.yahoo_tool.get_stock_info(symbol) for symbol in SYMBOLS]
+
+    screened = PreScreen(top_k=0, buy_threshold=1.5, sell_threshold=0).screen(stock_data_list)
+
+    recommendations = {symbol: analysis['recommendation'] for symbol, analysis in zip(SYMBOLS, screened)}
+    assert recommendations == {'AAA': 'HOLD', 'BBB': 'SELL', 'CCC': 'BUY',
+                               'DDD': 'HOLD', 'EEE': 'HOLD', 'FFF': 'BUY'}
@@ -0,0 +1,229 @@
+import asyncio
+import threading
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import requests
+
+from tools.request_scheduler import CircuitBreaker, CircuitOpenError, ProviderPolicy, RequestScheduler
+
+
+class ScriptedServer(ThreadingHTTPServer):
+    # Answers each request with the next (status, headers) from the script, then 200s
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), ScriptedHandler)
+        self.script = []
+        self.requests = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/"
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests += 1
+        self.server.release.wait(5)
+        status, headers = self.server.script.pop(0) if self.server.script else (200, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+@pytest.fixture
+def server():
+    server = ScriptedServer()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.release.set()
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    response = requests.get(url, timeout=5)
+    response.raise_for_status()
+    return response.text
+
+
+def scheduler(sleeps, **policy):
+    policy = ProviderPolicy(**{'rate': 1e9, 'burst': 1e9, 'base_delay': 0.5, **policy})
+    return RequestScheduler({'test': policy}, sleep=sleeps.append)
+
+
+def test_retries_with_jittered_exponential_backoff(server):
+    server.script = [(503, {}), (502, {}), (500, {})]
+    sleeps = []
+
+    assert scheduler(sleeps).call('test', get, server.url) == 'ok'
+
+    assert server.requests == 4
+    assert len(sleeps) == 3
+    assert all(0 <= delay <= 0.5 * 2 ** attempt for attempt, delay in enumerate(sleeps))
+
+
+def test_backoff_is_capped_at_max_delay(server):
+    server.script = [(503, {})] * 3
+    sleeps = []
+
+    scheduler(sleeps, base_delay=100, max_delay=1).call('test', get, server.url)
+
+    assert len(sleeps) == 3 and max(sleeps) <= 1
+
+
+def test_honors_retry_after_seconds(server):
+    server.script = [(429, {'Retry-After': '2'})]
+    sleeps = []
+
+    assert scheduler(sleeps).call('test', get, server.url) == 'ok'
+    assert sleeps == [2.0]
+
+
+def test_honors_retry_after_http_date(server):
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=20)
+    server.script = [(503, {'Retry-After': format_datetime(retry_at, usegmt=True)})]
+    sleeps = []
+
+    scheduler(sleeps).call('test', get, server.url)
+
+    assert len(sleeps) == 1 and 17 <= sleeps[0] <= 20
+
+
+def test_gives_up_after_max_retries(server):
+    server.script = [(503, {})] * 5
+    sleeps = []
+    tool = scheduler(sleeps, max_retries=2)
+
+    with pytest.raises(requests.HTTPError):
+        tool.call('test', get, server.url)
+
+    assert server.requests == 3
+    assert tool.stats()['test']['failures'] == 1
+
+
+def test_client_errors_are_not_retried(server):
+    server.script = [(404, {})]
+    sleeps = []
+    tool = scheduler(sleeps)
+
+    with pytest.raises(requests.HTTPError):
+        tool.call('test', get, server.url)
+
+    assert server.requests == 1 and sleeps == []
+    assert tool.stats()['test']['circuit'] == 'closed'
+
+
+def test_circuit_opens_and_rejects_without_calling(server):
+    server.script = [(503, {})] * 2
+    tool = scheduler([], max_retries=0, failure_threshold=2, reset_timeout=60)
+
+    for _ in range(2):
+        with pytest.raises(requests.HTTPError):
+            tool.call('test', get, server.url)
+    assert tool.stats()['test']['circuit'] == 'open'
+
+    with pytest.raises(CircuitOpenError):
+        tool.call('test', get, server.url)
+    assert server.requests == 2
+    assert tool.stats()['test']['rejected'] == 1
+
+
+@pytest.mark.parametrize('probe, state', [(200, 'closed'), (404, 'closed'), (503, 'open')])
+def test_probe_outcome_settles_the_circuit(server, probe, state):
+    server.script = [(503, {}), (probe, {})]
+    tool = scheduler([], max_retries=0, failure_threshold=1, reset_timeout=0)
+
+    with pytest.raises(requests.HTTPError):
+        tool.call('test', get, server.url)
+    assert tool.stats()['test']['circuit'] == 'open'
+
+    try:
+        tool.call('test', get, server.url)
+    except requests.HTTPError:
+        pass
+    assert tool.stats()['test']['circuit'] == state
+
+
+def test_half_open_lets_one_probe_through(server):
+    server.script = [(503, {})]
+    tool = scheduler([], max_retries=0, failure_threshold=1, reset_timeout=0)
+    with pytest.raises(requests.HTTPError):
+        tool.call('test', get, server.url)
+
+    # Hold the probe on the server while a second caller arrives
+    server.release.clear()
+    probe = threading.Thread(target=tool.call, args=('test', get, server.url))
+    probe.start()
+    while server.requests < 2:
+        pass
+    with pytest.raises(CircuitOpenError):
+        tool.call('test', get, server.url)
+    server.release.set()
+    probe.join()
+
+    assert server.requests == 2
+    assert tool.stats()['test']['circuit'] == 'closed'
+
+
+def test_abandoned_probe_hands_over_to_the_next_caller():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    assert breaker.allow() and breaker.state == 'half_open'
+    assert not breaker.allow()
+    breaker.release()
+    assert breaker.allow() and breaker.state == 'half_open'
+
+
+def test_async_retry_after(server):
+    server.script = [(429, {'Retry-After': '0'}), (503, {})]
+    tool = scheduler([], base_delay=0.01)
+
+    async def fetch():
+        async with httpx.AsyncClient() as client:
+            async def get_async():
+                response = await client.get(server.url)
+                response.raise_for_status()
+                return response.text
+            return await tool.call_async('test', get_async)
+
+    assert asyncio.run(fetch()) == 'ok'
+    assert server.requests == 3
+    assert tool.stats()['test']['retries'] == 2
+
+
+def test_cancelled_async_probe_releases_the_circuit(server):
+    server.script = [(503, {})]
+    tool = scheduler([], max_retries=0, failure_threshold=1, reset_timeout=0)
+    with pytest.raises(requests.HTTPError):
+        tool.call('test', get, server.url)
+
+    async def probe():
+        await tool.call_async('test', asyncio.sleep, 10)
+
+    async def cancel():
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel())
+
+    assert tool.stats()['test']['circuit'] == 'open'
+    assert tool.call('test', get, server.url) == 'ok'
+    assert tool.stats()['test']['circuit'] == 'closed'
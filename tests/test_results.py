@@ -0,0 +1,24 @@
+import numpy as np
+
+from conftest import SYMBOLS
+from tools.results import NUMERIC_FIELDS, TEXT_FIELDS, ResultTable
+
+
+def test_to_frame_copies_and_table_keeps_growing(agent):
+    table = agent.analyze_many(SYMBOLS[:3], as_table=True)
+
+    frame = table.to_frame()
+    prices = frame['current_price'].to_numpy()
+    assert not np.shares_memory(prices, np.frombuffer(table.column('current_price'), dtype=np.float64))
+
+    table.append(agent.analyze_stock(SYMBOLS[3], verbose=False))
+    assert len(table.to_frame()) == 4
+    assert list(frame['symbol']) == SYMBOLS[:3]
+    assert frame['current_price'].tolist() == [result['current_price'] for result in table.to_dicts()[:3]]
+
+
+def test_empty_table_has_every_column():
+    frame = ResultTable().to_frame()
+
+    assert frame.empty
+    assert len(frame.columns) == 5 + len(NUMERIC_FIELDS) + len(TEXT_FIELDS)
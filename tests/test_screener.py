@@ -0,0 +1,76 @@
+import pytest
+
+from benchmarks.fixtures import ReplayYahooFinanceTool
+from conftest import SYMBOLS
+from tools.screener import Screener
+
+
+@pytest.fixture
+def screener(market_fixtures):
+    screener = Screener(ReplayYahooFinanceTool(market_fixtures))
+    screener.refresh(SYMBOLS + ['NOPE'])
+    return screener
+
+
+def test_index_matches_quotes(screener, market_fixtures):
+    quote = ReplayYahooFinanceTool(market_fixtures).get_stock_info('AAA')['data']
+    row = screener.index.loc['AAA']
+
+    assert sorted(screener.index.index) == SYMBOLS
+    for name in ('current_price', 'week_change', 'month_change', 'pe_ratio'):
+        assert row[name] == pytest.approx(quote[name], abs=0.01)
+    assert row['sector'] == quote['sector']
+    assert row['week_52_high'] == row['52_week_high']
+
+
+@pytest.mark.parametrize('where', [
+    "week_change > 2 and pe_ratio < 30",
+    [('week_change', '>', 2), ('pe_ratio', '<', 30)],
+    lambda table: (table.week_change > 2) & (table.pe_ratio < 30)
+])
+def test_filter_forms_agree(screener, where):
+    index = screener.index
+    expected = index[(index['week_change'] > 2) & (index['pe_ratio'] < 30)].index
+
+    assert list(screener.screen(where).index) == list(expected)
+    assert 0 < len(expected) < len(SYMBOLS)
+
+
+def test_membership_and_not_equal_filters(screener):
+    index = screener.index
+    sector = index.loc['AAA', 'sector']
+
+    inside = screener.screen([('sector', 'in', [sector])])
+    outside = screener.screen([('sector', '!=', sector)])
+
+    assert set(inside.index) == set(index.index[index['sector'] == sector])
+    assert set(inside.index) | set(outside.index) == set(SYMBOLS)
+    assert not set(inside.index) & set(outside.index)
+
+
+def test_sort_and_limit(screener):
+    top = screener.screen(sort_by='month_change', limit=3, columns=['month_change'])
+    bottom = screener.screen(sort_by='month_change', ascending=True, limit=1)
+
+    assert list(top.columns) == ['month_change']
+    assert list(top.index) == list(screener.index['month_change'].nlargest(3).index)
+    assert bottom.index[0] == screener.index['month_change'].idxmin()
+
+
+def test_errors(market_fixtures, screener):
+    with pytest.raises(ValueError, match='refresh'):
+        Screener(ReplayYahooFinanceTool(market_fixtures)).screen()
+    with pytest.raises(ValueError, match='operator'):
+        screener.screen([('pe_ratio', '~', 10)])
+
+
+def test_only_survivors_reach_the_llm(agent, openai_server):
+    screener = Screener(agent.yahoo_tool)
+    screener.refresh(SYMBOLS)
+    survivors = screener.screen(sort_by='score', limit=2)
+    requests = openai_server.requests
+
+    results = screener.analyze(agent, sort_by='score', limit=2)
+
+    assert [result['symbol'] for result in results] == list(survivors.index)
+    assert openai_server.requests - requests == 2
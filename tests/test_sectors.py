@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from conftest import SYMBOLS
+from tools.cache import MarketDataCache
+from tools.market_data import MarketDataTool
+from tools.sectors import SectorAggregator
+
+# symbol: (sector, last-day move in %, trailing P/E)
+STOCKS = {
+    'AAA': ('Technology', 10, 20.0),
+    'BBB': ('Technology', -2, -5.0),
+    'CCC': ('Energy', 4, 8.0),
+    'DDD': ('Energy', 6, 12.0),
+    'EEE': ('Healthcare', -5, 30.0)
+}
+
+
+class SectorTool(MarketDataTool):
+    # Flat prices with a move on the last bar, so week and month change both equal the move
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.info_requests = []
+
+    def _now(self):
+        return datetime(2024, 6, 28)
+
+    def _download(self, tickers, start_date, end_date):
+        dates = pd.bdate_range(end=end_date, periods=60, name='Date')
+        frames = {}
+        for ticker in tickers:
+            close = pd.Series(100.0, index=dates)
+            close.iloc[-1] = 100 + STOCKS[ticker][1]
+            frames[ticker] = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                                           'Volume': 1e6})
+        return frames
+
+    def _fetch_info(self, ticker):
+        self.info_requests.append(ticker)
+        sector, _, pe_ratio = STOCKS[ticker]
+        return {'sector': sector, 'industry': f"{sector} industry", 'trailingPE': pe_ratio, 'marketCap': 1e9}
+
+
+def test_group_counts_and_means():
+    aggregator = SectorAggregator(SectorTool(), include_info=True)
+    aggregator.refresh(list(STOCKS))
+
+    stats = aggregator.aggregate()
+
+    assert list(stats.index) == ['Energy', 'Technology', 'Healthcare']
+    assert stats['stocks'].tolist() == [2, 2, 1]
+    assert stats['avg_month_change'].tolist() == pytest.approx([5, 4, -5])
+    assert stats['avg_week_change'].tolist() == pytest.approx([5, 4, -5])
+    assert stats['breadth'].tolist() == [1.0, 0.5, 0.0]
+    assert stats.loc['Technology', ['leader', 'laggard']].tolist() == ['AAA', 'BBB']
+    # The negative P/E is left out of the median
+    assert stats.loc['Technology', 'median_pe'] == 20
+    assert stats.loc['Energy', 'market_cap'] == 2e9
+
+
+def test_explicit_groups_and_members():
+    aggregator = SectorAggregator(SectorTool())
+    aggregator.refresh(groups={'Picks': ['AAA', 'ccc'], 'Rest': ['BBB', 'DDD', 'EEE']})
+
+    stats = aggregator.aggregate()
+
+    assert stats.loc['Picks', 'stocks'] == 2
+    assert stats.loc['Picks', 'avg_month_change'] == pytest.approx(7)
+    assert list(aggregator.members('Picks').index) == ['AAA', 'CCC']
+    assert aggregator.aggregate(by='industry').loc['Energy industry', 'stocks'] == 2
+
+
+def test_sectors_are_looked_up_once():
+    tool = SectorTool(cache=MarketDataCache())
+    aggregator = SectorAggregator(tool)
+
+    aggregator.refresh(list(STOCKS))
+    aggregator.refresh()
+
+    assert sorted(tool.info_requests) == sorted(STOCKS)
+
+
+def test_one_llm_call_per_sector(agent, openai_server):
+    aggregator = SectorAggregator(agent.yahoo_tool)
+    aggregator.refresh(SYMBOLS)
+    sectors = list(aggregator.aggregate().index)
+    requests = openai_server.requests
+
+    summaries = aggregator.summarize(agent)
+
+    assert list(summaries) == sectors
+    assert all(summary['success'] for summary in summaries.values())
+    assert openai_server.requests - requests == len(sectors)
@@ -0,0 +1,29 @@
+import asyncio
+
+from tools.async_openai_analyzer import AsyncOpenAIStockAnalyzer
+from tools.instrumentation import MetricsRegistry
+
+
+def test_stream_records_token_usage(agent):
+    events = list(agent.analyze_stock_stream('AAA', refresh=True))
+
+    tokens = ''.join(event['content'] for event in events if event['type'] == 'token')
+    assert events[-1]['result']['analysis'] == tokens
+    counters = agent.get_metrics()['counters']
+    assert counters['openai.completion_tokens{kind=stream,model=gpt-3.5-turbo}'] == len(tokens.split(' '))
+    assert counters['openai.prompt_tokens{kind=stream,model=gpt-3.5-turbo}'] > 0
+
+
+def test_async_stream_records_token_usage(agent):
+    stock_data = agent.yahoo_tool.get_stock_info('AAA')
+    metrics = MetricsRegistry()
+
+    async def stream():
+        async with AsyncOpenAIStockAnalyzer('sk-test', metrics=metrics) as analyzer:
+            return [event async for event in analyzer.analyze_stock_stream(stock_data)]
+
+    events = asyncio.run(stream())
+
+    assert events[-1]['result']['success']
+    counters = metrics.summary()['counters']
+    assert counters['openai.completion_tokens{kind=stream,model=gpt-3.5-turbo}'] > 0
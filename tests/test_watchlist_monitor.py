@@ -0,0 +1,76 @@
+import pytest
+
+from benchmarks.fixtures import ReplayYahooFinanceTool
+from tools.metrics_engine import YEAR_WINDOW_DAYS
+from watchlist_monitor import REFRESH_WINDOW_DAYS, WatchlistMonitor
+
+
+class MovingReplay(ReplayYahooFinanceTool):
+    # Replayed bars with the latest session's prices scaled per symbol, as if they moved
+    # since the last poll; records the calendar days each download asked for
+    def __init__(self, fixtures, **kwargs):
+        super().__init__(fixtures, **kwargs)
+        self.moves = {}
+        self.windows = []
+
+    def _download(self, tickers, start_date, end_date):
+        self.windows.append((end_date - start_date).days)
+        frames = super()._download(tickers, start_date, end_date)
+        for ticker, factor in self.moves.items():
+            if ticker in frames:
+                frame = frames[ticker] = frames[ticker].copy()
+                frame.loc[frame.index[-1], ['Open', 'High', 'Low', 'Close']] *= factor
+        return frames
+
+
+@pytest.fixture
+def tool(agent, market_fixtures):
+    agent.yahoo_tool = MovingReplay(market_fixtures, cache=agent.market_data_cache, metrics=agent.metrics)
+    return agent.yahoo_tool
+
+
+def by_symbol(updates):
+    return {update['symbol']: update for update in updates}
+
+
+def test_second_poll_refreshes_recent_bars_and_reports_deltas(agent, tool, market_fixtures):
+    monitor = WatchlistMonitor(agent, ['AAA', 'BBB'], trigger_flags=['dividend'])
+
+    first = by_symbol(monitor.poll())
+    assert all(update['reasons'] == ['first analysis'] for update in first.values())
+
+    tool.moves = {'AAA': 1.10, 'BBB': 1.01}
+    second = by_symbol(monitor.poll())
+
+    assert tool.windows == [YEAR_WINDOW_DAYS, REFRESH_WINDOW_DAYS]
+    assert second['AAA']['reanalyzed']
+    assert second['AAA']['reasons'] == ['price moved +10.00% since last analysis']
+    assert second['AAA']['change_since_last_poll'] == pytest.approx(10, abs=0.01)
+    assert not second['BBB']['reanalyzed']
+    assert second['BBB']['change_since_last_poll'] == pytest.approx(1, abs=0.01)
+    assert second['BBB']['change_since_analysis'] == second['BBB']['change_since_last_poll']
+    assert second['BBB']['result'] is first['BBB']['result']
+    assert monitor.stats == {'polls': 2, 'analyses': 3, 'served_from_last': 1}
+
+    # Indicators advanced bar by bar match a full recompute over the moved history
+    fresh = MovingReplay(market_fixtures)
+    fresh.moves = tool.moves
+    expected = fresh.get_stock_info_batch(['AAA', 'BBB'], include_info=False)
+    for symbol in ('AAA', 'BBB'):
+        for name in ('rsi_14', 'macd_hist', 'current_price', 'week_change'):
+            assert second[symbol][name] == pytest.approx(expected[symbol]['data'][name], abs=0.011)
+
+
+def test_new_and_unknown_symbols(agent, tool):
+    monitor = WatchlistMonitor(agent, ['AAA', 'NOPE'])
+    first = by_symbol(monitor.poll())
+    assert not first['NOPE']['success']
+
+    monitor.add('BBB')
+    second = by_symbol(monitor.poll())
+
+    # AAA is held, so only the recent window; BBB and the still-unknown NOPE get the full lookback
+    assert tool.windows == [YEAR_WINDOW_DAYS, REFRESH_WINDOW_DAYS, YEAR_WINDOW_DAYS]
+    assert second['BBB']['reasons'] == ['first analysis']
+    assert not second['AAA']['reanalyzed']
+    assert second['NOPE']['error'] == 'No data available for this symbol'
@@ -1,4 +1,78 @@
-from .yahoo_finance_tool import YahooFinanceTool
-from .openai_analyzer import OpenAIStockAnalyzer
+import importlib
 
-__all__ = ['YahooFinanceTool', 'OpenAIStockAnalyzer']
\ No newline at end of file
+# Public names and the submodule that defines each. Submodules are imported on first
+# attribute access (PEP 562) so `import tools` doesn't pull in pandas, yfinance or openai.
+_EXPORTS = {
+    'YahooFinanceTool': '.yahoo_finance_tool',
+    'MarketDataProvider': '.market_data',
+    'MarketDataTool': '.market_data',
+    'LocalFileProvider': '.local_provider',
+    'OpenAIStockAnalyzer': '.openai_analyzer',
+    'AsyncYahooFinanceTool': '.async_yahoo_finance_tool',
+    'AsyncOpenAIStockAnalyzer': '.async_openai_analyzer',
+    'TTLCache': '.cache',
+    'MarketDataCache': '.cache',
+    'ResponseCache': '.cache',
+    'SQLiteCacheBackend': '.cache',
+    'HistoryStore': '.history_store',
+    'SessionManager': '.http_session',
+    'default_session_manager': '.http_session',
+    'MetricsRegistry': '.instrumentation',
+    'JsonLinesSink': '.instrumentation',
+    'default_registry': '.instrumentation',
+    'RequestScheduler': '.request_scheduler',
+    'ProviderPolicy': '.request_scheduler',
+    'CircuitOpenError': '.request_scheduler',
+    'QuoteSnapshot': '.results',
+    'AnalysisResult': '.results',
+    'ResultTable': '.results',
+    'compute_metrics': '.metrics_engine',
+    'compute_metrics_table': '.metrics_engine',
+    'key_factor_flags': '.metrics_engine',
+    'key_factor_labels': '.metrics_engine',
+    'key_factor_scores': '.metrics_engine',
+    'compute_indicators': '.indicators',
+    'compute_indicators_history': '.indicators',
+    'seed_indicators': '.indicators',
+    'IndicatorState': '.indicators',
+    'PreScreen': '.prescreen',
+    'Screener': '.screener',
+    'SectorAggregator': '.sectors',
+    'JsonLinesExporter': '.export',
+    'ArrowExporter': '.export',
+    'open_exporter': '.export',
+    'export_record': '.export',
+    'iter_results': '.export',
+    'read_results': '.export'
+}
+
+__all__ = [
+    'YahooFinanceTool', 'OpenAIStockAnalyzer',
+    'MarketDataProvider', 'MarketDataTool', 'LocalFileProvider',
+    'AsyncYahooFinanceTool', 'AsyncOpenAIStockAnalyzer',
+    'TTLCache', 'MarketDataCache', 'ResponseCache', 'SQLiteCacheBackend',
+    'HistoryStore',
+    'SessionManager', 'default_session_manager',
+    'MetricsRegistry', 'JsonLinesSink', 'default_registry',
+    'RequestScheduler', 'ProviderPolicy', 'CircuitOpenError',
+    'QuoteSnapshot', 'AnalysisResult', 'ResultTable',
+    'compute_metrics', 'compute_metrics_table', 'key_factor_flags', 'key_factor_labels', 'key_factor_scores',
+    'compute_indicators', 'compute_indicators_history', 'seed_indicators', 'IndicatorState',
+    'PreScreen', 'Screener', 'SectorAggregator',
+    'JsonLinesExporter', 'ArrowExporter', 'open_exporter', 'export_record', 'iter_results', 'read_results'
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,185 @@
+from typing import Dict, Any, Optional, List, Tuple, Callable, AsyncIterator
+import asyncio
+import time
+from .cache import ResponseCache
+from .http_session import SessionManager
+from .instrumentation import MetricsRegistry
+from .request_scheduler import RequestScheduler
+from .openai_analyzer import OpenAIStockAnalyzer, STREAM_OPTIONS, SYSTEM_PROMPT
+
+
+class AsyncOpenAIStockAnalyzer(OpenAIStockAnalyzer):
+    # Coroutine versions of the analyzer's public methods on AsyncOpenAI; prompts,
+    # parsing, caching and result shapes are inherited unchanged
+
+    def __init__(self, api_key: str, response_cache: Optional[ResponseCache] = None, structured: bool = False,
+                 include_summary: bool = False, scheduler: Optional[RequestScheduler] = None,
+                 session_manager: Optional[SessionManager] = None, metrics: Optional[MetricsRegistry] = None,
+                 max_connections: int = 100):
+        super().__init__(api_key, response_cache=response_cache, structured=structured,
+                         include_summary=include_summary, scheduler=scheduler, session_manager=session_manager,
+                         metrics=metrics)
+        self.name = "Async OpenAI Stock Analyzer"
+        self.max_connections = max_connections
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            options = {'max_retries': 0} if self.scheduler is not None else {}
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=self.session_manager.create_async_client(max_connections=self.max_connections),
+                **options
+            )
+        return self._client
+
+    @client.setter
+    def client(self, client):
+        self._client = client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> 'AsyncOpenAIStockAnalyzer':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def analyze_stock(self, stock_data: Dict[str, Any], use_cache: bool = True,
+                            refresh: bool = False, structured: Optional[bool] = None) -> Dict[str, Any]:
+        if structured if structured is not None else self.structured:
+            result = await self._analyze_structured(stock_data, use_cache, refresh)
+            if result is not None:
+                return result
+
+        try:
+            prompt = self._analysis_prompt(stock_data)
+            analysis, cached = await self._complete(SYSTEM_PROMPT, prompt, use_cache=use_cache, refresh=refresh)
+            return self._prose_result(stock_data, analysis, cached)
+        except Exception as e:
+            return self._error_result(e)
+
+    async def analyze_stock_stream(self, stock_data: Dict[str, Any], use_cache: bool = True,
+                                   refresh: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        started = time.perf_counter()
+        first_token_at = None
+
+        try:
+            prompt = self._analysis_prompt(stock_data)
+            cache_key, analysis = self._cached_response(SYSTEM_PROMPT, prompt, use_cache, refresh)
+
+            cached = analysis is not None
+            if cached:
+                first_token_at = time.perf_counter()
+                yield {'type': 'token', 'content': analysis}
+            else:
+                stream = await self._call_async(
+                    self.client.chat.completions.create,
+                    **self._request_options(SYSTEM_PROMPT, prompt, **STREAM_OPTIONS)
+                )
+
+                chunks = []
+                async for chunk in stream:
+                    # Usage arrives on a final chunk with no choices
+                    self._record_usage(chunk, 'stream')
+                    token = self._stream_token(chunk)
+                    if not token:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(token)
+                    yield {'type': 'token', 'content': token}
+
+                analysis = ''.join(chunks)
+                self._store_response(cache_key, analysis, validate=bool)
+
+            finished = time.perf_counter()
+            result = self._prose_result(stock_data, analysis, cached)
+
+        except Exception as e:
+            finished = time.perf_counter()
+            result = self._error_result(e)
+
+        result['timing'] = self._timing(started, first_token_at, finished)
+        self._record_stream_timing(result)
+        yield {'type': 'result', 'result': result}
+
+    async def _analyze_structured(self, stock_data: Dict[str, Any], use_cache: bool,
+                                  refresh: bool) -> Optional[Dict[str, Any]]:
+        try:
+            content, cached = await self._complete(**self._structured_request(stock_data),
+                                                   use_cache=use_cache, refresh=refresh)
+        except Exception as e:
+            return self._error_result(e)
+
+        parsed = self._parse_structured_response(content)
+        if parsed is None:
+            return None
+
+        return self._structured_result(stock_data, parsed, cached)
+
+    async def analyze_stocks_batch(self, stock_data_list: List[Dict[str, Any]], batch_size: int = 10,
+                                   use_cache: bool = True, refresh: bool = False) -> List[Dict[str, Any]]:
+        # Unlike the sync analyzer, all chunks are sent concurrently
+        chunks = await asyncio.gather(*(
+            self._analyze_chunk(chunk, use_cache, refresh)
+            for chunk in self._chunks(stock_data_list, batch_size)
+        ))
+        return [result for chunk in chunks for result in chunk]
+
+    async def analyze_sector(self, sector: str, stats: Dict[str, Any], members: List[Dict[str, Any]],
+                             use_cache: bool = True, refresh: bool = False) -> Dict[str, Any]:
+        try:
+            analysis, cached = await self._complete(**self._sector_request(sector, stats, members),
+                                                    use_cache=use_cache, refresh=refresh)
+            return self._sector_result(sector, analysis, cached)
+        except Exception as e:
+            return {**self._error_result(e), 'sector': sector}
+
+    async def _analyze_chunk(self, chunk: List[Dict[str, Any]], use_cache: bool,
+                             refresh: bool) -> List[Dict[str, Any]]:
+        symbols = [stock_data['data']['symbol'] for stock_data in chunk]
+
+        try:
+            content, cached = await self._complete(**self._batch_request(chunk, symbols),
+                                                   use_cache=use_cache, refresh=refresh)
+        except Exception as e:
+            return [self._error_result(e) for _ in chunk]
+
+        parsed = self._parse_batch_response(content, symbols)
+
+        async def result_for(stock_data: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+            entry = parsed.get(symbol)
+            if entry is None:
+                return await self.analyze_stock(stock_data, use_cache=use_cache, refresh=refresh)
+            return self._batch_result(stock_data, entry, cached)
+
+        return list(await asyncio.gather(*(result_for(stock_data, symbol) for stock_data, symbol in zip(chunk, symbols))))
+
+    async def _complete(self, system_prompt: str, prompt: str, use_cache: bool = True, refresh: bool = False,
+                        max_tokens: Optional[int] = None, validate: Optional[Callable[[str], bool]] = None,
+                        kind: str = 'prose', **options) -> Tuple[str, bool]:
+        cache_key, content = self._cached_response(system_prompt, prompt, use_cache, refresh, max_tokens, **options)
+        if content is not None:
+            return content, True
+
+        with self.metrics.span('openai.completion', kind=kind):
+            response = await self._call_async(
+                self.client.chat.completions.create,
+                **self._request_options(system_prompt, prompt, max_tokens, **options)
+            )
+        self._record_usage(response, kind)
+
+        content = self._response_content(response)
+        self._store_response(cache_key, content, validate)
+
+        return content, False
+
+    async def _call_async(self, fn, *args, **kwargs):
+        if self.scheduler is None:
+            return await fn(*args, **kwargs)
+        return await self.scheduler.call_async('openai', fn, *args, **kwargs)
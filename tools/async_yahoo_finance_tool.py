@@ -0,0 +1,244 @@
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta
+import asyncio
+import numpy as np
+import pandas as pd
+from .cache import MarketDataCache
+from .history_store import HistoryStore
+from .http_session import SessionManager
+from .instrumentation import MetricsRegistry
+from .request_scheduler import RequestScheduler
+from .yahoo_finance_tool import YahooFinanceTool
+from .metrics_engine import compute_metrics_table
+
+
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+
+
+class AsyncYahooFinanceTool(YahooFinanceTool):
+    # Same results as YahooFinanceTool, with every public method a coroutine. Price history
+    # comes from the chart endpoint over httpx; fundamentals still go through yfinance, which
+    # is blocking, so they run in a worker thread and are cached for a day.
+
+    def __init__(self, cache: Optional[MarketDataCache] = None, history_store: Optional[HistoryStore] = None,
+                 scheduler: Optional[RequestScheduler] = None, session_manager: Optional[SessionManager] = None,
+                 metrics: Optional[MetricsRegistry] = None, max_connections: int = 50):
+        super().__init__(cache=cache, history_store=history_store, scheduler=scheduler,
+                         session_manager=session_manager, metrics=metrics)
+        self.name = "Async Yahoo Finance Stock Data Fetcher"
+        self.max_connections = max_connections
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            headers = {'User-Agent': self.session_manager.user_agent} if self.session_manager.user_agent else {}
+            self._client = self.session_manager.create_async_client(max_connections=self.max_connections,
+                                                                    headers=headers)
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> 'AsyncYahooFinanceTool':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def get_stock_info(self, symbol: str, hist_data: Optional[pd.DataFrame] = None,
+                             include_info: bool = True) -> Dict[str, Any]:
+        try:
+            end_date = self._now()
+
+            if hist_data is None:
+                history = await self.download_history([symbol], end_date=end_date)
+                hist_data = history.get(symbol.upper(), pd.DataFrame())
+
+            if hist_data.empty:
+                return self._no_data_result(symbol)
+
+            with self.metrics.span('yahoo.metrics'):
+                metrics = self._quote_metrics({symbol.upper(): hist_data}, end_date).iloc[0]
+            info = await self._get_info(symbol.upper()) if include_info else {}
+
+            return self._build_stock_result(symbol, metrics, info)
+
+        except Exception as e:
+            return self._error_result(symbol, e)
+
+    async def get_stock_info_batch(self, symbols: List[str], include_info: bool = True, refresh: bool = False,
+                                   hist_data: Optional[Dict[str, pd.DataFrame]] = None,
+                                   indicators: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
+        end_date = self._now()
+
+        try:
+            if hist_data is not None:
+                history = hist_data
+            else:
+                history = await self.download_history(symbols, end_date=end_date, refresh=refresh)
+        except Exception as e:
+            return {symbol.upper(): self._error_result(symbol, e) for symbol in symbols}
+
+        with self.metrics.span('yahoo.metrics', batch=True):
+            metrics = self._quote_metrics(history, end_date, indicators)
+        available = [symbol for symbol in symbols if symbol.upper() in metrics.index]
+        infos = await asyncio.gather(*(self._get_info(symbol.upper()) for symbol in available)) if include_info else []
+        infos = dict(zip(available, infos))
+
+        results = {}
+        for symbol in symbols:
+            ticker = symbol.upper()
+            if ticker not in metrics.index:
+                results[ticker] = self._no_data_result(symbol)
+                continue
+            try:
+                results[ticker] = self._build_stock_result(symbol, metrics.loc[ticker], infos.get(symbol, {}))
+            except Exception as e:
+                results[ticker] = self._error_result(symbol, e)
+
+        return results
+
+    async def get_metrics_table(self, symbols: List[str], include_info: bool = False,
+                                with_labels: bool = False, refresh: bool = False) -> pd.DataFrame:
+        end_date = self._now()
+        history = await self.download_history(symbols, end_date=end_date, refresh=refresh)
+
+        fundamentals = None
+        if include_info:
+            infos = await asyncio.gather(*(self._get_info(ticker) for ticker in history))
+            fundamentals = {
+                ticker: self._fundamentals(ticker, info)
+                for ticker, info in zip(history, infos)
+            }
+
+        return compute_metrics_table(history, fundamentals=fundamentals, as_of=end_date, with_labels=with_labels)
+
+    async def get_fundamentals(self, symbol: str) -> Dict[str, Any]:
+        ticker = symbol.upper()
+        return self._fundamentals(ticker, await self._get_info(ticker))
+
+    async def get_sectors(self, symbols: List[str]) -> Dict[str, Dict[str, str]]:
+        tickers = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        sectors, missing = self._cached_sectors(tickers)
+        infos = await asyncio.gather(*(self._get_info(ticker) for ticker in missing))
+        for ticker, info in zip(missing, infos):
+            sectors[ticker] = self._remember_sector(ticker, info)
+        return {ticker: sectors[ticker] for ticker in tickers}
+
+    async def download_history(self, symbols: List[str], end_date: Optional[datetime] = None,
+                               days: Optional[int] = None, refresh: bool = False) -> Dict[str, pd.DataFrame]:
+        end_date = end_date or self._now()
+        days = days or self.lookback_days
+        start_date = end_date - timedelta(days=days)
+
+        frames, missing = self._cached_history(symbols, end_date, days, refresh)
+        if not missing:
+            return frames
+
+        if self.history_store is not None:
+            fetched = await self._read_history_store(missing, start_date, end_date)
+        else:
+            fetched = await self._download(missing, start_date, end_date)
+
+        self._remember_history(frames, fetched, end_date, days)
+        return frames
+
+    async def _download(self, tickers: List[str], start_date: datetime, end_date: datetime) -> Dict[str, pd.DataFrame]:
+        # One chart request per ticker, all in flight at once; the scheduler still caps the rate.
+        # Like yf.download, a ticker whose request fails is left out rather than failing the batch.
+        outcomes = await asyncio.gather(*(self._fetch_chart(ticker, start_date, end_date) for ticker in tickers),
+                                        return_exceptions=True)
+        errors = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        for error in errors:
+            if not isinstance(error, Exception):
+                raise error
+        if errors and len(errors) == len(tickers):
+            # Nothing came back (e.g. the circuit is open), so surface why
+            raise errors[0]
+        return {ticker: frame for ticker, frame in zip(tickers, outcomes)
+                if not isinstance(frame, BaseException) and not frame.empty}
+
+    async def _read_history_store(self, tickers: List[str], start_date: datetime,
+                                  end_date: datetime) -> Dict[str, pd.DataFrame]:
+        for (fetch_from, fetch_to), group in self.history_store.missing_ranges(tickers, start_date).items():
+            gap_start = pd.Timestamp(fetch_from).to_pydatetime()
+            gap_end = end_date if fetch_to is None else pd.Timestamp(fetch_to).to_pydatetime()
+            for ticker, frame in (await self._download(group, gap_start, gap_end)).items():
+                self.history_store.write(ticker, frame)
+
+        with self.metrics.span('yahoo.history_store_read'):
+            return {ticker: self.history_store.read(ticker, start_date, end_date) for ticker in tickers}
+
+    async def _fetch_chart(self, ticker: str, start_date: datetime, end_date: datetime) -> pd.DataFrame:
+        params = {
+            'period1': int(start_date.timestamp()),
+            'period2': int(end_date.timestamp()),
+            'interval': '1d',
+            'includePrePost': 'false',
+            'events': 'div,splits'
+        }
+
+        async def fetch():
+            response = await self.client.get(CHART_URL.format(symbol=ticker), params=params)
+            # Unknown symbols come back as 404 with an error body; raising on anything else
+            # lets the scheduler retry throttling and server errors
+            if response.status_code != 404:
+                response.raise_for_status()
+            return response
+
+        with self.metrics.span('yahoo.download'):
+            response = await self._call_async(fetch)
+        self.metrics.increment('yahoo.symbols_downloaded')
+        if response.status_code == 404:
+            return pd.DataFrame()
+
+        return self._parse_chart(response.json())
+
+    @staticmethod
+    def _parse_chart(payload: Dict[str, Any]) -> pd.DataFrame:
+        results = (payload.get('chart') or {}).get('result') or []
+        if not results or not results[0].get('timestamp'):
+            return pd.DataFrame()
+
+        chart = results[0]
+        quote = chart['indicators']['quote'][0]
+        timezone = chart.get('meta', {}).get('exchangeTimezoneName') or 'UTC'
+        # Daily bars are labelled with the exchange-local session date, like yf.download
+        index = pd.to_datetime(chart['timestamp'], unit='s', utc=True).tz_convert(timezone).tz_localize(None).normalize()
+
+        column = lambda values: np.array([np.nan if value is None else value for value in values or []], dtype=float)
+        frame = pd.DataFrame({
+            'Open': column(quote.get('open')),
+            'High': column(quote.get('high')),
+            'Low': column(quote.get('low')),
+            'Close': column(quote.get('close')),
+            'Volume': column(quote.get('volume'))
+        }, index=pd.DatetimeIndex(index, name='Date'))
+
+        # Match yf.download(auto_adjust=True): scale OHLC by the adjusted close ratio
+        adjclose = (chart['indicators'].get('adjclose') or [{}])[0].get('adjclose')
+        if adjclose:
+            ratio = column(adjclose) / frame['Close'].to_numpy()
+            for name in ('Open', 'High', 'Low', 'Close'):
+                frame[name] = frame[name].to_numpy() * ratio
+
+        # A live session can repeat the last date; keep its latest bar
+        frame = frame[~frame.index.duplicated(keep='last')]
+        return frame.dropna(subset=['Close'])
+
+    async def _get_info(self, ticker: str) -> Dict[str, Any]:
+        info = self._cached_info(ticker)
+        if info is not None:
+            return info
+
+        # The quoteSummary endpoint needs yfinance's cookie/crumb handshake, so reuse the
+        # blocking path (cache, scheduler and pooled session) without stalling the loop
+        return await asyncio.to_thread(self._fetch_info, ticker)
+
+    async def _call_async(self, fn, *args, **kwargs):
+        if self.scheduler is None:
+            return await fn(*args, **kwargs)
+        return await self.scheduler.call_async('yahoo', fn, *args, **kwargs)
@@ -0,0 +1,208 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+
+
+class SQLiteCacheBackend:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, expires_at REAL NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, key))"
+        )
+        self._conn.commit()
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return row[0], pickle.loads(row[1])
+
+    def set(self, namespace: str, key: str, value: Any, expires_at: float):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, expires_at, value) VALUES (?, ?, ?, ?)",
+                (namespace, key, expires_at, blob)
+            )
+            self._conn.commit()
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (namespace, key))
+            self._conn.commit()
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM cache")
+            else:
+                self._conn.execute("DELETE FROM cache WHERE namespace = ?", (namespace,))
+            self._conn.commit()
+
+    def purge_expired(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class TTLCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 300, backend: Optional[SQLiteCacheBackend] = None,
+                 namespace: str = 'default'):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    # Mark as most recently used
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        # Fall back to the persistent backend, e.g. after a restart
+        if self.backend is not None:
+            stored = self.backend.get(self.namespace, key)
+            if stored is not None and stored[0] > now:
+                with self._lock:
+                    self._store(key, stored[1], stored[0])
+                    self.hits += 1
+                return stored[1]
+
+        with self._lock:
+            self.misses += 1
+        return default
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._store(key, value, expires_at)
+
+        if self.backend is not None:
+            self.backend.set(self.namespace, key, value, expires_at)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+        if self.backend is not None:
+            self.backend.delete(self.namespace, key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+        if self.backend is not None:
+            self.backend.clear(self.namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _store(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        # Evict least recently used entries beyond the size bound
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class MarketDataCache:
+    def __init__(self, price_ttl: float = 300, fundamentals_ttl: float = 24 * 60 * 60, maxsize: int = 1024,
+                 path: Optional[str] = None, sector_ttl: float = 30 * 24 * 60 * 60):
+        self.backend = SQLiteCacheBackend(path) if path else None
+        self.prices = TTLCache(maxsize, price_ttl, backend=self.backend, namespace='prices')
+        self.fundamentals = TTLCache(maxsize, fundamentals_ttl, backend=self.backend, namespace='fundamentals')
+        # Sector and industry classifications rarely change, so they outlive the rest of the fundamentals
+        self.sectors = TTLCache(max(maxsize, 8192), sector_ttl, backend=self.backend, namespace='sectors')
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            'prices': self.prices.stats(),
+            'fundamentals': self.fundamentals.stats(),
+            'sectors': self.sectors.stats()
+        }
+
+    def clear(self):
+        self.prices.clear()
+        self.fundamentals.clear()
+        self.sectors.clear()
+
+
+class ResponseCache:
+    def __init__(self, ttl: float = 60 * 60, maxsize: int = 512, path: Optional[str] = None):
+        self.backend = SQLiteCacheBackend(path) if path else None
+        self.responses = TTLCache(maxsize, ttl, backend=self.backend, namespace='responses')
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        # Indentation and line wrapping in the prompt template shouldn't change the key
+        return ' '.join(prompt.split())
+
+    @classmethod
+    def make_key(cls, model: str, temperature: float, system_prompt: str, prompt: str,
+                 max_tokens: Optional[int] = None, options: Optional[Dict[str, Any]] = None) -> str:
+        # options are the request fields that shape the answer (tools, tool_choice,
+        # response_format), so a structured or JSON-mode response is never served as prose
+        payload = json.dumps(
+            [model, temperature, cls.normalize_prompt(system_prompt), cls.normalize_prompt(prompt),
+             max_tokens, options or {}],
+            ensure_ascii=False, sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.responses.get(key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.responses.set(key, value, ttl=ttl)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.responses.stats()
+
+    def clear(self):
+        self.responses.clear()
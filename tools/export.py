@@ -0,0 +1,250 @@
+from typing import Dict, Any, List, Optional, Iterator, Union, IO, TYPE_CHECKING
+from datetime import datetime
+import json
+import math
+import os
+import threading
+from .filters import FILTER_OPS, Filter
+from .results import AnalysisResult, NUMERIC_FIELDS, _DICT_KEYS
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# One flat row per analysis, the same columns in every format. Quote metrics are floats
+# (NaN when missing) so files from different runs concatenate without type drift.
+EXPORT_SCHEMA = (
+    [('timestamp', 'string'), ('symbol', 'string'), ('success', 'bool'), ('recommendation', 'string'),
+     ('confidence', 'string'), ('prescreened', 'bool'), ('prescreen_score', 'float'),
+     ('company_name', 'string'), ('sector', 'string'), ('industry', 'string'),
+     ('analyst_recommendation', 'string')]
+    + [(_DICT_KEYS.get(field, field), 'float') for field in NUMERIC_FIELDS]
+    + [('key_factors', 'list'), ('reasons', 'list'), ('risks', 'list'), ('analysis', 'string'), ('error', 'string')]
+)
+
+EXPORT_COLUMNS = [name for name, _ in EXPORT_SCHEMA]
+
+
+def export_record(result: Union[AnalysisResult, Dict[str, Any]], timestamp: Optional[str] = None) -> Dict[str, Any]:
+    if isinstance(result, dict):
+        result = AnalysisResult.from_dict(result)
+
+    quote = result.quote
+    record = {
+        'timestamp': timestamp or datetime.now().isoformat(),
+        'symbol': result.symbol.upper(),
+        'success': result.success,
+        'recommendation': result.recommendation,
+        'confidence': result.confidence,
+        'prescreened': result.prescreened,
+        'prescreen_score': _float(result.prescreen_score),
+        'company_name': quote.company_name if quote is not None else None,
+        'sector': quote.sector if quote is not None else None,
+        'industry': quote.industry if quote is not None else None,
+        'analyst_recommendation': quote.recommendation if quote is not None else None
+    }
+    for field in NUMERIC_FIELDS:
+        record[_DICT_KEYS.get(field, field)] = _float(getattr(quote, field) if quote is not None else None)
+    record['key_factors'] = list(result.key_factors)
+    record['reasons'] = list(result.reasons) if result.reasons is not None else None
+    record['risks'] = list(result.risks) if result.risks is not None else None
+    # The full text; nothing is truncated
+    record['analysis'] = result.analysis
+    record['error'] = result.error
+    return record
+
+
+class JsonLinesExporter:
+    # Appends one record per line and flushes it, so a crash loses at most the line being written
+    def __init__(self, target: Union[str, IO[str]]):
+        self._file = open(target, 'a', encoding='utf-8') if isinstance(target, str) else target
+        self._owns_file = isinstance(target, str)
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def write(self, result: Union[AnalysisResult, Dict[str, Any]]):
+        record = export_record(result)
+        # NaN isn't valid JSON; missing metrics are written as null
+        line = json.dumps({key: None if isinstance(value, float) and math.isnan(value) else value
+                           for key, value in record.items()}, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+            self.written += 1
+
+    __call__ = write
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+    def __enter__(self) -> 'JsonLinesExporter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArrowExporter:
+    # Buffers records and writes them in batches with the fixed EXPORT_SCHEMA. 'arrow' is
+    # the Arrow IPC stream format: every flushed batch is readable even if the process dies.
+    # 'parquet' writes one row group per batch, but the file is only readable after close().
+    def __init__(self, path: str, format: str = 'parquet', batch_size: int = 1000):
+        if format not in ('parquet', 'arrow'):
+            raise ValueError(f"Unknown export format: {format}")
+
+        pa = _pyarrow()
+        self.path = path
+        self.format = format
+        self.batch_size = batch_size
+        self.schema = arrow_schema()
+        self.written = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self._sink = pa.OSFile(path, 'wb')
+            self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def write(self, result: Union[AnalysisResult, Dict[str, Any]]):
+        record = export_record(result)
+        with self._lock:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    __call__ = write
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            if self._writer is None:
+                return
+            self._flush()
+            self._writer.close()
+            self._writer = None
+            if self.format == 'arrow':
+                self._sink.close()
+
+    def __enter__(self) -> 'ArrowExporter':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        pa = _pyarrow()
+        self._writer.write_batch(pa.RecordBatch.from_pylist(self._buffer, schema=self.schema))
+        if self.format == 'arrow':
+            self._sink.flush()
+        self.written += len(self._buffer)
+        self._buffer = []
+
+
+def open_exporter(path: str, batch_size: int = 1000) -> Union[JsonLinesExporter, ArrowExporter]:
+    # Format from the extension: .jsonl/.ndjson, .parquet, or .arrow/.arrows
+    file_format = _file_format(path)
+    if file_format == 'jsonl':
+        return JsonLinesExporter(path)
+    return ArrowExporter(path, format=file_format, batch_size=batch_size)
+
+
+def iter_results(path: str, filters: Optional[List[Filter]] = None,
+                 columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    # Yields matching records one at a time; memory stays flat however large the file is
+    if _file_format(path) == 'jsonl':
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if _matches(record, filters):
+                    yield {column: record.get(column) for column in columns} if columns else record
+        return
+
+    for batch in _arrow_batches(path):
+        table = _filter_table(_pyarrow().Table.from_batches([batch]), filters, columns)
+        yield from table.to_pylist()
+
+
+def read_results(path: str, filters: Optional[List[Filter]] = None,
+                 columns: Optional[List[str]] = None) -> 'pd.DataFrame':
+    import pandas as pd
+
+    file_format = _file_format(path)
+    if file_format == 'jsonl':
+        return pd.DataFrame(list(iter_results(path, filters, columns)), columns=columns or EXPORT_COLUMNS)
+    if file_format == 'parquet':
+        # Column pruning and row-group statistics skip what the filters rule out
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=columns, filters=filters, memory_map=True).to_pandas()
+
+    # The IPC stream is memory-mapped, so unselected columns are never read into memory
+    pa = _pyarrow()
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_stream(source).read_all()
+    return _filter_table(table, filters, columns).to_pandas()
+
+
+def arrow_schema():
+    pa = _pyarrow()
+    types = {'string': pa.string(), 'bool': pa.bool_(), 'float': pa.float64(), 'list': pa.list_(pa.string())}
+    return pa.schema([(name, types[kind]) for name, kind in EXPORT_SCHEMA])
+
+
+def _arrow_batches(path: str):
+    pa = _pyarrow()
+    if _file_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches()
+        return
+    with pa.memory_map(path) as source:
+        yield from pa.ipc.open_stream(source)
+
+
+def _filter_table(table, filters: Optional[List[Filter]], columns: Optional[List[str]]):
+    if filters:
+        import pyarrow.parquet as pq
+        table = table.filter(pq.filters_to_expression(filters))
+    return table.select(columns) if columns else table
+
+
+def _matches(record: Dict[str, Any], filters: Optional[List[Filter]]) -> bool:
+    for column, op, value in filters or []:
+        field = record.get(column)
+        # Like pyarrow, a missing value never satisfies a comparison
+        if field is None or not FILTER_OPS[op](field, value):
+            return False
+    return True
+
+
+def _file_format(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    if extension == '.parquet':
+        return 'parquet'
+    if extension in ('.arrow', '.arrows'):
+        return 'arrow'
+    raise ValueError(f"Unknown export format for {path}; use .jsonl, .parquet or .arrow")
+
+
+def _float(value: Any) -> float:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else math.nan
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Parquet and Arrow export need pyarrow (pip install pyarrow); "
+                          "JSONL export works without it") from e
+    return pyarrow
@@ -0,0 +1,26 @@
+# (column, op, value) filters, as in pyarrow and pandas.read_parquet, shared by the export
+# reader (one record at a time) and the screener (whole columns). Kept free of numpy/pandas
+# so the export module stays light to import.
+from typing import Any, Tuple
+import operator
+
+Filter = Tuple[str, str, Any]
+
+FILTER_OPS = {
+    '==': operator.eq, '=': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le,
+    '>': operator.gt, '>=': operator.ge,
+    'in': lambda value, options: value in options, 'not in': lambda value, options: value not in options
+}
+
+# Vectorized counterparts of FILTER_OPS over pandas Series; NaN never matches, as in pyarrow
+SERIES_OPS = {
+    '==': lambda column, value: column == value,
+    '=': lambda column, value: column == value,
+    '!=': lambda column, value: column.notna() & (column != value),
+    '<': lambda column, value: column < value,
+    '<=': lambda column, value: column <= value,
+    '>': lambda column, value: column > value,
+    '>=': lambda column, value: column >= value,
+    'in': lambda column, value: column.isin(list(value)),
+    'not in': lambda column, value: column.notna() & ~column.isin(list(value))
+}
@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import date, datetime
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+BAR_DTYPE = np.dtype([('date', 'datetime64[D]')] + [(column, 'f8') for column in BAR_COLUMNS])
+
+
+class HistoryStore:
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path_for(self, symbol: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}.npy")
+
+    def symbols(self) -> List[str]:
+        return sorted(name[:-4] for name in os.listdir(self.root) if name.endswith('.npy'))
+
+    def last_date(self, symbol: str) -> Optional[date]:
+        bars = self._load(symbol)
+        if bars is None or len(bars) == 0:
+            return None
+        return bars['date'][-1].astype(date)
+
+    def read(self, symbol: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> pd.DataFrame:
+        bars = self._load(symbol)
+        if bars is None or len(bars) == 0:
+            return pd.DataFrame(columns=BAR_COLUMNS, index=pd.DatetimeIndex([], name='Date'))
+
+        # Bars are kept sorted by date, so a window is two binary searches on the mapped file
+        dates = bars['date']
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(start).date()), 'left'))
+        hi = len(bars) if end is None else int(np.searchsorted(dates, np.datetime64(pd.Timestamp(end).date()), 'right'))
+        window = bars[lo:hi]
+
+        return pd.DataFrame(
+            {column: np.asarray(window[column]) for column in BAR_COLUMNS},
+            index=pd.DatetimeIndex(np.asarray(window['date']), name='Date')
+        )
+
+    def write(self, symbol: str, frame: pd.DataFrame) -> int:
+        if frame.empty:
+            return 0
+
+        new_bars = np.empty(len(frame), dtype=BAR_DTYPE)
+        new_bars['date'] = pd.DatetimeIndex(frame.index).tz_localize(None).normalize().values.astype('datetime64[D]')
+        for column in BAR_COLUMNS:
+            new_bars[column] = frame[column].to_numpy(dtype=float).ravel()
+
+        with self._lock:
+            existing = self._load(symbol)
+            if existing is not None and len(existing) > 0:
+                # New bars replace the stored ones in their date span, so a partial bar for the
+                # current session is overwritten on the next refresh, and a backfill of earlier
+                # bars keeps everything stored after it
+                dates = existing['date']
+                keep = existing[(dates < new_bars['date'].min()) | (dates > new_bars['date'].max())]
+                bars = np.concatenate([np.asarray(keep), new_bars])
+            else:
+                bars = new_bars
+
+            bars = bars[np.argsort(bars['date'], kind='stable')]
+            path = self.path_for(symbol)
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, bars)
+            os.replace(tmp_path, path)
+
+        return len(new_bars)
+
+    def missing_ranges(self, symbols: List[str],
+                       start: datetime) -> Dict[Tuple[date, Optional[date]], List[str]]:
+        # Group symbols by the (fetch_from, fetch_to) range that has to be requested from the
+        # provider; fetch_to None means up to the requested end. A symbol stored from a later
+        # date than `start` also gets a leading range that ends at its first stored bar.
+        start = start.date() if isinstance(start, datetime) else start
+        groups = {}
+        for symbol in symbols:
+            bars = self._load(symbol)
+            if bars is None or len(bars) == 0:
+                groups.setdefault((start, None), []).append(symbol.upper())
+                continue
+
+            first, last = bars['date'][0].astype(date), bars['date'][-1].astype(date)
+            if last < start:
+                groups.setdefault((start, None), []).append(symbol.upper())
+                continue
+            # Weekends between `start` and the first stored bar aren't a gap
+            if np.busday_count(start, first) > 0:
+                groups.setdefault((start, first), []).append(symbol.upper())
+            groups.setdefault((last, None), []).append(symbol.upper())
+        return groups
+
+    def _load(self, symbol: str) -> Optional[np.ndarray]:
+        path = self.path_for(symbol)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode='r')
@@ -0,0 +1,112 @@
+from typing import Dict, Any, Optional
+import threading
+
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (compatible; stock-trading-agent)"
+
+
+class SessionManager:
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 20, timeout: float = 30.0,
+                 connect_timeout: float = 5.0, keepalive_expiry: float = 30.0,
+                 user_agent: Optional[str] = DEFAULT_USER_AGENT):
+        # pool_connections is the number of hosts kept, pool_maxsize the connections per host.
+        # yf.download fetches tickers from several threads, so it needs more than one per host.
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.user_agent = user_agent
+        self._requests_session = None
+        self._httpx_client = None
+        self._lock = threading.Lock()
+
+    @property
+    def requests_session(self):
+        # Used by yfinance; without one it calls requests.get and reconnects every time
+        if self._requests_session is None:
+            with self._lock:
+                if self._requests_session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    if self.user_agent:
+                        session.headers['User-Agent'] = self.user_agent
+                    self._requests_session = session
+        return self._requests_session
+
+    @property
+    def httpx_client(self):
+        # Passed to OpenAI(http_client=...) so every analyzer shares one keep-alive pool
+        if self._httpx_client is None:
+            with self._lock:
+                if self._httpx_client is None:
+                    import httpx
+
+                    self._httpx_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=self.pool_maxsize,
+                            max_keepalive_connections=self.pool_maxsize,
+                            keepalive_expiry=self.keepalive_expiry
+                        ),
+                        timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                        follow_redirects=True
+                    )
+        return self._httpx_client
+
+    def create_async_client(self, max_connections: Optional[int] = None, **kwargs):
+        # An AsyncClient is tied to the event loop that uses it, so each async tool owns
+        # one built from these settings instead of sharing a process-wide instance
+        import httpx
+
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections or self.pool_maxsize,
+                max_keepalive_connections=self.pool_maxsize,
+                keepalive_expiry=self.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            follow_redirects=True,
+            **kwargs
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests_session': self._requests_session is not None,
+            'httpx_client': self._httpx_client is not None,
+            'pool_maxsize': self.pool_maxsize,
+            'timeout': self.timeout
+        }
+
+    def close(self):
+        with self._lock:
+            if self._requests_session is not None:
+                self._requests_session.close()
+                self._requests_session = None
+            if self._httpx_client is not None:
+                self._httpx_client.close()
+                self._httpx_client = None
+
+    def __enter__(self) -> 'SessionManager':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_manager = None
+_default_lock = threading.Lock()
+
+
+def default_session_manager() -> SessionManager:
+    # Process-wide pools shared by every tool that isn't given its own manager
+    global _default_manager
+    if _default_manager is None:
+        with _default_lock:
+            if _default_manager is None:
+                _default_manager = SessionManager()
+    return _default_manager
@@ -0,0 +1,387 @@
+from typing import Dict, Any, Optional, Tuple, Union
+from collections import deque
+import math
+import numpy as np
+import pandas as pd
+
+
+SMA_FAST_WINDOW = 20
+SMA_SLOW_WINDOW = 50
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+BOLLINGER_WINDOW = 20
+BOLLINGER_WIDTH = 2.0
+VOLUME_WINDOW = 20
+
+INDICATOR_COLUMNS = [
+    'sma_20', 'sma_50', 'ema_12', 'ema_26', 'rsi_14', 'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_lower', 'atr_14', 'volume_zscore'
+]
+
+# Bars a symbol needs before each indicator is reported; shorter histories give NaN
+MIN_BARS = {
+    'sma_20': SMA_FAST_WINDOW,
+    'sma_50': SMA_SLOW_WINDOW,
+    'ema_12': MACD_FAST,
+    'ema_26': MACD_SLOW,
+    'rsi_14': RSI_PERIOD + 1,
+    'macd': MACD_SLOW,
+    'macd_signal': MACD_SLOW + MACD_SIGNAL - 1,
+    'macd_hist': MACD_SLOW + MACD_SIGNAL - 1,
+    'bb_upper': BOLLINGER_WINDOW,
+    'bb_lower': BOLLINGER_WINDOW,
+    'atr_14': ATR_PERIOD,
+    'volume_zscore': VOLUME_WINDOW
+}
+
+# EMAs use the adjust=False recursion (as in pandas) and RSI/ATR Wilder's smoothing
+# (alpha = 1/period), both seeded with the first bar, so IndicatorState reproduces the
+# vectorized values
+
+
+def compute_indicators(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> pd.DataFrame:
+    # Indicators as of each symbol's last bar, one row per symbol, in one pass over the panel
+    symbols, bars, counts, order = _compact(panel)
+    if not symbols:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS, index=pd.Index(symbols, name='symbol'), dtype=float)
+
+    raw = _indicator_arrays(*bars)
+    last = np.maximum(counts - 1, 0)
+    cols = np.arange(len(symbols))
+    table = {name: np.where(counts >= MIN_BARS[name], raw[name][last, cols], np.nan) for name in INDICATOR_COLUMNS}
+    return pd.DataFrame(table, index=pd.Index(symbols, name='symbol'))
+
+
+def compute_indicators_history(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                               start: Optional[Any] = None) -> pd.DataFrame:
+    # Row (date, symbol) equals compute_indicators(panel.loc[:date]).loc[symbol], indexed
+    # like compute_metrics_history so the two join directly
+    panel = _panel(panel)
+    symbols, bars, counts, order = _compact(panel)
+    index_names = ['date', 'symbol']
+    if not symbols:
+        return pd.DataFrame(columns=INDICATOR_COLUMNS, index=pd.MultiIndex.from_tuples([], names=index_names), dtype=float)
+
+    raw = _indicator_arrays(*bars)
+    dates = pd.DatetimeIndex(panel.index)
+    keep = 0 if start is None else int(np.searchsorted(dates.values, np.datetime64(pd.Timestamp(start)), 'left'))
+
+    # Bars seen up to each date; a date without a bar repeats the symbol's previous values
+    seen = np.cumsum(~np.isnan(panel['Close'].reindex(columns=symbols).to_numpy(dtype=float)), axis=0)[keep:]
+    position = np.maximum(seen - 1, 0)
+    table = {}
+    for name in INDICATOR_COLUMNS:
+        values = np.take_along_axis(raw[name], position, axis=0)
+        table[name] = np.where(seen >= MIN_BARS[name], values, np.nan).ravel()
+
+    index = pd.MultiIndex.from_product([dates[keep:], symbols], names=index_names)
+    return pd.DataFrame(table, index=index)
+
+
+def seed_indicators(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> Dict[str, 'IndicatorState']:
+    # One IndicatorState per symbol from a single vectorized pass, ready for update()
+    panel = _panel(panel)
+    symbols, bars, counts, order = _compact(panel)
+    if not symbols:
+        return {}
+
+    raw = _indicator_arrays(*bars)
+    close, high, low, volume = bars
+    timestamps = pd.DatetimeIndex(panel.index)
+    states = {}
+    for col, symbol in enumerate(symbols):
+        count = int(counts[col])
+        if not count:
+            continue
+        # Seeded up to the previous bar and then fed the last one, so an update with the
+        # same timestamp can still replace it
+        last = count - 1
+        state = IndicatorState()
+        if last:
+            state = IndicatorState._from_arrays(
+                bars=last,
+                timestamp=timestamps[order[last - 1, col]],
+                closes=close[max(0, last - SMA_SLOW_WINDOW):last, col],
+                volumes=volume[max(0, last - VOLUME_WINDOW):last, col],
+                state={key: raw[key][last - 1, col] for key in _STATE_KEYS}
+            )
+        state.update(close[last, col], high[last, col], low[last, col], volume[last, col], timestamps[order[last, col]])
+        states[symbol] = state
+    return states
+
+
+class IndicatorState:
+    # Incremental indicators for one symbol: update() folds in a bar in O(1), using running
+    # sums over fixed-size windows and the EMA/Wilder recursions. A bar with the same
+    # timestamp as the last one replaces it, e.g. today's bar while the session is open.
+    __slots__ = (
+        'bars', 'timestamp', '_ema_fast', '_ema_slow', '_signal', '_avg_gain', '_avg_loss', '_atr',
+        '_previous_close', '_closes', '_volumes', '_close_shift', '_volume_shift',
+        '_sum_fast', '_sumsq_fast', '_sum_slow', '_volume_sum', '_volume_sumsq', '_undo'
+    )
+
+    def __init__(self):
+        self.bars = 0
+        self.timestamp = None
+        self._ema_fast = self._ema_slow = self._signal = math.nan
+        self._avg_gain = self._avg_loss = self._atr = math.nan
+        self._previous_close = math.nan
+        self._closes = deque(maxlen=SMA_SLOW_WINDOW)
+        self._volumes = deque(maxlen=VOLUME_WINDOW)
+        # Window sums are kept relative to the first value seen, which keeps the variance
+        # from cancelling catastrophically for high-priced symbols
+        self._close_shift = None
+        self._volume_shift = None
+        self._sum_fast = self._sumsq_fast = self._sum_slow = 0.0
+        self._volume_sum = self._volume_sumsq = 0.0
+        self._undo = None
+
+    @classmethod
+    def from_history(cls, frame: pd.DataFrame) -> 'IndicatorState':
+        # Seeded from an OHLCV frame (Close, High, Low, Volume columns) without a Python loop over bars
+        return seed_indicators({'_': frame}).get('_', cls())
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None,
+               volume: float = 0.0, timestamp: Optional[Any] = None) -> Dict[str, float]:
+        if timestamp is not None and self.timestamp is not None and pd.Timestamp(timestamp) == self.timestamp:
+            self._rollback()
+
+        high = close if high is None else high
+        low = close if low is None else low
+        volume = 0.0 if volume is None or volume != volume else float(volume)
+        if self._close_shift is None:
+            self._close_shift = close
+            self._volume_shift = volume
+
+        dropped_slow = self._closes[0] if len(self._closes) == SMA_SLOW_WINDOW else None
+        dropped_fast = self._closes[-SMA_FAST_WINDOW] if len(self._closes) >= SMA_FAST_WINDOW else None
+        dropped_volume = self._volumes[0] if len(self._volumes) == VOLUME_WINDOW else None
+        self._undo = (
+            self.bars, self.timestamp, self._ema_fast, self._ema_slow, self._signal, self._avg_gain,
+            self._avg_loss, self._atr, self._previous_close, self._sum_fast, self._sumsq_fast, self._sum_slow,
+            self._volume_sum, self._volume_sumsq, dropped_slow, dropped_volume
+        )
+
+        x = close - self._close_shift
+        self._sum_fast += x
+        self._sumsq_fast += x * x
+        self._sum_slow += x
+        if dropped_fast is not None:
+            y = dropped_fast - self._close_shift
+            self._sum_fast -= y
+            self._sumsq_fast -= y * y
+        if dropped_slow is not None:
+            self._sum_slow -= dropped_slow - self._close_shift
+        self._closes.append(close)
+
+        v = volume - self._volume_shift
+        self._volume_sum += v
+        self._volume_sumsq += v * v
+        if dropped_volume is not None:
+            w = dropped_volume - self._volume_shift
+            self._volume_sum -= w
+            self._volume_sumsq -= w * w
+        self._volumes.append(volume)
+
+        first = self.bars == 0
+        self._ema_fast = _ema_step(self._ema_fast, close, 2 / (MACD_FAST + 1), first)
+        self._ema_slow = _ema_step(self._ema_slow, close, 2 / (MACD_SLOW + 1), first)
+        self._signal = _ema_step(self._signal, self._ema_fast - self._ema_slow, 2 / (MACD_SIGNAL + 1), first)
+
+        if first:
+            true_range = high - low
+        else:
+            delta = close - self._previous_close
+            second = self.bars == 1
+            self._avg_gain = _ema_step(self._avg_gain, max(delta, 0.0), 1 / RSI_PERIOD, second)
+            self._avg_loss = _ema_step(self._avg_loss, max(-delta, 0.0), 1 / RSI_PERIOD, second)
+            true_range = max(high - low, abs(high - self._previous_close), abs(low - self._previous_close))
+        self._atr = _ema_step(self._atr, true_range, 1 / ATR_PERIOD, first)
+
+        self._previous_close = close
+        self.bars += 1
+        self.timestamp = pd.Timestamp(timestamp) if timestamp is not None else None
+        return self.values()
+
+    def values(self) -> Dict[str, float]:
+        n_fast = min(self.bars, SMA_FAST_WINDOW)
+        n_slow = min(self.bars, SMA_SLOW_WINDOW)
+        n_volume = min(self.bars, VOLUME_WINDOW)
+        shift = self._close_shift or 0.0
+
+        mean_fast = self._sum_fast / n_fast if n_fast else 0.0
+        std_fast = math.sqrt(max(self._sumsq_fast / n_fast - mean_fast * mean_fast, 0.0)) if n_fast else 0.0
+        volume_mean = self._volume_sum / n_volume if n_volume else 0.0
+        volume_std = math.sqrt(max(self._volume_sumsq / n_volume - volume_mean * volume_mean, 0.0)) if n_volume else 0.0
+        last_volume = self._volumes[-1] - (self._volume_shift or 0.0) if self._volumes else 0.0
+        macd = self._ema_fast - self._ema_slow
+        movement = self._avg_gain + self._avg_loss
+
+        values = {
+            'sma_20': shift + mean_fast,
+            'sma_50': shift + (self._sum_slow / n_slow if n_slow else 0.0),
+            'ema_12': self._ema_fast,
+            'ema_26': self._ema_slow,
+            'rsi_14': 100 * self._avg_gain / movement if movement else 50.0,
+            'macd': macd,
+            'macd_signal': self._signal,
+            'macd_hist': macd - self._signal,
+            'bb_upper': shift + mean_fast + BOLLINGER_WIDTH * std_fast,
+            'bb_lower': shift + mean_fast - BOLLINGER_WIDTH * std_fast,
+            'atr_14': self._atr,
+            'volume_zscore': (last_volume - volume_mean) / volume_std if volume_std > 0 else 0.0
+        }
+        return {name: value if self.bars >= MIN_BARS[name] else math.nan for name, value in values.items()}
+
+    @classmethod
+    def _from_arrays(cls, bars: int, timestamp: Any, closes: np.ndarray, volumes: np.ndarray,
+                     state: Dict[str, float]) -> 'IndicatorState':
+        self = cls()
+        self.bars = bars
+        self.timestamp = pd.Timestamp(timestamp)
+        self._ema_fast = float(state['ema_12'])
+        self._ema_slow = float(state['ema_26'])
+        self._signal = float(state['_signal'])
+        self._avg_gain = float(state['_avg_gain'])
+        self._avg_loss = float(state['_avg_loss'])
+        self._atr = float(state['atr_14'])
+        self._previous_close = float(closes[-1])
+        self._closes.extend(float(value) for value in closes)
+        self._volumes.extend(float(value) for value in volumes)
+
+        self._close_shift = self._closes[0]
+        self._volume_shift = self._volumes[0]
+        fast = np.asarray(self._closes, dtype=float)[-SMA_FAST_WINDOW:] - self._close_shift
+        self._sum_fast = float(fast.sum())
+        self._sumsq_fast = float((fast * fast).sum())
+        self._sum_slow = float((np.asarray(self._closes, dtype=float) - self._close_shift).sum())
+        window = np.asarray(self._volumes, dtype=float) - self._volume_shift
+        self._volume_sum = float(window.sum())
+        self._volume_sumsq = float((window * window).sum())
+        return self
+
+    def _rollback(self):
+        (self.bars, self.timestamp, self._ema_fast, self._ema_slow, self._signal, self._avg_gain,
+         self._avg_loss, self._atr, self._previous_close, self._sum_fast, self._sumsq_fast, self._sum_slow,
+         self._volume_sum, self._volume_sumsq, dropped_slow, dropped_volume) = self._undo
+        self._closes.pop()
+        if dropped_slow is not None:
+            self._closes.appendleft(dropped_slow)
+        self._volumes.pop()
+        if dropped_volume is not None:
+            self._volumes.appendleft(dropped_volume)
+        self._undo = None
+
+
+_STATE_KEYS = ['ema_12', 'ema_26', '_signal', '_avg_gain', '_avg_loss', 'atr_14']
+
+
+def _ema_step(previous: float, value: float, alpha: float, first: bool) -> float:
+    return value if first else previous + alpha * (value - previous)
+
+
+def _panel(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]]) -> pd.DataFrame:
+    if isinstance(panel, dict):
+        from .metrics_engine import panel_from_frames
+        return panel_from_frames(panel)
+    return panel
+
+
+def _compact(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]]):
+    # Moves each symbol's valid bars to the top of its column (in date order), so rolling
+    # windows and recursions count bars rather than calendar rows of the shared date index
+    panel = _panel(panel)
+    symbols = list(dict.fromkeys(panel['Close'].columns)) if len(panel.columns) else []
+    if not symbols or panel.empty:
+        return [], (), np.zeros(0, dtype=int), None
+
+    field = lambda name: panel[name].reindex(columns=symbols).to_numpy(dtype=float)
+    close = field('Close')
+    valid = ~np.isnan(close)
+    order = np.argsort(~valid, axis=0, kind='stable')
+    take = lambda values: np.take_along_axis(values, order, axis=0)
+
+    bars = (take(close), take(field('High')), take(field('Low')), np.nan_to_num(take(field('Volume'))))
+    return symbols, bars, valid.sum(axis=0), order
+
+
+def _ewm(values: np.ndarray, alpha: float, block: int = 256) -> np.ndarray:
+    # y[k] = y[k-1] + alpha * (x[k] - y[k-1]), seeded with x[0], in closed form one block of
+    # rows at a time: y[j] = decay^j * (decay * y[-1] + alpha * cumsum(x[k] / decay^k)).
+    # Blocks keep decay^-k well inside float range. NaN rows after a symbol's last bar only
+    # affect rows that are never read.
+    out = np.empty_like(values)
+    if not len(values):
+        return out
+    decay = 1 - alpha
+    previous = values[0]
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        powers = decay ** np.arange(len(chunk))[:, None]
+        out[start:start + block] = powers * (decay * previous + alpha * np.cumsum(chunk / powers, axis=0))
+        previous = out[start + len(chunk) - 1]
+    return out
+
+
+def _rolling(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Trailing mean and population std over up to `window` bars, from running sums. Each
+    # column is shifted by its first value so the sum of squares doesn't lose precision.
+    shifted = values - values[:1]
+    sums = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(shifted, axis=0)])
+    squares = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(shifted * shifted, axis=0)])
+    upto = np.arange(1, len(values) + 1)
+    start = np.maximum(upto - window, 0)
+    count = (upto - start)[:, None]
+    mean = (sums[upto] - sums[start]) / count
+    variance = (squares[upto] - squares[start]) / count - mean * mean
+    return values[:1] + mean, np.sqrt(np.maximum(variance, 0.0))
+
+
+def _indicator_arrays(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      volume: np.ndarray) -> Dict[str, np.ndarray]:
+    # Unmasked values after every bar: row k of each output holds the state after bar k
+    ema = _ewm
+    ema_fast = ema(close, 2 / (MACD_FAST + 1))
+    ema_slow = ema(close, 2 / (MACD_SLOW + 1))
+    macd = ema_fast - ema_slow
+    signal = ema(macd, 2 / (MACD_SIGNAL + 1))
+
+    previous_close = np.vstack([np.full((1, close.shape[1]), np.nan), close[:-1]])
+    delta = close - previous_close
+    # The first bar has no change, so gains and losses are smoothed from the second bar on
+    no_change = np.full((1, close.shape[1]), np.nan)
+    avg_gain = np.vstack([no_change, ema(np.maximum(delta[1:], 0.0), 1 / RSI_PERIOD)])
+    avg_loss = np.vstack([no_change, ema(np.maximum(-delta[1:], 0.0), 1 / RSI_PERIOD)])
+    movement = avg_gain + avg_loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(movement > 0, 100 * avg_gain / movement, 50.0)
+
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+    atr = ema(true_range, 1 / ATR_PERIOD)
+
+    sma_fast, std_fast = _rolling(close, BOLLINGER_WINDOW)
+    sma_slow, _ = _rolling(close, SMA_SLOW_WINDOW)
+    volume_mean, volume_std = _rolling(volume, VOLUME_WINDOW)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_zscore = np.where(volume_std > 0, (volume - volume_mean) / volume_std, 0.0)
+
+    return {
+        'sma_20': sma_fast,
+        'sma_50': sma_slow,
+        'ema_12': ema_fast,
+        'ema_26': ema_slow,
+        'rsi_14': rsi,
+        'macd': macd,
+        'macd_signal': signal,
+        'macd_hist': macd - signal,
+        'bb_upper': sma_fast + BOLLINGER_WIDTH * std_fast,
+        'bb_lower': sma_fast - BOLLINGER_WIDTH * std_fast,
+        'atr_14': atr,
+        'volume_zscore': volume_zscore,
+        '_signal': signal,
+        '_avg_gain': avg_gain,
+        '_avg_loss': avg_loss
+    }
@@ -0,0 +1,189 @@
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union, IO
+from collections import deque
+from contextlib import contextmanager
+import json
+import math
+import re
+import threading
+import time
+
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# A series is a metric name plus its sorted label pairs
+SeriesKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class JsonLinesSink:
+    # Appends every timing and counter event as one JSON object per line
+    def __init__(self, target: Union[str, IO[str]]):
+        self._file = open(target, 'a', encoding='utf-8') if isinstance(target, str) else target
+        self._owns_file = isinstance(target, str)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, Any]):
+        line = json.dumps(event, separators=(',', ':'))
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self):
+        if self._owns_file:
+            self._file.close()
+
+
+class MetricsRegistry:
+    def __init__(self, max_samples: int = 10000, sinks: Optional[List[Callable[[Dict[str, Any]], None]]] = None):
+        # Percentiles come from the most recent max_samples observations of each series;
+        # counts and sums cover every observation
+        self.max_samples = max_samples
+        self.sinks = list(sinks or [])
+        self._timers = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def add_sink(self, sink: Callable[[Dict[str, Any]], None]):
+        self.sinks.append(sink)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        started = time.perf_counter()
+        status = 'ok'
+        try:
+            yield
+        except BaseException:
+            status = 'error'
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - started, status=status, **labels)
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = {'count': 0, 'sum': 0.0, 'max': 0.0,
+                                             'samples': deque(maxlen=self.max_samples)}
+            timer['count'] += 1
+            timer['sum'] += seconds
+            timer['max'] = max(timer['max'], seconds)
+            timer['samples'].append(seconds)
+        self._emit({'type': 'timer', 'name': name, 'seconds': round(seconds, 6), 'labels': labels})
+
+    def increment(self, name: str, value: float = 1, **labels):
+        if not value:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+        self._emit({'type': 'counter', 'name': name, 'value': value, 'labels': labels})
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            timers = {key: (timer['count'], timer['sum'], timer['max'], sorted(timer['samples']))
+                      for key, timer in self._timers.items()}
+            counters = dict(self._counters)
+
+        timer_summary = {}
+        for key, (count, total, maximum, samples) in sorted(timers.items()):
+            timer_summary[self._series_name(key)] = {
+                'count': count,
+                'sum': round(total, 6),
+                'mean': round(total / count, 6),
+                'p50': round(self._quantile(samples, 0.5), 6),
+                'p95': round(self._quantile(samples, 0.95), 6),
+                'p99': round(self._quantile(samples, 0.99), 6),
+                'max': round(maximum, 6)
+            }
+
+        return {
+            'timers': timer_summary,
+            'counters': {self._series_name(key): value for key, value in sorted(counters.items())}
+        }
+
+    def to_prometheus(self, prefix: str = 'stock_agent') -> str:
+        with self._lock:
+            timers = {key: (timer['count'], timer['sum'], sorted(timer['samples']))
+                      for key, timer in self._timers.items()}
+            counters = dict(self._counters)
+
+        lines = []
+        typed = set()
+        for (name, labels), (count, total, samples) in sorted(timers.items()):
+            metric = f"{self._prometheus_name(prefix, name)}_seconds"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} summary")
+            for quantile in QUANTILES:
+                quantile_labels = labels + (('quantile', str(quantile)),)
+                lines.append(f"{metric}{self._prometheus_labels(quantile_labels)} {self._quantile(samples, quantile):.6g}")
+            lines.append(f"{metric}_sum{self._prometheus_labels(labels)} {total:.6g}")
+            lines.append(f"{metric}_count{self._prometheus_labels(labels)} {count}")
+
+        for (name, labels), value in sorted(counters.items()):
+            metric = f"{self._prometheus_name(prefix, name)}_total"
+            if metric not in typed:
+                typed.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{self._prometheus_labels(labels)} {value:g}")
+
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def reset(self):
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def _emit(self, event: Dict[str, Any]):
+        if not self.sinks:
+            return
+        event['timestamp'] = time.time()
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception:
+                # A failing exporter must never break an analysis
+                pass
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> SeriesKey:
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _series_name(key: SeriesKey) -> str:
+        name, labels = key
+        if not labels:
+            return name
+        return name + '{' + ','.join(f"{label}={value}" for label, value in labels) + '}'
+
+    @staticmethod
+    def _quantile(samples: List[float], quantile: float) -> float:
+        # Nearest-rank percentile over sorted samples
+        if not samples:
+            return 0.0
+        return samples[max(0, math.ceil(quantile * len(samples)) - 1)]
+
+    @staticmethod
+    def _prometheus_name(prefix: str, name: str) -> str:
+        return re.sub(r'[^a-zA-Z0-9_]', '_', f"{prefix}_{name}" if prefix else name)
+
+    @staticmethod
+    def _prometheus_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+        if not labels:
+            return ''
+        escape = lambda value: value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        return '{' + ','.join(f'{label}="{escape(value)}"' for label, value in labels) + '}'
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> MetricsRegistry:
+    # Process-wide registry shared by every tool that isn't given its own
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                _default_registry = MetricsRegistry()
+    return _default_registry
@@ -0,0 +1,122 @@
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime
+import json
+import os
+import threading
+import pandas as pd
+from .cache import MarketDataCache
+from .history_store import HistoryStore, BAR_COLUMNS
+from .instrumentation import MetricsRegistry
+from .market_data import MarketDataTool
+
+
+# Checked in this order when a symbol has more than one file
+FORMATS = ('npy', 'parquet', 'csv')
+
+
+class LocalFileProvider(MarketDataTool):
+    # Serves daily bars and fundamentals from a directory instead of the network, one file
+    # per symbol: SYMBOL.npy (the HistoryStore layout, memory-mapped), SYMBOL.parquet or
+    # SYMBOL.csv with a date column and Open/High/Low/Close/Volume. Fundamentals are
+    # yfinance-style info dicts keyed by symbol, from fundamentals.json or passed in.
+    provider = 'local'
+
+    def __init__(self, root: str, fundamentals: Optional[Dict[str, Dict[str, Any]]] = None,
+                 as_of: Optional[datetime] = None, cache: Optional[MarketDataCache] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        if not os.path.isdir(root):
+            raise ValueError(f"Market data directory not found: {root}")
+
+        super().__init__(cache=cache, metrics=metrics)
+        self.name = "Local File Market Data Provider"
+        self.root = root
+        # Pins "now" so old recordings give the same metrics on every run
+        self.as_of = as_of
+        self.store = HistoryStore(root)
+        self._fundamentals_data = fundamentals
+        # CSV and Parquet files are parsed once and reused until their mtime changes
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def symbols(self) -> List[str]:
+        names = set()
+        for name in os.listdir(self.root):
+            stem, _, extension = name.rpartition('.')
+            if stem and extension in FORMATS:
+                names.add(stem.upper())
+        return sorted(names)
+
+    def _now(self) -> datetime:
+        return self.as_of or datetime.now()
+
+    def _download(self, tickers: List[str], start_date: datetime, end_date: datetime) -> Dict[str, pd.DataFrame]:
+        frames = {}
+        with self.metrics.span('local.read'):
+            for ticker in tickers:
+                frame = self._read(ticker, start_date, end_date)
+                if frame is not None and not frame.empty:
+                    frames[ticker] = frame
+        self.metrics.increment('local.symbols_read', len(frames))
+        return frames
+
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        if self._fundamentals_data is None:
+            path = os.path.join(self.root, 'fundamentals.json')
+            data = {}
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    data = json.load(f)
+            self._fundamentals_data = {symbol.upper(): info for symbol, info in data.items()}
+
+        info = self._fundamentals_data.get(ticker, {})
+        if self.cache is not None and info:
+            self.cache.fundamentals.set(ticker, info)
+        return info
+
+    def _read(self, ticker: str, start_date: datetime, end_date: datetime) -> Optional[pd.DataFrame]:
+        path, extension = self._find(ticker)
+        if path is None:
+            return None
+
+        # A memory-mapped array is windowed with binary searches, without reading the rest
+        if extension == 'npy':
+            return self.store.read(ticker, start_date, end_date)
+
+        frame = self._load(path, extension)
+        lo = frame.index.searchsorted(pd.Timestamp(start_date).normalize(), 'left')
+        hi = frame.index.searchsorted(pd.Timestamp(end_date), 'right')
+        return frame.iloc[lo:hi]
+
+    def _find(self, ticker: str) -> Tuple[Optional[str], Optional[str]]:
+        for extension in FORMATS:
+            path = os.path.join(self.root, f"{ticker}.{extension}")
+            if os.path.exists(path):
+                return path, extension
+        return None, None
+
+    def _load(self, path: str, extension: str) -> pd.DataFrame:
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._frames.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        if extension == 'parquet':
+            # Needs pyarrow or fastparquet, like any pandas Parquet read
+            frame = pd.read_parquet(path)
+            date_columns = [column for column in frame.columns if str(column).lower() == 'date']
+            if date_columns:
+                frame = frame.set_index(date_columns[0])
+        else:
+            frame = pd.read_csv(path, index_col=0, parse_dates=True)
+
+        frame = frame.rename(columns=lambda column: str(column).strip().title())
+        index = pd.DatetimeIndex(pd.to_datetime(frame.index))
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        frame.index = index.normalize().rename('Date')
+        frame = frame[[column for column in BAR_COLUMNS if column in frame]].astype(float).sort_index()
+        frame = frame.dropna(subset=['Close'])
+
+        with self._lock:
+            self._frames[path] = (mtime, frame)
+        return frame
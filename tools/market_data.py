@@ -0,0 +1,325 @@
+from typing import Dict, Any, List, Optional, Tuple, Protocol, runtime_checkable
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+import pandas as pd
+from .cache import MarketDataCache
+from .history_store import HistoryStore
+from .instrumentation import MetricsRegistry, default_registry
+from .results import QuoteSnapshot
+from .indicators import INDICATOR_COLUMNS, compute_indicators
+from .metrics_engine import compute_metrics, compute_metrics_table, panel_from_frames, YEAR_WINDOW_DAYS
+
+
+@runtime_checkable
+class MarketDataProvider(Protocol):
+    # What StockTradingAgent, WatchlistMonitor and the screens need from a data source:
+    # batch daily history, fundamentals, and quote snapshots in the get_stock_info dict format
+
+    def get_stock_info(self, symbol: str, hist_data: Optional[pd.DataFrame] = None,
+                       include_info: bool = True) -> Dict[str, Any]: ...
+
+    def get_stock_info_batch(self, symbols: List[str], include_info: bool = True, refresh: bool = False,
+                             hist_data: Optional[Dict[str, pd.DataFrame]] = None,
+                             indicators: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]: ...
+
+    def get_metrics_table(self, symbols: List[str], include_info: bool = False,
+                          with_labels: bool = False, refresh: bool = False) -> pd.DataFrame: ...
+
+    def download_history(self, symbols: List[str], end_date: Optional[datetime] = None,
+                         days: Optional[int] = None, refresh: bool = False) -> Dict[str, pd.DataFrame]: ...
+
+    def get_fundamentals(self, symbol: str) -> Dict[str, Any]: ...
+
+    def get_sectors(self, symbols: List[str]) -> Dict[str, Dict[str, str]]: ...
+
+
+class MarketDataTool(ABC):
+    # Caching, metrics and result building shared by every provider. Subclasses implement
+    # _download (daily OHLCV frames for a batch of tickers) and optionally _fetch_info
+    # (a yfinance-style info dict); span and counter names are prefixed with `provider`.
+    provider = 'market_data'
+
+    def __init__(self, cache: Optional[MarketDataCache] = None, history_store: Optional[HistoryStore] = None,
+                 metrics: Optional[MetricsRegistry] = None):
+        self.name = "Market Data Fetcher"
+        self.cache = cache
+        self.history_store = history_store
+        # Download, fundamentals and metrics timings plus cache hit counters
+        self.metrics = metrics or default_registry()
+        # A full year, so 52_week_high/52_week_low span 52 weeks and every indicator window is
+        # filled; still a single download request
+        self.lookback_days = YEAR_WINDOW_DAYS
+
+    def get_stock_info(self, symbol: str, hist_data: Optional[pd.DataFrame] = None,
+                       include_info: bool = True) -> Dict[str, Any]:
+        try:
+            end_date = self._now()
+
+            if hist_data is None:
+                hist_data = self.download_history([symbol], end_date=end_date).get(symbol.upper(), pd.DataFrame())
+
+            if hist_data.empty:
+                return self._no_data_result(symbol)
+
+            with self.metrics.span(f'{self.provider}.metrics'):
+                metrics = self._quote_metrics({symbol.upper(): hist_data}, end_date).iloc[0]
+
+            # Try to get additional info, but don't fail if rate limited
+            info = {}
+            if include_info:
+                info = self._get_info(symbol.upper())
+
+            return self._build_stock_result(symbol, metrics, info)
+
+        except Exception as e:
+            return self._error_result(symbol, e)
+
+    def get_stock_info_batch(self, symbols: List[str], include_info: bool = True, refresh: bool = False,
+                             hist_data: Optional[Dict[str, pd.DataFrame]] = None,
+                             indicators: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, Any]]:
+        # hist_data skips the download, as in get_stock_info; indicators (one row per symbol,
+        # e.g. from IndicatorState) are used instead of recomputing them from the history
+        end_date = self._now()
+
+        try:
+            history = hist_data if hist_data is not None else self.download_history(symbols, end_date=end_date,
+                                                                                    refresh=refresh)
+        except Exception as e:
+            return {symbol.upper(): self._error_result(symbol, e) for symbol in symbols}
+
+        # Metrics and indicators for every symbol come out of one vectorized pass over the panel
+        with self.metrics.span(f'{self.provider}.metrics', batch=True):
+            metrics = self._quote_metrics(history, end_date, indicators)
+
+        results = {}
+        for symbol in symbols:
+            ticker = symbol.upper()
+            if ticker not in metrics.index:
+                results[ticker] = self._no_data_result(symbol)
+                continue
+            try:
+                info = self._get_info(ticker) if include_info else {}
+                results[ticker] = self._build_stock_result(symbol, metrics.loc[ticker], info)
+            except Exception as e:
+                results[ticker] = self._error_result(symbol, e)
+
+        return results
+
+    def get_metrics_table(self, symbols: List[str], include_info: bool = False,
+                          with_labels: bool = False, refresh: bool = False) -> pd.DataFrame:
+        end_date = self._now()
+        history = self.download_history(symbols, end_date=end_date, refresh=refresh)
+
+        fundamentals = None
+        if include_info:
+            fundamentals = {
+                ticker: self._fundamentals(ticker, self._get_info(ticker))
+                for ticker in history
+            }
+
+        return compute_metrics_table(history, fundamentals=fundamentals, as_of=end_date, with_labels=with_labels)
+
+    def get_fundamentals(self, symbol: str) -> Dict[str, Any]:
+        ticker = symbol.upper()
+        return self._fundamentals(ticker, self._get_info(ticker))
+
+    def get_sectors(self, symbols: List[str]) -> Dict[str, Dict[str, str]]:
+        # {symbol: {'sector', 'industry'}}; classifications come from the long-lived sectors
+        # cache, and only symbols missing there cost a fundamentals lookup
+        tickers = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        sectors, missing = self._cached_sectors(tickers)
+        for ticker in missing:
+            sectors[ticker] = self._remember_sector(ticker, self._get_info(ticker))
+        return {ticker: sectors[ticker] for ticker in tickers}
+
+    def download_history(self, symbols: List[str], end_date: Optional[datetime] = None,
+                         days: Optional[int] = None, refresh: bool = False) -> Dict[str, pd.DataFrame]:
+        end_date = end_date or self._now()
+        days = days or self.lookback_days
+        start_date = end_date - timedelta(days=days)
+
+        frames, missing = self._cached_history(symbols, end_date, days, refresh)
+        if not missing:
+            return frames
+
+        if self.history_store is not None:
+            fetched = self._read_history_store(missing, start_date, end_date)
+        else:
+            fetched = self._download(missing, start_date, end_date)
+
+        self._remember_history(frames, fetched, end_date, days)
+        return frames
+
+    @abstractmethod
+    def _download(self, tickers: List[str], start_date: datetime, end_date: datetime) -> Dict[str, pd.DataFrame]:
+        ...
+
+    def _fetch_info(self, ticker: str) -> Dict[str, Any]:
+        return {}
+
+    def _now(self) -> datetime:
+        return datetime.now()
+
+    def _quote_metrics(self, history: Dict[str, pd.DataFrame], end_date: datetime,
+                       indicators: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        panel = panel_from_frames(history)
+        if indicators is None:
+            indicators = compute_indicators(panel)
+        return compute_metrics(panel, as_of=end_date).join(indicators.reindex(columns=INDICATOR_COLUMNS))
+
+    def _cached_history(self, symbols: List[str], end_date: datetime, days: int,
+                        refresh: bool = False) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+        tickers = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        # refresh skips the lookup but still stores what is fetched, e.g. for intraday polling
+        if self.cache is None or refresh:
+            return {}, tickers
+
+        frames = {}
+        missing = []
+        for ticker in tickers:
+            frame = self.cache.prices.get(self._history_key(ticker, end_date, days))
+            if frame is None:
+                missing.append(ticker)
+            else:
+                frames[ticker] = frame
+
+        self.metrics.increment('cache.hits', len(frames), cache='prices')
+        self.metrics.increment('cache.misses', len(missing), cache='prices')
+        return frames, missing
+
+    def _remember_history(self, frames: Dict[str, pd.DataFrame], fetched: Dict[str, pd.DataFrame],
+                          end_date: datetime, days: int):
+        for ticker, frame in fetched.items():
+            if frame.empty:
+                continue
+            frames[ticker] = frame
+            if self.cache is not None:
+                self.cache.prices.set(self._history_key(ticker, end_date, days), frame)
+
+    def _read_history_store(self, tickers: List[str], start_date: datetime,
+                            end_date: datetime) -> Dict[str, pd.DataFrame]:
+        # Only request the bars missing before or after what is already stored, one request per
+        # gap; the last stored bar is fetched again in case it was a partial session
+        for (fetch_from, fetch_to), group in self.history_store.missing_ranges(tickers, start_date).items():
+            gap_start = pd.Timestamp(fetch_from).to_pydatetime()
+            gap_end = end_date if fetch_to is None else pd.Timestamp(fetch_to).to_pydatetime()
+            for ticker, frame in self._download(group, gap_start, gap_end).items():
+                self.history_store.write(ticker, frame)
+
+        with self.metrics.span(f'{self.provider}.history_store_read'):
+            return {ticker: self.history_store.read(ticker, start_date, end_date) for ticker in tickers}
+
+    def _get_info(self, ticker: str) -> Dict[str, Any]:
+        info = self._cached_info(ticker)
+        if info is not None:
+            return info
+
+        return self._fetch_info(ticker)
+
+    def _cached_info(self, ticker: str) -> Optional[Dict[str, Any]]:
+        if self.cache is None:
+            return None
+
+        info = self.cache.fundamentals.get(ticker)
+        self.metrics.increment('cache.hits' if info is not None else 'cache.misses', cache='fundamentals')
+        return info
+
+    def _cached_sectors(self, tickers: List[str]) -> Tuple[Dict[str, Dict[str, str]], List[str]]:
+        if self.cache is None:
+            return {}, tickers
+
+        sectors = {}
+        missing = []
+        for ticker in tickers:
+            entry = self.cache.sectors.get(ticker)
+            if entry is None:
+                missing.append(ticker)
+            else:
+                sectors[ticker] = entry
+
+        self.metrics.increment('cache.hits', len(sectors), cache='sectors')
+        self.metrics.increment('cache.misses', len(missing), cache='sectors')
+        return sectors, missing
+
+    def _remember_sector(self, ticker: str, info: Dict[str, Any]) -> Dict[str, str]:
+        entry = {'sector': info.get('sector', 'N/A'), 'industry': info.get('industry', 'N/A')}
+        # An empty info dict is usually a rate limit, not a real classification, so it isn't kept
+        if self.cache is not None and info.get('sector'):
+            self.cache.sectors.set(ticker, entry)
+        return entry
+
+    def _history_key(self, ticker: str, end_date: datetime, days: int) -> str:
+        return f"{ticker}:{end_date.date().isoformat()}:{days}"
+
+    def _build_stock_result(self, symbol: str, metrics: pd.Series, info: Dict[str, Any]) -> Dict[str, Any]:
+        fundamentals = self._fundamentals(symbol.upper(), info)
+
+        snapshot = QuoteSnapshot(
+            symbol=symbol.upper(),
+            company_name=fundamentals['company_name'],
+            current_price=round(float(metrics['current_price']), 2),
+            previous_close=round(float(metrics['previous_close']), 2),
+            open_price=round(float(metrics['open_price']), 2),
+            day_high=round(float(metrics['day_high']), 2),
+            day_low=round(float(metrics['day_low']), 2),
+            volume=int(metrics['volume']),
+            avg_volume=int(metrics['avg_volume']),
+            market_cap=fundamentals['market_cap'],
+            pe_ratio=fundamentals['pe_ratio'],
+            forward_pe=fundamentals['forward_pe'],
+            dividend_yield=fundamentals['dividend_yield'],
+            week_change=round(float(metrics['week_change']), 2),
+            month_change=round(float(metrics['month_change']), 2),
+            week_52_high=round(float(metrics['52_week_high']), 2),
+            week_52_low=round(float(metrics['52_week_low']), 2),
+            earnings_per_share=fundamentals['earnings_per_share'],
+            beta=fundamentals['beta'],
+            sector=fundamentals['sector'],
+            industry=fundamentals['industry'],
+            recommendation=fundamentals['recommendation'],
+            analyst_rating=fundamentals['analyst_rating'],
+            **{name: self._indicator(metrics, name) for name in INDICATOR_COLUMNS}
+        )
+        stock_data = snapshot.to_dict()
+
+        return {
+            'success': True,
+            'data': stock_data,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _indicator(metrics: pd.Series, name: str) -> Optional[float]:
+        value = metrics.get(name)
+        return round(float(value), 2) if value is not None and pd.notna(value) else None
+
+    def _fundamentals(self, ticker: str, info: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'company_name': info.get('longName', ticker),
+            'market_cap': info.get('marketCap', 0),
+            'pe_ratio': info.get('trailingPE', 0),
+            'forward_pe': info.get('forwardPE', 0),
+            'dividend_yield': info.get('dividendYield', 0),
+            'earnings_per_share': info.get('trailingEps', 0),
+            'beta': info.get('beta', 0),
+            'sector': info.get('sector', 'N/A'),
+            'industry': info.get('industry', 'N/A'),
+            'recommendation': info.get('recommendationKey', 'N/A'),
+            'analyst_rating': info.get('recommendationMean', 0)
+        }
+
+    def _error_result(self, symbol: str, error: Exception) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': str(error),
+            'symbol': symbol,
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def _no_data_result(self, symbol: str) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': 'No data available for this symbol',
+            'symbol': symbol,
+            'timestamp': datetime.now().isoformat()
+        }
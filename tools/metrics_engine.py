@@ -0,0 +1,304 @@
+from typing import Dict, Any, List, Optional, Union
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from .indicators import INDICATOR_COLUMNS, compute_indicators
+from .thresholds import (
+    MOMENTUM_THRESHOLD, LOW_PE_THRESHOLD, HIGH_PE_THRESHOLD, VOLUME_SURGE_RATIO,
+    DIVIDEND_YIELD_THRESHOLD, NEAR_52_WEEK_HIGH_RATIO, NEAR_52_WEEK_LOW_RATIO,
+    RSI_OVERBOUGHT, RSI_OVERSOLD
+)
+
+
+WEEK_WINDOW_DAYS = 7
+MONTH_WINDOW_DAYS = 35
+YEAR_WINDOW_DAYS = 365
+
+METRIC_COLUMNS = [
+    'current_price', 'previous_close', 'open_price', 'day_high', 'day_low', 'volume', 'avg_volume',
+    'week_change', 'month_change', '52_week_high', '52_week_low', 'bars'
+]
+
+FLAG_COLUMNS = [
+    'strong_momentum', 'weak_momentum', 'attractive_pe', 'high_pe', 'high_volume',
+    'dividend', 'near_52_week_high', 'near_52_week_low',
+    'overbought', 'oversold', 'above_upper_band', 'below_lower_band'
+]
+
+FUNDAMENTAL_DEFAULTS = {'pe_ratio': 0.0, 'dividend_yield': 0.0}
+
+# Signed weight of each key factor in the rule-based score; positive leans BUY
+FACTOR_WEIGHTS = {
+    'strong_momentum': 1.0,
+    'weak_momentum': -1.0,
+    'attractive_pe': 1.0,
+    'high_pe': -1.0,
+    'high_volume': 0.0,
+    'dividend': 0.5,
+    'near_52_week_high': 0.5,
+    'near_52_week_low': -0.5,
+    # Technical flags are informational by default; pass weights to score them
+    'overbought': 0.0,
+    'oversold': 0.0,
+    'above_upper_band': 0.0,
+    'below_lower_band': 0.0
+}
+
+
+def panel_from_frames(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    # Align per-symbol OHLCV frames into one (field, symbol) column panel
+    if not frames:
+        return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=['Price', 'Ticker']))
+
+    panel = pd.concat(frames, axis=1, names=['Ticker', 'Price']).swaplevel(axis=1)
+    return panel.sort_index(axis=0)
+
+
+def compute_metrics(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                    as_of: Optional[datetime] = None) -> pd.DataFrame:
+    if isinstance(panel, dict):
+        panel = panel_from_frames(panel)
+
+    as_of = as_of or datetime.now()
+    symbols = list(dict.fromkeys(panel['Close'].columns)) if len(panel.columns) else []
+    if not symbols or panel.empty:
+        return pd.DataFrame(columns=METRIC_COLUMNS, index=pd.Index(symbols, name='symbol'), dtype=float)
+
+    field = lambda name: panel[name].reindex(columns=symbols).to_numpy(dtype=float)
+    close, open_, high, low, volume = (field(name) for name in ('Close', 'Open', 'High', 'Low', 'Volume'))
+
+    n_rows, n_cols = close.shape
+    rows = np.arange(n_rows)[:, None]
+    cols = np.arange(n_cols)
+    valid = ~np.isnan(close)
+    dates = pd.DatetimeIndex(panel.index)
+
+    # Last and previous valid bar per symbol
+    last = np.where(valid, rows, -1).max(axis=0)
+    has_data = last >= 0
+    last_idx = np.where(has_data, last, 0)
+    prev = np.where(valid & (rows < last), rows, -1).max(axis=0)
+
+    current_price = close[last_idx, cols]
+    previous_close = np.where(prev >= 0, close[np.maximum(prev, 0), cols], current_price)
+
+    # First valid bar inside a trailing window, plus how many bars it holds
+    def window_change(start: datetime, fallback_to_all: bool = False):
+        in_window = valid & (dates >= start)[:, None]
+        if fallback_to_all:
+            in_window = np.where(in_window.any(axis=0), in_window, valid)
+        count = in_window.sum(axis=0)
+        first = np.where(in_window, rows, n_rows).min(axis=0)
+        start_price = close[np.minimum(first, n_rows - 1), cols]
+        change = np.where(count > 1, (current_price - start_price) / start_price * 100, 0.0)
+        return change, in_window
+
+    week_change, _ = window_change(as_of - timedelta(days=WEEK_WINDOW_DAYS))
+    month_change, month_window = window_change(as_of - timedelta(days=MONTH_WINDOW_DAYS), fallback_to_all=True)
+
+    month_count = month_window.sum(axis=0)
+    avg_volume = np.where(month_window, volume, 0.0).sum(axis=0) / np.maximum(month_count, 1)
+
+    year_window = valid & (dates >= as_of - timedelta(days=YEAR_WINDOW_DAYS))[:, None]
+    year_window = np.where(year_window.any(axis=0), year_window, valid)
+    week_52_high = np.where(year_window, high, -np.inf).max(axis=0)
+    week_52_low = np.where(year_window, low, np.inf).min(axis=0)
+
+    table = pd.DataFrame({
+        'current_price': current_price,
+        'previous_close': previous_close,
+        'open_price': open_[last_idx, cols],
+        'day_high': high[last_idx, cols],
+        'day_low': low[last_idx, cols],
+        'volume': volume[last_idx, cols],
+        'avg_volume': avg_volume,
+        'week_change': week_change,
+        'month_change': month_change,
+        '52_week_high': week_52_high,
+        '52_week_low': week_52_low,
+        'bars': valid.sum(axis=0)
+    }, index=pd.Index(symbols, name='symbol'))
+
+    # Symbols without a single bar stay in the table as all-NaN rows
+    table.loc[~has_data, METRIC_COLUMNS[:-1]] = np.nan
+    return table
+
+
+def compute_metrics_history(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                            start: Optional[datetime] = None) -> pd.DataFrame:
+    # compute_metrics as of every bar date at once: row (date, symbol) equals
+    # compute_metrics(panel.loc[:date], as_of=date).loc[symbol], without the per-date loop
+    if isinstance(panel, dict):
+        panel = panel_from_frames(panel)
+
+    symbols = list(dict.fromkeys(panel['Close'].columns)) if len(panel.columns) else []
+    index_names = ['date', 'symbol']
+    if not symbols or panel.empty:
+        return pd.DataFrame(columns=METRIC_COLUMNS, index=pd.MultiIndex.from_tuples([], names=index_names), dtype=float)
+
+    field = lambda name: panel[name].reindex(columns=symbols).to_numpy(dtype=float)
+    close, open_, high, low, volume = (field(name) for name in ('Close', 'Open', 'High', 'Low', 'Volume'))
+
+    n_rows, n_cols = close.shape
+    rows = np.arange(n_rows)[:, None]
+    cols = np.arange(n_cols)
+    valid = ~np.isnan(close)
+    dates = pd.DatetimeIndex(panel.index)
+
+    # Last valid bar at or before each date, and the valid bar before that one
+    last = np.maximum.accumulate(np.where(valid, rows, -1), axis=0)
+    has_data = last >= 0
+    last_idx = np.maximum(last, 0)
+    last_before = np.vstack([np.full((1, n_cols), -1), last[:-1]])
+    prev = np.where(has_data, last_before[last_idx, cols], -1)
+
+    current_price = close[last_idx, cols]
+    previous_close = np.where(prev >= 0, close[np.maximum(prev, 0), cols], current_price)
+
+    # First valid bar at or after each row, and running counts/sums for O(1) window lookups
+    next_valid = np.minimum.accumulate(np.where(valid, rows, n_rows)[::-1], axis=0)[::-1]
+    valid_count = np.vstack([np.zeros((1, n_cols)), np.cumsum(valid, axis=0)])
+    volume_sum = np.vstack([np.zeros((1, n_cols)), np.cumsum(np.where(valid, np.nan_to_num(volume), 0.0), axis=0)])
+    upto = np.arange(n_rows) + 1
+
+    def window_start(days: int) -> np.ndarray:
+        # Index of the first bar dated on or after date - days, per date
+        return np.searchsorted(dates.values, (dates - timedelta(days=days)).values, 'left')
+
+    def window_change(days: int, fallback_to_all: bool = False):
+        lo = np.broadcast_to(window_start(days)[:, None], (n_rows, n_cols))
+        count = valid_count[upto] - valid_count[lo, cols]
+        if fallback_to_all:
+            lo = np.where(count > 0, lo, 0)
+            count = valid_count[upto] - valid_count[lo, cols]
+        first = next_valid[np.minimum(lo, n_rows - 1), cols]
+        start_price = close[np.minimum(first, n_rows - 1), cols]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change = np.where(count > 1, (current_price - start_price) / start_price * 100, 0.0)
+        return change, lo, count
+
+    week_change, _, _ = window_change(WEEK_WINDOW_DAYS)
+    month_change, month_lo, month_count = window_change(MONTH_WINDOW_DAYS, fallback_to_all=True)
+    avg_volume = (volume_sum[upto] - volume_sum[month_lo, cols]) / np.maximum(month_count, 1)
+
+    # Rolling 52-week extremes over a calendar window, falling back to all history when empty
+    def year_extreme(values: np.ndarray, op: str) -> np.ndarray:
+        frame = pd.DataFrame(np.where(valid, values, np.nan), index=dates)
+        rolling = getattr(frame.rolling(f'{YEAR_WINDOW_DAYS}D', closed='both'), op)().to_numpy()
+        expanding = getattr(frame.expanding(), op)().to_numpy()
+        return np.where(np.isnan(rolling), expanding, rolling)
+
+    columns = {
+        'current_price': current_price,
+        'previous_close': previous_close,
+        'open_price': open_[last_idx, cols],
+        'day_high': high[last_idx, cols],
+        'day_low': low[last_idx, cols],
+        'volume': volume[last_idx, cols],
+        'avg_volume': avg_volume,
+        'week_change': week_change,
+        'month_change': month_change,
+        '52_week_high': year_extreme(high, 'max'),
+        '52_week_low': year_extreme(low, 'min'),
+        'bars': valid_count[upto]
+    }
+
+    keep = slice(None) if start is None else slice(int(np.searchsorted(dates.values, np.datetime64(pd.Timestamp(start)), 'left')), None)
+    no_data = ~has_data[keep]
+    table = {}
+    for name, values in columns.items():
+        values = np.array(values[keep], dtype=float)
+        if name != 'bars':
+            # Dates before a symbol's first bar stay NaN, as in compute_metrics
+            values[no_data] = np.nan
+        table[name] = values.ravel()
+
+    index = pd.MultiIndex.from_product([dates[keep], symbols], names=index_names)
+    return pd.DataFrame(table, index=index)
+
+
+def key_factor_flags(table: pd.DataFrame) -> pd.DataFrame:
+    def column(name: str) -> np.ndarray:
+        # Missing indicators stay NaN, so their flags are off rather than triggered by a zero
+        default = np.nan if name in INDICATOR_COLUMNS else FUNDAMENTAL_DEFAULTS.get(name, 0.0)
+        if name in table:
+            return pd.to_numeric(table[name], errors='coerce').fillna(default).to_numpy(dtype=float)
+        return np.full(len(table), default)
+
+    week_change = column('week_change')
+    pe_ratio = column('pe_ratio')
+    price = column('current_price')
+    high = column('52_week_high')
+    low = column('52_week_low')
+    near_high = price >= high * NEAR_52_WEEK_HIGH_RATIO
+    rsi = column('rsi_14')
+
+    return pd.DataFrame({
+        'strong_momentum': week_change > MOMENTUM_THRESHOLD,
+        'weak_momentum': week_change < -MOMENTUM_THRESHOLD,
+        'attractive_pe': (pe_ratio > 0) & (pe_ratio < LOW_PE_THRESHOLD),
+        'high_pe': pe_ratio > HIGH_PE_THRESHOLD,
+        'high_volume': column('volume') > column('avg_volume') * VOLUME_SURGE_RATIO,
+        'dividend': column('dividend_yield') > DIVIDEND_YIELD_THRESHOLD,
+        'near_52_week_high': near_high,
+        'near_52_week_low': ~near_high & (price <= low * NEAR_52_WEEK_LOW_RATIO),
+        'overbought': rsi > RSI_OVERBOUGHT,
+        'oversold': rsi < RSI_OVERSOLD,
+        'above_upper_band': price > column('bb_upper'),
+        'below_lower_band': price < column('bb_lower')
+    }, index=table.index)
+
+
+def key_factor_scores(flags: pd.DataFrame, weights: Optional[Dict[str, float]] = None) -> pd.Series:
+    # Weighted sum of the flags; shared by the rule-based backtest strategy and pre-screening
+    weights = {**FACTOR_WEIGHTS, **(weights or {})}
+    vector = np.array([weights[name] for name in FLAG_COLUMNS])
+    return pd.Series(flags[FLAG_COLUMNS].to_numpy(dtype=float) @ vector, index=flags.index, name='score')
+
+
+def key_factor_labels(table: pd.DataFrame, flags: Optional[pd.DataFrame] = None) -> List[List[str]]:
+    flags = key_factor_flags(table) if flags is None else flags
+    dividend_yield = pd.to_numeric(table.get('dividend_yield', 0.0), errors='coerce')
+
+    labels = {
+        'strong_momentum': "Strong weekly momentum",
+        'weak_momentum': "Weak weekly performance",
+        'attractive_pe': "Attractive P/E ratio",
+        'high_pe': "High P/E ratio",
+        'high_volume': "High trading volume",
+        'near_52_week_high': "Near 52-week high",
+        'near_52_week_low': "Near 52-week low",
+        'overbought': f"Overbought (RSI above {RSI_OVERBOUGHT})",
+        'oversold': f"Oversold (RSI below {RSI_OVERSOLD})",
+        'above_upper_band': "Above upper Bollinger band",
+        'below_lower_band': "Below lower Bollinger band"
+    }
+    dividend_labels = [f"Dividend yield: {value * 100:.2f}%" for value in np.broadcast_to(dividend_yield, len(table))]
+
+    # Same order as OpenAIStockAnalyzer._extract_key_factors
+    columns = [np.where(flags[name].to_numpy(), labels[name], '') for name in FLAG_COLUMNS[:5]]
+    columns.append(np.where(flags['dividend'].to_numpy(), dividend_labels, ''))
+    columns += [np.where(flags[name].to_numpy(), labels[name], '') for name in FLAG_COLUMNS[6:]]
+
+    return [[label for label in row if label] for row in zip(*columns)] if len(table) else []
+
+
+def compute_metrics_table(panel: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                          fundamentals: Optional[Union[pd.DataFrame, Dict[str, Dict[str, Any]]]] = None,
+                          as_of: Optional[datetime] = None, with_labels: bool = False) -> pd.DataFrame:
+    if isinstance(panel, dict):
+        panel = panel_from_frames(panel)
+
+    table = compute_metrics(panel, as_of=as_of).join(compute_indicators(panel))
+
+    if fundamentals is not None:
+        if isinstance(fundamentals, dict):
+            fundamentals = pd.DataFrame.from_dict(fundamentals, orient='index')
+        table = table.join(fundamentals.reindex(table.index))
+
+    flags = key_factor_flags(table)
+    table = table.join(flags)
+    if with_labels:
+        table['key_factors'] = key_factor_labels(table, flags)
+
+    return table
@@ -1,52 +1,522 @@
-from openai import OpenAI
-from typing import Dict, Any
+from typing import Dict, Any, Optional, List, Tuple, Callable, Iterator
 import json
+import threading
+import time
+from .cache import ResponseCache
+from .http_session import SessionManager, default_session_manager
+from .instrumentation import MetricsRegistry, default_registry
+from .request_scheduler import RequestScheduler
+from .thresholds import (
+    MOMENTUM_THRESHOLD, LOW_PE_THRESHOLD, HIGH_PE_THRESHOLD, VOLUME_SURGE_RATIO,
+    DIVIDEND_YIELD_THRESHOLD, NEAR_52_WEEK_HIGH_RATIO, NEAR_52_WEEK_LOW_RATIO,
+    RSI_OVERBOUGHT, RSI_OVERSOLD
+)
+
+
+SYSTEM_PROMPT = "You are an expert stock analyst. Provide detailed investment recommendations based on stock data. Always provide a clear BUY, HOLD, or SELL recommendation with detailed reasoning."
+
+BATCH_SYSTEM_PROMPT = "You are an expert stock analyst. For every stock you are given, provide a clear BUY, HOLD, or SELL recommendation with brief reasoning. Respond only with JSON."
+
+SECTOR_SYSTEM_PROMPT = "You are an expert equity strategist. Assess the sector as a whole from its aggregate statistics and constituents, and give a clear BUY, HOLD, or SELL view on the sector with brief reasoning."
+
+RECOMMENDATIONS = ('BUY', 'HOLD', 'SELL')
+CONFIDENCE_LEVELS = ('HIGH', 'MEDIUM', 'LOW')
+
+# Streamed responses only report token usage when asked to, on one extra final chunk
+STREAM_OPTIONS = {'stream': True, 'stream_options': {'include_usage': True}}
+
+ANALYSIS_FUNCTION = {
+    "name": "submit_stock_analysis",
+    "description": "Submit the investment recommendation for the analyzed stock.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "recommendation": {"type": "string", "enum": list(RECOMMENDATIONS)},
+            "confidence": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+            "reasons": {"type": "array", "items": {"type": "string"}, "description": "Key reasons supporting the recommendation"},
+            "risks": {"type": "array", "items": {"type": "string"}, "description": "Risk factors to consider"},
+            "price_targets": {
+                "type": "object",
+                "properties": {
+                    "entry": {"type": ["number", "null"]},
+                    "target": {"type": ["number", "null"]},
+                    "stop_loss": {"type": ["number", "null"]}
+                }
+            },
+            "summary": {"type": "string", "description": "Optional prose summary of the analysis"}
+        },
+        "required": ["recommendation", "confidence", "reasons", "risks"]
+    }
+}
 
 
 class OpenAIStockAnalyzer:
-    def __init__(self, api_key: str):
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str, response_cache: Optional[ResponseCache] = None, structured: bool = False,
+                 include_summary: bool = False, scheduler: Optional[RequestScheduler] = None,
+                 session_manager: Optional[SessionManager] = None, metrics: Optional[MetricsRegistry] = None):
+        self.api_key = api_key
+        self._client = None
+        self._client_lock = threading.Lock()
+        self.scheduler = scheduler
+        # Analyzers share one httpx pool, so a new client doesn't mean a new TLS handshake
+        self.session_manager = session_manager or default_session_manager()
+        # Prompt and completion timings, token usage and response cache counters
+        self.metrics = metrics or default_registry()
         self.name = "OpenAI Stock Analyzer"
+        self.model = "gpt-3.5-turbo"
+        self.temperature = 0.7
+        self.max_tokens = 800
+        self.response_cache = response_cache
+        self.structured = structured
+        self.include_summary = include_summary
+        # A few JSON fields need far fewer tokens than a free-form report
+        self.structured_max_tokens = 400 if include_summary else 250
+        
+    @property
+    def client(self):
+        # Importing the SDK and building its HTTP client costs more than the rest of startup,
+        # so it happens on the first request instead of at construction
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    # The scheduler owns retries when present, so the SDK's own retry loop is turned off
+                    options = {'max_retries': 0} if self.scheduler is not None else {}
+                    self._client = OpenAI(api_key=self.api_key, http_client=self.session_manager.httpx_client, **options)
+        return self._client
+    
+    @client.setter
+    def client(self, client):
+        self._client = client
+        
+    def analyze_stock(self, stock_data: Dict[str, Any], use_cache: bool = True,
+                      refresh: bool = False, structured: Optional[bool] = None) -> Dict[str, Any]:
+        if structured if structured is not None else self.structured:
+            result = self._analyze_structured(stock_data, use_cache, refresh)
+            if result is not None:
+                return result
         
-    def analyze_stock(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
         try:
-            prompt = self._create_analysis_prompt(stock_data)
+            prompt = self._analysis_prompt(stock_data)
             
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are an expert stock analyst. Provide detailed investment recommendations based on stock data. Always provide a clear BUY, HOLD, or SELL recommendation with detailed reasoning."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=800
-            )
+            analysis, cached = self._complete(SYSTEM_PROMPT, prompt, use_cache=use_cache, refresh=refresh)
             
-            analysis = response.choices[0].message.content
+            return self._prose_result(stock_data, analysis, cached)
             
-            recommendation = "HOLD"
-            if "BUY" in analysis.upper() and "SELL" not in analysis.upper()[:50]:
-                recommendation = "BUY"
-            elif "SELL" in analysis.upper() and "BUY" not in analysis.upper()[:50]:
-                recommendation = "SELL"
+        except Exception as e:
+            return self._error_result(e)
+    
+    def analyze_stock_stream(self, stock_data: Dict[str, Any], use_cache: bool = True,
+                             refresh: bool = False) -> Iterator[Dict[str, Any]]:
+        started = time.perf_counter()
+        first_token_at = None
+        
+        try:
+            prompt = self._analysis_prompt(stock_data)
+            cache_key, analysis = self._cached_response(SYSTEM_PROMPT, prompt, use_cache, refresh)
             
-            return {
-                'success': True,
-                'recommendation': recommendation,
-                'analysis': analysis,
-                'confidence': self._extract_confidence(analysis),
-                'key_factors': self._extract_key_factors(stock_data)
-            }
+            cached = analysis is not None
+            if cached:
+                first_token_at = time.perf_counter()
+                yield {'type': 'token', 'content': analysis}
+            else:
+                stream = self._call(
+                    self.client.chat.completions.create,
+                    **self._request_options(SYSTEM_PROMPT, prompt, **STREAM_OPTIONS)
+                )
+                
+                chunks = []
+                for chunk in stream:
+                    # Usage arrives on a final chunk with no choices
+                    self._record_usage(chunk, 'stream')
+                    token = self._stream_token(chunk)
+                    if not token:
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks.append(token)
+                    yield {'type': 'token', 'content': token}
+                
+                analysis = ''.join(chunks)
+                self._store_response(cache_key, analysis, validate=bool)
             
+            finished = time.perf_counter()
+            result = self._prose_result(stock_data, analysis, cached)
+        
+        except Exception as e:
+            finished = time.perf_counter()
+            result = self._error_result(e)
+        
+        result['timing'] = self._timing(started, first_token_at, finished)
+        self._record_stream_timing(result)
+        yield {'type': 'result', 'result': result}
+    
+    def _analyze_structured(self, stock_data: Dict[str, Any], use_cache: bool,
+                            refresh: bool) -> Optional[Dict[str, Any]]:
+        try:
+            content, cached = self._complete(**self._structured_request(stock_data), use_cache=use_cache, refresh=refresh)
+        except Exception as e:
+            return self._error_result(e)
+        
+        parsed = self._parse_structured_response(content)
+        if parsed is None:
+            # Malformed arguments: let the caller fall back to the free-form report
+            return None
+        
+        return self._structured_result(stock_data, parsed, cached)
+    
+    def _parse_structured_response(self, content: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = json.loads(content)
+        except (TypeError, ValueError):
+            return None
+        
+        if not isinstance(payload, dict):
+            return None
+        
+        recommendation = str(payload.get('recommendation', '')).upper()
+        confidence = str(payload.get('confidence', '')).upper()
+        if recommendation not in RECOMMENDATIONS or confidence not in CONFIDENCE_LEVELS:
+            return None
+        
+        price_targets = payload.get('price_targets') if isinstance(payload.get('price_targets'), dict) else {}
+        as_list = lambda value: [str(item) for item in value] if isinstance(value, list) else []
+        
+        return {
+            'recommendation': recommendation,
+            'confidence': confidence,
+            'reasons': as_list(payload.get('reasons')),
+            'risks': as_list(payload.get('risks')),
+            'price_targets': {key: price_targets.get(key) for key in ('entry', 'target', 'stop_loss')},
+            'summary': payload.get('summary') if isinstance(payload.get('summary'), str) else ''
+        }
+    
+    def _format_structured_analysis(self, parsed: Dict[str, Any]) -> str:
+        analysis = f"{parsed['recommendation']} ({parsed['confidence']} confidence)."
+        if parsed['reasons']:
+            analysis += " Reasons: " + "; ".join(parsed['reasons']) + "."
+        if parsed['risks']:
+            analysis += " Risks: " + "; ".join(parsed['risks']) + "."
+        targets = {key: value for key, value in parsed['price_targets'].items() if value is not None}
+        if targets:
+            analysis += " Price targets: " + ", ".join(f"{key.replace('_', ' ')} ${value}" for key, value in targets.items()) + "."
+        return analysis
+    
+    def analyze_stocks_batch(self, stock_data_list: List[Dict[str, Any]], batch_size: int = 10,
+                             use_cache: bool = True, refresh: bool = False) -> List[Dict[str, Any]]:
+        results = []
+        for chunk in self._chunks(stock_data_list, batch_size):
+            results.extend(self._analyze_chunk(chunk, use_cache, refresh))
+        return results
+    
+    def analyze_sector(self, sector: str, stats: Dict[str, Any], members: List[Dict[str, Any]],
+                       use_cache: bool = True, refresh: bool = False) -> Dict[str, Any]:
+        # One completion for the whole sector; members are rows of a metrics table
+        try:
+            analysis, cached = self._complete(**self._sector_request(sector, stats, members),
+                                              use_cache=use_cache, refresh=refresh)
+            return self._sector_result(sector, analysis, cached)
         except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'recommendation': 'ERROR',
-                'analysis': f'Failed to analyze stock: {str(e)}'
+            return {**self._error_result(e), 'sector': sector}
+    
+    def _analyze_chunk(self, chunk: List[Dict[str, Any]], use_cache: bool, refresh: bool) -> List[Dict[str, Any]]:
+        symbols = [stock_data['data']['symbol'] for stock_data in chunk]
+        
+        try:
+            content, cached = self._complete(**self._batch_request(chunk, symbols), use_cache=use_cache, refresh=refresh)
+        except Exception as e:
+            return [self._error_result(e) for _ in chunk]
+        
+        parsed = self._parse_batch_response(content, symbols)
+        
+        results = []
+        for stock_data, symbol in zip(chunk, symbols):
+            entry = parsed.get(symbol)
+            if entry is None:
+                # Fall back to a single-symbol request when the batch reply is unusable
+                results.append(self.analyze_stock(stock_data, use_cache=use_cache, refresh=refresh))
+                continue
+            
+            results.append(self._batch_result(stock_data, entry, cached))
+        
+        return results
+    
+    def _create_batch_prompt(self, chunk: List[Dict[str, Any]]) -> str:
+        lines = []
+        for stock_data in chunk:
+            data = stock_data['data']
+            lines.append(
+                f"{data['symbol']} | {data['company_name']} | {data['sector']}/{data['industry']} | "
+                f"price {data['current_price']} prev {data['previous_close']} | "
+                f"wk {data['week_change']}% mo {data['month_change']}% | "
+                f"52w {data['52_week_low']}-{data['52_week_high']} | "
+                f"PE {data['pe_ratio']} fPE {data['forward_pe']} EPS {data['earnings_per_share']} | "
+                f"vol {data['volume']} avg {data['avg_volume']} | mcap {data['market_cap']} | "
+                f"beta {data['beta']} div {data['dividend_yield']} | "
+                f"analyst {data['recommendation']} ({data['analyst_rating']}) | "
+                f"RSI {self._indicator(data, 'rsi_14')} MACD {self._indicator(data, 'macd')}/"
+                f"{self._indicator(data, 'macd_signal')} ATR {self._indicator(data, 'atr_14')}"
+            )
+        
+        return (
+            "Analyze each stock below and give an investment recommendation.\n"
+            "Fields: symbol | name | sector/industry | price prev | week% month% | 52w range | "
+            "P/E forwardP/E EPS | volume avgVolume | market cap | beta dividendYield | analyst rating | "
+            "RSI(14) MACD/signal ATR(14)\n\n"
+            + "\n".join(lines)
+            + "\n\nReturn a JSON object of the form "
+            '{"results": [{"symbol": "...", "recommendation": "BUY|HOLD|SELL", '
+            '"confidence": "HIGH|MEDIUM|LOW", "analysis": "2-3 sentences with key reasons and risks"}]} '
+            "with exactly one entry per symbol."
+        )
+    
+    def _create_sector_prompt(self, sector: str, stats: Dict[str, Any], members: List[Dict[str, Any]]) -> str:
+        def number(value: Any) -> Any:
+            if value is None or value != value:
+                return 'n/a'
+            value = round(float(value), 2)
+            return int(value) if value.is_integer() else value
+        
+        summary = ', '.join(
+            f"{name} {value if isinstance(value, str) else number(value)}" for name, value in stats.items()
+        )
+        lines = [
+            f"{member['symbol']} | price {number(member.get('current_price'))} | "
+            f"wk {number(member.get('week_change'))}% mo {number(member.get('month_change'))}% | "
+            f"PE {number(member.get('pe_ratio'))} | 52w {number(member.get('52_week_low'))}-{number(member.get('52_week_high'))}"
+            for member in members
+        ]
+        
+        return (
+            f"Give an outlook for the {sector} sector.\n"
+            f"Sector statistics: {summary}\n\n"
+            "Constituents (symbol | price | week% month% | P/E | 52w range):\n"
+            + "\n".join(lines)
+            + "\n\nStart with the BUY, HOLD, or SELL view on the sector, then explain it in 3-5 sentences, "
+            "naming the leaders, the laggards and the main risks."
+        )
+    
+    def _parse_batch_response(self, content: str, symbols: List[str]) -> Dict[str, Dict[str, str]]:
+        try:
+            payload = json.loads(content)
+        except (TypeError, ValueError):
+            return {}
+        
+        entries = payload.get('results', []) if isinstance(payload, dict) else payload
+        if not isinstance(entries, list):
+            return {}
+        
+        parsed = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            symbol = str(entry.get('symbol', '')).upper()
+            recommendation = str(entry.get('recommendation', '')).upper()
+            analysis = entry.get('analysis')
+            if symbol not in symbols or recommendation not in RECOMMENDATIONS or not isinstance(analysis, str):
+                continue
+            confidence = str(entry.get('confidence', '')).upper()
+            parsed[symbol] = {
+                'recommendation': recommendation,
+                'confidence': confidence if confidence in CONFIDENCE_LEVELS else self._extract_confidence(analysis),
+                'analysis': analysis
             }
+        
+        return parsed
+    
+    def _complete(self, system_prompt: str, prompt: str, use_cache: bool = True, refresh: bool = False,
+                  max_tokens: Optional[int] = None, validate: Optional[Callable[[str], bool]] = None,
+                  kind: str = 'prose', **options) -> Tuple[str, bool]:
+        cache_key, content = self._cached_response(system_prompt, prompt, use_cache, refresh, max_tokens, **options)
+        if content is not None:
+            return content, True
+        
+        with self.metrics.span('openai.completion', kind=kind):
+            response = self._call(
+                self.client.chat.completions.create,
+                **self._request_options(system_prompt, prompt, max_tokens, **options)
+            )
+        self._record_usage(response, kind)
+        
+        content = self._response_content(response)
+        self._store_response(cache_key, content, validate)
+        
+        return content, False
+    
+    def _call(self, fn, *args, **kwargs):
+        if self.scheduler is None:
+            return fn(*args, **kwargs)
+        return self.scheduler.call('openai', fn, *args, **kwargs)
+    
+    # Request building and result shaping below carry no I/O, so the async analyzer reuses them
+    
+    def _cached_response(self, system_prompt: str, prompt: str, use_cache: bool, refresh: bool,
+                         max_tokens: Optional[int] = None, **options) -> Tuple[Optional[str], Optional[str]]:
+        if self.response_cache is None or not use_cache:
+            return None, None
+        
+        # The same max_tokens _request_options sends, so streamed and plain prose share entries
+        cache_key = ResponseCache.make_key(self.model, self.temperature, system_prompt, prompt,
+                                           max_tokens or self.max_tokens, options)
+        # refresh skips the lookup but still stores the new response
+        if refresh:
+            return cache_key, None
+        
+        content = self.response_cache.get(cache_key)
+        self.metrics.increment('cache.hits' if content is not None else 'cache.misses', cache='responses')
+        return cache_key, content
+    
+    def _store_response(self, cache_key: Optional[str], content: Optional[str],
+                        validate: Optional[Callable[[str], bool]] = None):
+        if cache_key is not None and (validate is None or validate(content)):
+            self.response_cache.set(cache_key, content)
+    
+    def _request_options(self, system_prompt: str, prompt: str, max_tokens: Optional[int] = None,
+                         **options) -> Dict[str, Any]:
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': self.temperature,
+            'max_tokens': max_tokens or self.max_tokens,
+            **options
+        }
+    
+    def _analysis_prompt(self, stock_data: Dict[str, Any], structured: bool = False) -> str:
+        with self.metrics.span('openai.prompt', kind='structured' if structured else 'prose'):
+            return self._create_analysis_prompt(stock_data, structured=structured)
+    
+    def _structured_request(self, stock_data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'system_prompt': SYSTEM_PROMPT,
+            'prompt': self._analysis_prompt(stock_data, structured=True),
+            'kind': 'structured',
+            'max_tokens': self.structured_max_tokens,
+            'tools': [{"type": "function", "function": ANALYSIS_FUNCTION}],
+            'tool_choice': {"type": "function", "function": {"name": ANALYSIS_FUNCTION['name']}},
+            'validate': lambda text: self._parse_structured_response(text) is not None
+        }
     
-    def _create_analysis_prompt(self, stock_data: Dict[str, Any]) -> str:
+    def _batch_request(self, chunk: List[Dict[str, Any]], symbols: List[str]) -> Dict[str, Any]:
+        with self.metrics.span('openai.prompt', kind='batch'):
+            prompt = self._create_batch_prompt(chunk)
+        
+        return {
+            'system_prompt': BATCH_SYSTEM_PROMPT,
+            'prompt': prompt,
+            'kind': 'batch',
+            'max_tokens': min(4096, 100 + 150 * len(chunk)),
+            'response_format': {"type": "json_object"},
+            # Only cache responses that cover every symbol in the batch
+            'validate': lambda text: len(self._parse_batch_response(text, symbols)) == len(symbols)
+        }
+    
+    def _sector_request(self, sector: str, stats: Dict[str, Any], members: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self.metrics.span('openai.prompt', kind='sector'):
+            prompt = self._create_sector_prompt(sector, stats, members)
+        
+        return {
+            'system_prompt': SECTOR_SYSTEM_PROMPT,
+            'prompt': prompt,
+            'kind': 'sector',
+            'max_tokens': 400,
+            'validate': bool
+        }
+    
+    def _record_usage(self, response, kind: str):
+        usage = getattr(response, 'usage', None)
+        if usage is None:
+            return
+        self.metrics.increment('openai.prompt_tokens', usage.prompt_tokens or 0, model=self.model, kind=kind)
+        self.metrics.increment('openai.completion_tokens', usage.completion_tokens or 0, model=self.model, kind=kind)
+    
+    def _record_stream_timing(self, result: Dict[str, Any]):
+        if result.get('cached'):
+            return
+        timing = result['timing']
+        status = 'ok' if result['success'] else 'error'
+        self.metrics.observe('openai.completion', timing['total_latency'], kind='stream', status=status)
+        if timing['time_to_first_token'] is not None:
+            self.metrics.observe('openai.time_to_first_token', timing['time_to_first_token'])
+    
+    @staticmethod
+    def _response_content(response) -> str:
+        message = response.choices[0].message
+        # Function calling returns the payload as tool call arguments
+        return message.tool_calls[0].function.arguments if message.tool_calls else message.content
+    
+    @staticmethod
+    def _stream_token(chunk) -> Optional[str]:
+        return chunk.choices[0].delta.content if chunk.choices else None
+    
+    @staticmethod
+    def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+        size = max(1, size)
+        for start in range(0, len(items), size):
+            yield items[start:start + size]
+    
+    @staticmethod
+    def _timing(started: float, first_token_at: Optional[float], finished: float) -> Dict[str, Optional[float]]:
+        return {
+            'time_to_first_token': round(first_token_at - started, 4) if first_token_at is not None else None,
+            'total_latency': round(finished - started, 4)
+        }
+    
+    def _prose_result(self, stock_data: Dict[str, Any], analysis: str, cached: bool) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'recommendation': self._extract_recommendation(analysis),
+            'analysis': analysis,
+            'confidence': self._extract_confidence(analysis),
+            'key_factors': self._extract_key_factors(stock_data),
+            'cached': cached
+        }
+    
+    def _structured_result(self, stock_data: Dict[str, Any], parsed: Dict[str, Any], cached: bool) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'recommendation': parsed['recommendation'],
+            'analysis': parsed['summary'] or self._format_structured_analysis(parsed),
+            'confidence': parsed['confidence'],
+            'key_factors': self._extract_key_factors(stock_data),
+            'reasons': parsed['reasons'],
+            'risks': parsed['risks'],
+            'price_targets': parsed['price_targets'],
+            'cached': cached
+        }
+    
+    def _batch_result(self, stock_data: Dict[str, Any], entry: Dict[str, str], cached: bool) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'recommendation': entry['recommendation'],
+            'analysis': entry['analysis'],
+            'confidence': entry['confidence'],
+            'key_factors': self._extract_key_factors(stock_data),
+            'cached': cached,
+            'batched': True
+        }
+    
+    def _sector_result(self, sector: str, analysis: str, cached: bool) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'sector': sector,
+            'recommendation': self._extract_recommendation(analysis),
+            'analysis': analysis,
+            'confidence': self._extract_confidence(analysis),
+            'cached': cached
+        }
+    
+    def _error_result(self, error: Exception) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'error': str(error),
+            'recommendation': 'ERROR',
+            'analysis': f'Failed to analyze stock: {str(error)}'
+        }
+    
+    def _create_analysis_prompt(self, stock_data: Dict[str, Any], structured: bool = False) -> str:
         data = stock_data['data']
         
         prompt = f"""
@@ -76,7 +546,30 @@ class OpenAIStockAnalyzer:
         - Sector: {data['sector']}
         - Industry: {data['industry']}
         - Current Analyst Rating: {data['recommendation']} (Score: {data['analyst_rating']})
+        """
         
+        # Quotes built without enough history (or saved before indicators existed) skip this section
+        if any(data.get(name) is not None for name in ('sma_20', 'rsi_14', 'macd', 'atr_14')):
+            indicator = lambda name: self._indicator(data, name)
+            prompt += f"""
+        Technical Indicators:
+        - Moving Averages: SMA 20 ${indicator('sma_20')}, SMA 50 ${indicator('sma_50')}, EMA 12 ${indicator('ema_12')}, EMA 26 ${indicator('ema_26')}
+        - RSI (14): {indicator('rsi_14')}
+        - MACD (12, 26, 9): {indicator('macd')} (Signal: {indicator('macd_signal')}, Histogram: {indicator('macd_hist')})
+        - Bollinger Bands (20, 2): ${indicator('bb_lower')} - ${indicator('bb_upper')}
+        - ATR (14): ${indicator('atr_14')}
+        - Volume Z-Score (20 days): {indicator('volume_zscore')}
+        """
+                
+        if structured:
+            summary = "Add a short prose summary." if self.include_summary else "Leave the summary out."
+            return prompt + f"""
+        Call submit_stock_analysis with a clear BUY, HOLD, or SELL recommendation, your confidence,
+        the key reasons, the main risk factors and price targets or entry/exit points if applicable.
+        Keep each reason and risk to one short sentence. {summary}
+        """
+        
+        prompt += """
         Please provide:
         1. A clear BUY, HOLD, or SELL recommendation
         2. Key reasons supporting your recommendation
@@ -89,6 +582,14 @@ class OpenAIStockAnalyzer:
         
         return prompt
     
+    def _extract_recommendation(self, analysis: str) -> str:
+        recommendation = "HOLD"
+        if "BUY" in analysis.upper() and "SELL" not in analysis.upper()[:50]:
+            recommendation = "BUY"
+        elif "SELL" in analysis.upper() and "BUY" not in analysis.upper()[:50]:
+            recommendation = "SELL"
+        return recommendation
+    
     def _extract_confidence(self, analysis: str) -> str:
         analysis_lower = analysis.lower()
         
@@ -103,29 +604,45 @@ class OpenAIStockAnalyzer:
         data = stock_data['data']
         factors = []
         
-        if data['week_change'] > 5:
+        if data['week_change'] > MOMENTUM_THRESHOLD:
             factors.append("Strong weekly momentum")
-        elif data['week_change'] < -5:
+        elif data['week_change'] < -MOMENTUM_THRESHOLD:
             factors.append("Weak weekly performance")
             
-        if data['pe_ratio'] > 0 and data['pe_ratio'] < 15:
+        if data['pe_ratio'] > 0 and data['pe_ratio'] < LOW_PE_THRESHOLD:
             factors.append("Attractive P/E ratio")
-        elif data['pe_ratio'] > 30:
+        elif data['pe_ratio'] > HIGH_PE_THRESHOLD:
             factors.append("High P/E ratio")
             
-        if data['volume'] > data['avg_volume'] * 1.5:
+        if data['volume'] > data['avg_volume'] * VOLUME_SURGE_RATIO:
             factors.append("High trading volume")
             
-        if data['dividend_yield'] > 0.02:
+        if data['dividend_yield'] > DIVIDEND_YIELD_THRESHOLD:
             factors.append(f"Dividend yield: {data['dividend_yield']*100:.2f}%")
             
         current_price = data['current_price']
         week_52_high = data['52_week_high']
         week_52_low = data['52_week_low']
         
-        if current_price >= week_52_high * 0.95:
+        if current_price >= week_52_high * NEAR_52_WEEK_HIGH_RATIO:
             factors.append("Near 52-week high")
-        elif current_price <= week_52_low * 1.05:
+        elif current_price <= week_52_low * NEAR_52_WEEK_LOW_RATIO:
             factors.append("Near 52-week low")
             
-        return factors
\ No newline at end of file
+        rsi = data.get('rsi_14')
+        if rsi is not None and rsi > RSI_OVERBOUGHT:
+            factors.append(f"Overbought (RSI above {RSI_OVERBOUGHT})")
+        elif rsi is not None and rsi < RSI_OVERSOLD:
+            factors.append(f"Oversold (RSI below {RSI_OVERSOLD})")
+            
+        if data.get('bb_upper') is not None and current_price > data['bb_upper']:
+            factors.append("Above upper Bollinger band")
+        elif data.get('bb_lower') is not None and current_price < data['bb_lower']:
+            factors.append("Below lower Bollinger band")
+            
+        return factors
+    
+    @staticmethod
+    def _indicator(data: Dict[str, Any], name: str) -> Any:
+        value = data.get(name)
+        return 'n/a' if value is None else value
\ No newline at end of file
@@ -0,0 +1,67 @@
+from typing import Dict, Any, Optional, List
+import numpy as np
+import pandas as pd
+from .metrics_engine import FLAG_COLUMNS, key_factor_flags, key_factor_scores, key_factor_labels
+
+
+class PreScreen:
+    def __init__(self, top_k: Optional[int] = None, min_score: float = 1.0,
+                 weights: Optional[Dict[str, float]] = None,
+                 buy_threshold: float = 1.0, sell_threshold: float = -1.0):
+        # A symbol goes to the LLM when the absolute weighted key factor score reaches
+        # min_score; top_k additionally caps how many of those are sent, strongest first
+        self.top_k = top_k
+        self.min_score = min_score
+        self.weights = weights
+        # Recommendation given to the symbols that are screened out
+        self.buy_threshold = buy_threshold
+        self.sell_threshold = sell_threshold
+
+    def screen(self, stock_data_list: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        # One entry per input: None for symbols that should be analyzed by the LLM (or that
+        # failed to fetch), otherwise a rule-only analysis in the analyzer's result shape
+        analyses = [None] * len(stock_data_list)
+        positions = [i for i, stock_data in enumerate(stock_data_list) if stock_data['success']]
+        if not positions:
+            return analyses
+
+        table = pd.DataFrame([stock_data_list[i]['data'] for i in positions])
+        flags = key_factor_flags(table)
+        scores = key_factor_scores(flags, self.weights).to_numpy()
+        active = flags[FLAG_COLUMNS].to_numpy().sum(axis=1)
+
+        selected = np.abs(scores) >= self.min_score
+        if self.top_k is not None:
+            # Strongest signals first; more active flags break ties
+            order = np.lexsort((-active, -np.abs(scores)))
+            ranked = order[selected[order]][:max(0, self.top_k)]
+            selected = np.zeros(len(positions), dtype=bool)
+            selected[ranked] = True
+
+        skipped = np.flatnonzero(~selected)
+        if len(skipped):
+            labels = key_factor_labels(table.iloc[skipped], flags.iloc[skipped])
+            for row, key_factors in zip(skipped, labels):
+                analyses[positions[row]] = self._rule_result(float(scores[row]), key_factors)
+
+        return analyses
+
+    def _rule_result(self, score: float, key_factors: List[str]) -> Dict[str, Any]:
+        if score >= self.buy_threshold:
+            recommendation = "BUY"
+        elif score <= self.sell_threshold:
+            recommendation = "SELL"
+        else:
+            recommendation = "HOLD"
+
+        factors = ", ".join(key_factors) if key_factors else "no key factors"
+        return {
+            'success': True,
+            'recommendation': recommendation,
+            'confidence': "LOW",
+            'analysis': f"Pre-screened without AI analysis: rule-based score {score:+.1f} ({factors}) "
+                        f"did not rank among the symbols sent for full analysis.",
+            'key_factors': key_factors,
+            'prescreened': True,
+            'prescreen_score': round(score, 2)
+        }
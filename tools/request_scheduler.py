@@ -0,0 +1,248 @@
+from typing import Dict, Any, Optional, Callable, Awaitable
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import asyncio
+import random
+import threading
+import time
+
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# Transport failures from requests/httpx/openai, matched by name to avoid importing each SDK here
+RETRYABLE_ERROR_NAMES = {
+    'ConnectionError', 'Timeout', 'ConnectTimeout', 'ReadTimeout', 'ChunkedEncodingError',
+    'APIConnectionError', 'APITimeoutError', 'ConnectError', 'ReadError', 'RemoteProtocolError'
+}
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit is open after repeated failures; retry in {retry_in:.1f}s")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        # Reserve a token now and return how long to wait for it, so waiters queue fairly
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Let one probe request through; everyone else is rejected until its outcome
+                # closes or reopens the circuit
+                self.state = 'half_open'
+                return True
+            return self.state == 'closed'
+
+    def retry_in(self) -> float:
+        return max(0.0, self.reset_timeout - (time.monotonic() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = 'closed'
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+    def release(self):
+        # A probe that ended without an outcome (e.g. cancelled) hands the probe to the next caller
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'open'
+
+
+class ProviderPolicy:
+    def __init__(self, rate: float = 5, burst: float = 10, max_retries: int = 3, base_delay: float = 0.5,
+                 max_delay: float = 30, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+
+DEFAULT_POLICIES = {
+    'yahoo': ProviderPolicy(rate=2, burst=5),
+    'openai': ProviderPolicy(rate=5, burst=10)
+}
+
+
+class RequestScheduler:
+    def __init__(self, policies: Optional[Dict[str, ProviderPolicy]] = None,
+                 sleep: Callable[[float], None] = time.sleep):
+        self._providers = {}
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        for name, policy in {**DEFAULT_POLICIES, **(policies or {})}.items():
+            self.register(name, policy)
+
+    def register(self, provider: str, policy: ProviderPolicy):
+        with self._lock:
+            self._providers[provider] = {
+                'policy': policy,
+                'bucket': TokenBucket(policy.rate, policy.burst),
+                'breaker': CircuitBreaker(policy.failure_threshold, policy.reset_timeout),
+                'stats': {'calls': 0, 'retries': 0, 'failures': 0, 'rejected': 0, 'throttled_seconds': 0.0}
+            }
+
+    def call(self, provider: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        policy, bucket, breaker, stats = self._state(provider)
+
+        attempt = 0
+        while True:
+            self._admit(provider, breaker, stats)
+            self._count(stats, 'throttled_seconds', bucket.acquire())
+            self._count(stats, 'calls')
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                self._sleep(self._retry_delay(policy, breaker, stats, e, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            breaker.record_success()
+            return result
+
+    async def call_async(self, provider: str, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        # Same policy as call(), but waits with asyncio.sleep so the event loop keeps running
+        policy, bucket, breaker, stats = self._state(provider)
+
+        attempt = 0
+        while True:
+            self._admit(provider, breaker, stats)
+            wait = bucket.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._count(stats, 'throttled_seconds', wait)
+            self._count(stats, 'calls')
+            try:
+                result = await fn(*args, **kwargs)
+            except Exception as e:
+                await asyncio.sleep(self._retry_delay(policy, breaker, stats, e, attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                breaker.release()
+                raise
+
+            breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {**state['stats'], 'circuit': state['breaker'].state}
+                for name, state in self._providers.items()
+            }
+
+    def _state(self, provider: str):
+        if provider not in self._providers:
+            self.register(provider, ProviderPolicy())
+        state = self._providers[provider]
+        return state['policy'], state['bucket'], state['breaker'], state['stats']
+
+    def _admit(self, provider: str, breaker: CircuitBreaker, stats: Dict[str, Any]):
+        if not breaker.allow():
+            self._count(stats, 'rejected')
+            raise CircuitOpenError(provider, breaker.retry_in())
+
+    def _retry_delay(self, policy: ProviderPolicy, breaker: CircuitBreaker, stats: Dict[str, Any],
+                     error: Exception, attempt: int) -> float:
+        # Raises the error again when it shouldn't be retried
+        retryable = self.is_retryable(error)
+        # Only throttling and transport/server errors say the provider is degraded; any other
+        # error means it answered, which also settles a half-open probe
+        if retryable:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if not retryable or attempt >= policy.max_retries:
+            self._count(stats, 'failures')
+            raise error
+
+        delay = self.retry_after(error)
+        if delay is None:
+            # Full jitter keeps many clients from retrying in lockstep
+            delay = random.uniform(0, min(policy.max_delay, policy.base_delay * (2 ** attempt)))
+        self._count(stats, 'retries')
+        return min(delay, policy.max_delay)
+
+    def _count(self, stats: Dict[str, Any], key: str, amount: float = 1):
+        with self._lock:
+            stats[key] += amount
+
+    @staticmethod
+    def status_code(error: Exception) -> Optional[int]:
+        status = getattr(error, 'status_code', None)
+        if status is None:
+            status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status if isinstance(status, int) else None
+
+    @classmethod
+    def is_retryable(cls, error: Exception) -> bool:
+        status = cls.status_code(error)
+        if status is not None:
+            return status in RETRYABLE_STATUS_CODES
+        return isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+    @staticmethod
+    def retry_after(error: Exception) -> Optional[float]:
+        headers = getattr(getattr(error, 'response', None), 'headers', None)
+        value = headers.get('Retry-After') if headers is not None else None
+        if not value:
+            return None
+
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            # HTTP-date form
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,230 @@
+from typing import Dict, Any, List, Optional, NamedTuple, Tuple, Iterator, Union, TYPE_CHECKING
+from array import array
+import math
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class QuoteSnapshot(NamedTuple):
+    symbol: str
+    company_name: str
+    current_price: float
+    previous_close: float
+    open_price: float
+    day_high: float
+    day_low: float
+    volume: int
+    avg_volume: int
+    market_cap: Any
+    pe_ratio: Any
+    forward_pe: Any
+    dividend_yield: Any
+    week_change: float
+    month_change: float
+    week_52_high: float
+    week_52_low: float
+    earnings_per_share: Any
+    beta: Any
+    sector: str
+    industry: str
+    recommendation: str
+    analyst_rating: Any
+    # Technical indicators (tools.indicators); None when the history is too short for them
+    sma_20: Optional[float] = None
+    sma_50: Optional[float] = None
+    ema_12: Optional[float] = None
+    ema_26: Optional[float] = None
+    rsi_14: Optional[float] = None
+    macd: Optional[float] = None
+    macd_signal: Optional[float] = None
+    macd_hist: Optional[float] = None
+    bb_upper: Optional[float] = None
+    bb_lower: Optional[float] = None
+    atr_14: Optional[float] = None
+    volume_zscore: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuoteSnapshot':
+        # Quotes saved before a field existed fall back to its default
+        return cls(**{field: data[_DICT_KEYS.get(field, field)] for field in cls._fields
+                      if field not in cls._field_defaults or _DICT_KEYS.get(field, field) in data})
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Same keys and order as YahooFinanceTool.get_stock_info()['data']
+        return {_DICT_KEYS.get(field, field): value for field, value in zip(self._fields, self)}
+
+
+# Field names that aren't valid identifiers in the dict form
+_DICT_KEYS = {'week_52_high': '52_week_high', 'week_52_low': '52_week_low'}
+
+
+class AnalysisResult(NamedTuple):
+    success: bool
+    symbol: str
+    recommendation: Optional[str] = None
+    confidence: Optional[str] = None
+    analysis: Optional[str] = None
+    key_factors: Tuple[str, ...] = ()
+    quote: Optional[QuoteSnapshot] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+    reasons: Optional[Tuple[str, ...]] = None
+    risks: Optional[Tuple[str, ...]] = None
+    price_targets: Optional[Dict[str, Any]] = None
+    # Set on rule-only results from StockTradingAgent's pre-screen
+    prescreened: bool = False
+    prescreen_score: Optional[float] = None
+
+    @property
+    def company_name(self) -> Optional[str]:
+        return self.quote.company_name if self.quote is not None else None
+
+    @property
+    def current_price(self) -> Optional[float]:
+        return self.quote.current_price if self.quote is not None else None
+
+    @classmethod
+    def from_dict(cls, result: Dict[str, Any]) -> 'AnalysisResult':
+        stock_data = result.get('stock_data')
+        optional_tuple = lambda key: tuple(result[key]) if result.get(key) is not None else None
+        return cls(
+            success=result['success'],
+            symbol=result.get('symbol', stock_data['symbol'] if stock_data else ''),
+            recommendation=result.get('recommendation'),
+            confidence=result.get('confidence'),
+            analysis=result.get('analysis'),
+            key_factors=tuple(result.get('key_factors', ())),
+            quote=QuoteSnapshot.from_dict(stock_data) if stock_data else None,
+            error=result.get('error'),
+            message=result.get('message'),
+            reasons=optional_tuple('reasons'),
+            risks=optional_tuple('risks'),
+            price_targets=result.get('price_targets'),
+            prescreened=result.get('prescreened', False),
+            prescreen_score=result.get('prescreen_score')
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Same shape as StockTradingAgent.analyze_stock()
+        if not self.success:
+            result = {'success': False, 'symbol': self.symbol, 'error': self.error, 'message': self.message}
+            if self.quote is not None:
+                result['stock_data'] = self.quote.to_dict()
+            return result
+
+        result = {
+            'success': True,
+            'symbol': self.symbol,
+            'company_name': self.company_name,
+            'current_price': self.current_price,
+            'recommendation': self.recommendation,
+            'confidence': self.confidence,
+            'analysis': self.analysis,
+            'key_factors': list(self.key_factors),
+            'stock_data': self.quote.to_dict()
+        }
+        for key in ('reasons', 'risks'):
+            if getattr(self, key) is not None:
+                result[key] = list(getattr(self, key))
+        if self.price_targets is not None:
+            result['price_targets'] = self.price_targets
+        if self.prescreened:
+            result['prescreened'] = True
+            result['prescreen_score'] = self.prescreen_score
+        return result
+
+
+# Quote fields kept as packed float arrays in ResultTable; None becomes NaN
+NUMERIC_FIELDS = [
+    'current_price', 'previous_close', 'open_price', 'day_high', 'day_low', 'volume', 'avg_volume',
+    'market_cap', 'pe_ratio', 'forward_pe', 'dividend_yield', 'week_change', 'month_change',
+    'week_52_high', 'week_52_low', 'earnings_per_share', 'beta', 'analyst_rating',
+    'sma_20', 'sma_50', 'ema_12', 'ema_26', 'rsi_14', 'macd', 'macd_signal', 'macd_hist',
+    'bb_upper', 'bb_lower', 'atr_14', 'volume_zscore'
+]
+
+TEXT_FIELDS = ['symbol', 'company_name', 'sector', 'industry', 'recommendation']
+
+
+class ResultTable:
+    __slots__ = ('_numeric', '_text', '_has_quote', '_results')
+
+    def __init__(self, results: Optional[List[Union[AnalysisResult, Dict[str, Any]]]] = None):
+        self._numeric = {field: array('d') for field in NUMERIC_FIELDS}
+        self._text = {field: [] for field in TEXT_FIELDS}
+        self._has_quote = array('b')
+        # Per-analysis fields that don't pack into arrays; the quote lives only in the columns
+        self._results = []
+        for result in results or []:
+            self.append(result)
+
+    def append(self, result: Union[AnalysisResult, Dict[str, Any]]):
+        if isinstance(result, dict):
+            result = AnalysisResult.from_dict(result)
+
+        quote = result.quote
+        for field in NUMERIC_FIELDS:
+            value = getattr(quote, field) if quote is not None else None
+            self._numeric[field].append(float(value) if isinstance(value, (int, float)) else math.nan)
+        for field in TEXT_FIELDS:
+            self._text[field].append(getattr(quote, field) if quote is not None else (result.symbol if field == 'symbol' else None))
+        self._has_quote.append(quote is not None)
+        self._results.append(result._replace(quote=None))
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __iter__(self) -> Iterator[AnalysisResult]:
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, index: int) -> AnalysisResult:
+        result = self._results[index]
+        if not self._has_quote[index]:
+            return result
+        return result._replace(quote=self._quote(index))
+
+    def column(self, name: str):
+        if name in self._numeric:
+            return self._numeric[name]
+        if name in self._text:
+            return self._text[name]
+        return [getattr(result, name) for result in self._results]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [result.to_dict() for result in self]
+
+    def to_frame(self) -> 'pd.DataFrame':
+        import numpy as np
+        import pandas as pd
+
+        frame = pd.DataFrame({
+            'symbol': self._text['symbol'],
+            'success': [result.success for result in self._results],
+            'recommendation': [result.recommendation for result in self._results],
+            'confidence': [result.confidence for result in self._results],
+            'prescreened': [result.prescreened for result in self._results],
+            'error': [result.error for result in self._results]
+        })
+        # The packed arrays are copied once, into a single float block; the frame never
+        # shares memory with the table, which keeps growing
+        numeric = pd.DataFrame(
+            np.column_stack([np.frombuffer(self._numeric[field], dtype=np.float64) for field in NUMERIC_FIELDS])
+            if len(self) else np.empty((0, len(NUMERIC_FIELDS))),
+            columns=[_DICT_KEYS.get(field, field) for field in NUMERIC_FIELDS]
+        )
+        text = pd.DataFrame({'analyst_recommendation' if field == 'recommendation' else field: self._text[field]
+                             for field in TEXT_FIELDS[1:]})
+        return pd.concat([frame, numeric, text], axis=1)
+
+    def _quote(self, index: int) -> QuoteSnapshot:
+        values = {}
+        for field in NUMERIC_FIELDS:
+            value = self._numeric[field][index]
+            values[field] = None if math.isnan(value) else value
+        for field in ('volume', 'avg_volume', 'market_cap'):
+            if values[field] is not None:
+                values[field] = int(values[field])
+        for field in TEXT_FIELDS:
+            values[field] = self._text[field][index]
+        return QuoteSnapshot(**values)
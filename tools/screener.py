@@ -0,0 +1,90 @@
+from typing import Dict, Any, List, Optional, Union, Callable, TYPE_CHECKING
+import threading
+import time
+import numpy as np
+import pandas as pd
+from .filters import SERIES_OPS, Filter
+from .metrics_engine import key_factor_scores
+from .market_data import MarketDataProvider
+
+if TYPE_CHECKING:
+    from stock_trading_agent import StockTradingAgent
+
+
+Condition = Union[str, List[Filter], Callable[[pd.DataFrame], Any]]
+
+
+class Screener:
+    def __init__(self, provider: MarketDataProvider, include_info: bool = True,
+                 max_age: Optional[float] = None):
+        self.provider = provider
+        # Fundamentals (P/E, dividend yield, sector...) cost one lookup per symbol on the
+        # first refresh; the provider's fundamentals cache serves them after that
+        self.include_info = include_info
+        # Seconds before screen() rebuilds the index on its own; None means only on refresh()
+        self.max_age = max_age
+        self.symbols = []
+        self.refreshed_at = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self) -> pd.DataFrame:
+        if self._index is None:
+            raise ValueError("Screener index is empty; call refresh(symbols) first")
+        return self._index
+
+    def refresh(self, symbols: Optional[List[str]] = None) -> pd.DataFrame:
+        # One bulk history download and one vectorized metrics pass for the whole universe
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols)) if symbols is not None else self.symbols
+        table = self.provider.get_metrics_table(symbols, include_info=self.include_info, refresh=True)
+
+        table['score'] = key_factor_scores(table)
+        table['volume_ratio'] = table['volume'] / table['avg_volume'].replace(0, np.nan)
+        table['from_52_week_high'] = (table['current_price'] / table['52_week_high'] - 1) * 100
+        # Plain identifiers so expressions don't need backticks
+        table['week_52_high'] = table['52_week_high']
+        table['week_52_low'] = table['52_week_low']
+
+        with self._lock:
+            self.symbols = symbols
+            self._index = table
+            self.refreshed_at = time.time()
+        return table
+
+    def screen(self, where: Optional[Condition] = None, sort_by: Optional[Union[str, List[str]]] = None,
+               ascending: bool = False, limit: Optional[int] = None,
+               columns: Optional[List[str]] = None) -> pd.DataFrame:
+        if self.max_age is not None and self.refreshed_at is not None and \
+                time.time() - self.refreshed_at > self.max_age:
+            self.refresh()
+
+        table = self.index
+        if where is not None:
+            table = table[self._mask(table, where)]
+        if sort_by is not None:
+            table = table.sort_values(sort_by, ascending=ascending, na_position='last')
+        if limit is not None:
+            table = table.head(limit)
+        return table[columns] if columns else table
+
+    def analyze(self, agent: 'StockTradingAgent', where: Optional[Condition] = None,
+                sort_by: Optional[Union[str, List[str]]] = None, ascending: bool = False,
+                limit: Optional[int] = None, **kwargs) -> Union[List[Dict[str, Any]], Any]:
+        # Only the symbols that pass the screen reach the LLM, in ranked order
+        survivors = self.screen(where, sort_by=sort_by, ascending=ascending, limit=limit)
+        return agent.analyze_many(list(survivors.index), **kwargs)
+
+    def _mask(self, table: pd.DataFrame, where: Condition) -> np.ndarray:
+        if isinstance(where, str):
+            # e.g. "week_change > 2 and month_change > 5" or "0 < pe_ratio < 20"
+            mask = table.eval(where)
+        elif callable(where):
+            mask = where(table)
+        else:
+            mask = pd.Series(True, index=table.index)
+            for column, op, value in where:
+                if op not in SERIES_OPS:
+                    raise ValueError(f"Unknown filter operator: {op}")
+                mask &= SERIES_OPS[op](table[column], value)
+        return np.asarray(mask, dtype=bool)
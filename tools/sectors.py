@@ -0,0 +1,108 @@
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import numpy as np
+import pandas as pd
+from .metrics_engine import key_factor_scores
+from .market_data import MarketDataProvider
+
+if TYPE_CHECKING:
+    from stock_trading_agent import StockTradingAgent
+
+
+class SectorAggregator:
+    def __init__(self, provider: MarketDataProvider, include_info: bool = False):
+        self.provider = provider
+        # P/E, dividend yield and market cap per group need the full fundamentals; sector and
+        # industry labels alone come from the provider's long-lived sectors cache
+        self.include_info = include_info
+        self.symbols = []
+        self.groups = None
+        self.refreshed_at = None
+        self._table = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self) -> pd.DataFrame:
+        if self._table is None:
+            raise ValueError("Sector table is empty; call refresh(symbols) first")
+        return self._table
+
+    def refresh(self, symbols: Optional[List[str]] = None,
+                groups: Optional[Dict[str, List[str]]] = None) -> pd.DataFrame:
+        # groups ({'Technology': ['AAPL', ...]}) labels the sector column directly instead of
+        # using the provider's classification, and supplies the symbols when none are given
+        if groups is not None:
+            groups = {name: [symbol.upper() for symbol in members] for name, members in groups.items()}
+            if symbols is None:
+                symbols = [symbol for members in groups.values() for symbol in members]
+        else:
+            groups = self.groups if symbols is None else None
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols)) if symbols is not None else self.symbols
+
+        # One bulk price download and metrics pass for every member
+        table = self.provider.get_metrics_table(symbols, include_info=self.include_info, refresh=True)
+        classification = self.provider.get_sectors(list(table.index))
+        table['sector'] = [classification[symbol]['sector'] for symbol in table.index]
+        table['industry'] = [classification[symbol]['industry'] for symbol in table.index]
+        if groups is not None:
+            labels = {symbol: name for name, members in groups.items() for symbol in reversed(members)}
+            table['sector'] = [labels.get(symbol, sector) for symbol, sector in zip(table.index, table['sector'])]
+        table['score'] = key_factor_scores(table)
+
+        with self._lock:
+            self.symbols = symbols
+            self.groups = groups
+            self._table = table
+            self.refreshed_at = time.time()
+        return table
+
+    def aggregate(self, by: str = 'sector') -> pd.DataFrame:
+        # Every statistic comes out of one groupby pass; the best and worst month pick the leader and laggard
+        table = self.table.assign(advancing=self.table['week_change'] > 0)
+        columns = {
+            'stocks': ('current_price', 'size'),
+            'avg_week_change': ('week_change', 'mean'),
+            'median_week_change': ('week_change', 'median'),
+            'avg_month_change': ('month_change', 'mean'),
+            'median_month_change': ('month_change', 'median'),
+            'advancers': ('advancing', 'sum'),
+            'avg_score': ('score', 'mean')
+        }
+        if 'pe_ratio' in table:
+            # Missing or negative earnings would drag the median toward zero
+            table['pe_ratio'] = pd.to_numeric(table['pe_ratio'], errors='coerce').where(lambda pe: pe > 0)
+            columns['median_pe'] = ('pe_ratio', 'median')
+        if 'market_cap' in table:
+            table['market_cap'] = pd.to_numeric(table['market_cap'], errors='coerce')
+            columns['market_cap'] = ('market_cap', 'sum')
+
+        grouped = table.groupby(by, sort=True)
+        stats = grouped.agg(**columns)
+        stats['breadth'] = stats['advancers'] / stats['stocks']
+        month_change = table['month_change'].fillna(-np.inf)
+        stats['leader'] = month_change.groupby(table[by]).idxmax()
+        stats['laggard'] = (-month_change).groupby(table[by]).idxmax()
+        return stats.sort_values('avg_month_change', ascending=False)
+
+    def members(self, group: str, by: str = 'sector') -> pd.DataFrame:
+        table = self.table
+        return table[table[by] == group].sort_values('month_change', ascending=False)
+
+    def summarize(self, agent: 'StockTradingAgent', by: str = 'sector', max_members: int = 20,
+                  max_concurrency: int = 4, use_cache: bool = True, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        # One LLM call per group instead of one per stock, in aggregate() order. The prompt
+        # lists at most max_members constituents: the best and the worst months of the group.
+        stats = self.aggregate(by)
+
+        def run(group: str) -> Dict[str, Any]:
+            members = self.members(group, by)
+            if len(members) > max_members:
+                members = pd.concat([members.head(max_members - max_members // 2), members.tail(max_members // 2)])
+            members = members.reset_index().to_dict('records')
+            return agent.analyzer.analyze_sector(group, stats.loc[group].to_dict(), members,
+                                                 use_cache=use_cache, refresh=refresh)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            return dict(zip(stats.index, executor.map(run, stats.index)))
@@ -0,0 +1,11 @@
+# Key factor thresholds shared by the scalar and vectorized paths. Kept free of
+# numpy/pandas so the analyzer can use them without importing the metrics engine.
+MOMENTUM_THRESHOLD = 5
+LOW_PE_THRESHOLD = 15
+HIGH_PE_THRESHOLD = 30
+VOLUME_SURGE_RATIO = 1.5
+DIVIDEND_YIELD_THRESHOLD = 0.02
+NEAR_52_WEEK_HIGH_RATIO = 0.95
+NEAR_52_WEEK_LOW_RATIO = 1.05
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
@@ -0,0 +1,237 @@
+from typing import Dict, Any, Optional, List, Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+import threading
+import time
+import pandas as pd
+from stock_trading_agent import StockTradingAgent
+from tools.indicators import seed_indicators
+from tools.metrics_engine import FLAG_COLUMNS, key_factor_flags
+from tools.thresholds import MOMENTUM_THRESHOLD
+
+
+# Calendar days of bars fetched per poll once a symbol's history is held; wide enough to
+# overlap the last held bar across a long weekend
+REFRESH_WINDOW_DAYS = 7
+
+
+class WatchlistMonitor:
+    def __init__(self, agent: StockTradingAgent, symbols: List[str], interval: float = 60,
+                 price_move_threshold: float = MOMENTUM_THRESHOLD, trigger_flags: Optional[List[str]] = None,
+                 max_age: Optional[float] = None, max_concurrency: int = 4,
+                 on_update: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                 sleep: Optional[Callable[[float], None]] = None, refresh_days: int = REFRESH_WINDOW_DAYS):
+        self.agent = agent
+        self.symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        self.interval = interval
+        # Re-analyze when the price has moved this many percent since the last analysis
+        self.price_move_threshold = price_move_threshold
+        # ...or when one of these key factor flags switches on or off
+        self.trigger_flags = list(trigger_flags or FLAG_COLUMNS)
+        # ...or when the last analysis is older than this many seconds (None: never)
+        self.max_age = max_age
+        self.max_concurrency = max_concurrency
+        self.on_update = on_update
+        self.refresh_days = refresh_days
+        self._stop = threading.Event()
+        # Waiting on the stop event lets stop() interrupt the pause between polls
+        self._sleep = sleep or self._stop.wait
+        # symbol -> quote, flags and result as of the last analysis, the last polled quote, and
+        # the held daily history with its IndicatorState
+        self._state = {}
+        self.stats = {'polls': 0, 'analyses': 0, 'served_from_last': 0}
+
+    def add(self, symbol: str):
+        if symbol.upper() not in self.symbols:
+            self.symbols.append(symbol.upper())
+
+    def remove(self, symbol: str):
+        symbol = symbol.upper()
+        if symbol in self.symbols:
+            self.symbols.remove(symbol)
+        self._state.pop(symbol, None)
+
+    def stop(self):
+        self._stop.set()
+
+    def poll(self) -> List[Dict[str, Any]]:
+        symbols = list(self.symbols)
+        # One batched request per cycle for the last few days of bars, spliced onto the held
+        # history; indicators advance by the new bars only and fundamentals stay cached for the day
+        try:
+            history = self._refresh_history(symbols)
+        except Exception as e:
+            stock_data = {symbol: {'success': False, 'error': str(e), 'symbol': symbol} for symbol in symbols}
+        else:
+            indicators = pd.DataFrame.from_dict(
+                {symbol: self._state[symbol]['indicators'].values() for symbol in history}, orient='index'
+            )
+            stock_data = self.agent.yahoo_tool.get_stock_info_batch(symbols, hist_data=history,
+                                                                    indicators=indicators)
+        flags = self._flags(stock_data)
+        now = time.time()
+
+        updates = {}
+        to_analyze = []
+        for symbol in symbols:
+            fresh = stock_data[symbol]
+            if not fresh['success']:
+                updates[symbol] = self._update(symbol, fresh, reasons=[], result=self._last_result(symbol))
+                continue
+
+            reasons = self._triggers(symbol, fresh['data'], flags.get(symbol, set()), now)
+            if reasons:
+                to_analyze.append((symbol, fresh, reasons))
+            else:
+                self.stats['served_from_last'] += 1
+                updates[symbol] = self._update(symbol, fresh, reasons=[], result=self._last_result(symbol))
+
+        # Only the symbols that crossed a threshold go back to the LLM
+        if to_analyze:
+            with ThreadPoolExecutor(max_workers=max(1, self.max_concurrency)) as executor:
+                results = executor.map(
+                    lambda item: self.agent.analyze_stock(item[0], stock_data=item[1], verbose=False),
+                    to_analyze
+                )
+                for (symbol, fresh, reasons), result in zip(to_analyze, results):
+                    self.stats['analyses'] += 1
+                    if result['success']:
+                        self._state.setdefault(symbol, {}).update({
+                            'analyzed_quote': fresh['data'],
+                            'analyzed_flags': flags.get(symbol, set()),
+                            'analyzed_at': now,
+                            'result': result
+                        })
+                    updates[symbol] = self._update(symbol, fresh, reasons=reasons, result=result, reanalyzed=True)
+
+        for symbol in symbols:
+            if stock_data[symbol]['success']:
+                self._state.setdefault(symbol, {})['quote'] = stock_data[symbol]['data']
+
+        self.stats['polls'] += 1
+        return [updates[symbol] for symbol in symbols]
+
+    def run(self, iterations: Optional[int] = None):
+        self._stop.clear()
+        count = 0
+        while not self._stop.is_set() and (iterations is None or count < iterations):
+            started = time.monotonic()
+            updates = self.poll()
+            if self.on_update is not None:
+                self.on_update(updates)
+            count += 1
+
+            if iterations is not None and count >= iterations:
+                break
+            # Keep a steady cadence regardless of how long the poll took
+            remaining = self.interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._sleep(remaining)
+
+    def latest(self) -> Dict[str, Dict[str, Any]]:
+        return {symbol: state['result'] for symbol, state in self._state.items() if 'result' in state}
+
+    def _refresh_history(self, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        # Symbols seen before only need the recent window; new ones, and any whose window no
+        # longer overlaps the held bars (e.g. after a long pause), get the full lookback
+        tool = self.agent.yahoo_tool
+        held = [symbol for symbol in symbols if 'history' in self._state.get(symbol, {})]
+        recent = tool.download_history(held, days=self.refresh_days, refresh=True) if held else {}
+
+        updated = {}
+        reseed = [symbol for symbol in symbols if symbol not in held]
+        for symbol in held:
+            frame = recent.get(symbol)
+            if frame is None or frame.empty:
+                continue
+            if frame.index[0] > self._state[symbol]['history'].index[-1]:
+                reseed.append(symbol)
+                continue
+            updated[symbol] = self._append_bars(self._state[symbol], frame, tool.lookback_days)
+
+        if reseed:
+            full = tool.download_history(reseed, refresh=True)
+            states = seed_indicators(full)
+            for symbol, frame in full.items():
+                if symbol in states:
+                    self._state.setdefault(symbol, {}).update({'history': frame, 'indicators': states[symbol]})
+                    updated[symbol] = frame
+
+        return {symbol: updated[symbol] for symbol in symbols if symbol in updated}
+
+    @staticmethod
+    def _append_bars(state: Dict[str, Any], frame: pd.DataFrame, lookback_days: int) -> pd.DataFrame:
+        # Bars from the last held one on go through IndicatorState; a bar with the same timestamp
+        # replaces it, so a partial session is revised in place
+        indicators = state['indicators']
+        bars = frame[frame['Close'].notna()]
+        for timestamp, bar in bars[bars.index >= indicators.timestamp].iterrows():
+            indicators.update(bar['Close'], bar['High'], bar['Low'], bar['Volume'], timestamp)
+
+        held = state['history']
+        history = pd.concat([held[held.index < frame.index[0]], frame])
+        state['history'] = history[history.index >= history.index[-1] - timedelta(days=lookback_days)]
+        return state['history']
+
+    def _flags(self, stock_data: Dict[str, Dict[str, Any]]) -> Dict[str, set]:
+        # Key factor flags for the whole watchlist in one vectorized pass
+        quotes = {symbol: result['data'] for symbol, result in stock_data.items() if result['success']}
+        if not quotes:
+            return {}
+        table = key_factor_flags(pd.DataFrame.from_dict(quotes, orient='index'))[self.trigger_flags]
+        return {symbol: {name for name, active in row.items() if active} for symbol, row in table.iterrows()}
+
+    def _triggers(self, symbol: str, quote: Dict[str, Any], flags: set, now: float) -> List[str]:
+        state = self._state.get(symbol)
+        if state is None or 'result' not in state:
+            return ['first analysis']
+
+        reasons = []
+        move = self._percent_change(state['analyzed_quote']['current_price'], quote['current_price'])
+        if abs(move) >= self.price_move_threshold:
+            reasons.append(f"price moved {move:+.2f}% since last analysis")
+
+        for name in sorted(flags - state['analyzed_flags']):
+            reasons.append(f"{name} crossed on")
+        for name in sorted(state['analyzed_flags'] - flags):
+            reasons.append(f"{name} crossed off")
+
+        if self.max_age is not None and now - state['analyzed_at'] >= self.max_age:
+            reasons.append("last analysis expired")
+
+        return reasons
+
+    def _update(self, symbol: str, fresh: Dict[str, Any], reasons: List[str],
+                result: Optional[Dict[str, Any]], reanalyzed: bool = False) -> Dict[str, Any]:
+        update = {
+            'symbol': symbol,
+            'success': fresh['success'],
+            'reanalyzed': reanalyzed,
+            'reasons': reasons,
+            'result': result
+        }
+        if not fresh['success']:
+            update['error'] = fresh['error']
+            return update
+
+        quote = fresh['data']
+        previous = self._state.get(symbol, {}).get('quote')
+        analyzed = self._state.get(symbol, {}).get('analyzed_quote')
+        update.update({
+            'current_price': quote['current_price'],
+            'change_since_last_poll': self._percent_change(previous['current_price'], quote['current_price']) if previous else 0.0,
+            'change_since_analysis': self._percent_change(analyzed['current_price'], quote['current_price']) if analyzed else 0.0,
+            'week_change': quote['week_change'],
+            'volume': quote['volume'],
+            'avg_volume': quote['avg_volume'],
+            'rsi_14': quote.get('rsi_14'),
+            'macd_hist': quote.get('macd_hist')
+        })
+        return update
+
+    def _last_result(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return self._state.get(symbol, {}).get('result')
+
+    @staticmethod
+    def _percent_change(old: float, new: float) -> float:
+        return round((new - old) / old * 100, 2) if old else 0.0